@@ -1,28 +1,112 @@
-from aguaclara.core.constants import *
-from aguaclara.core.drills import *
-from aguaclara.core.head_loss import *
-from aguaclara.core.materials import *
-from aguaclara.core.physchem import *
-from aguaclara.core.pipes import *
-from aguaclara.core.units import *
-from aguaclara.core.utility import *
-from aguaclara.core.onshape_parser import *
-
-from aguaclara.design.cdc import CDC
-from aguaclara.design.component import Component
-from aguaclara.design.ent_floc import EntTankFloc
-from aguaclara.design.ent import EntranceTank
-from aguaclara.design.filter import Filter
-from aguaclara.design.floc import Flocculator
-import aguaclara.design.human_access as ha
-from aguaclara.design.lfom import LFOM
-from aguaclara.design.plant import Plant
-from aguaclara.design.sed_chan import SedimentationChannel
-from aguaclara.design.sed_tank import SedimentationTank
-from aguaclara.design.sed import Sedimentor
-
-from aguaclara.research.environmental_processes_analysis import *
-from aguaclara.research.floc_model import *
-from aguaclara.research.procoda_parser import *
-from aguaclara.research.peristaltic_pump import *
-from aguaclara.research.stock_qc import *
+"""The aguaclara package.
+
+The public names of the core and research modules and the design classes
+are available as package attributes, e.g. ``aguaclara.flow_pipe`` and
+``aguaclara.Plant``. They are loaded on first access (PEP 562), so
+``import aguaclara`` does not import Pint, pandas, SciPy or the Onshape
+client. On Python 3.6, which does not support PEP 562, they are all loaded
+by ``import aguaclara``.
+"""
+import importlib
+import sys
+
+# Modules whose public names are available as package attributes, in the
+# order that they are searched for a name.
+_STAR_MODULES = (
+    'aguaclara.core.constants',
+    'aguaclara.core.drills',
+    'aguaclara.core.head_loss',
+    'aguaclara.core.materials',
+    'aguaclara.core.physchem',
+    'aguaclara.core.pipes',
+    'aguaclara.core.units',
+    'aguaclara.core.utility',
+    'aguaclara.core.onshape_parser',
+    'aguaclara.research.environmental_processes_analysis',
+    'aguaclara.research.floc_model',
+    'aguaclara.research.procoda_parser',
+    'aguaclara.research.peristaltic_pump',
+    'aguaclara.research.stock_qc',
+)
+
+# Package attributes that are a single object of a module, or the module
+# itself if the object name is None.
+_LAZY_ATTRIBUTES = {
+    'CDC': ('aguaclara.design.cdc', 'CDC'),
+    'design_batch': ('aguaclara.design.batch', 'design_batch'),
+    'Component': ('aguaclara.design.component', 'Component'),
+    'EntTankFloc': ('aguaclara.design.ent_floc', 'EntTankFloc'),
+    'EntranceTank': ('aguaclara.design.ent', 'EntranceTank'),
+    'Filter': ('aguaclara.design.filter', 'Filter'),
+    'Flocculator': ('aguaclara.design.floc', 'Flocculator'),
+    'ha': ('aguaclara.design.human_access', None),
+    'LFOM': ('aguaclara.design.lfom', 'LFOM'),
+    'pipedb': ('aguaclara.core.pipes', 'pipedb'),
+    'Plant': ('aguaclara.design.plant', 'Plant'),
+    'SedimentationChannel': ('aguaclara.design.sed_chan',
+                             'SedimentationChannel'),
+    'SedimentationTank': ('aguaclara.design.sed_tank', 'SedimentationTank'),
+    'Sedimentor': ('aguaclara.design.sed', 'Sedimentor'),
+    'sweep': ('aguaclara.design.sweep', 'sweep'),
+    'core': ('aguaclara.core', None),
+    'design': ('aguaclara.design', None),
+    'research': ('aguaclara.research', None),
+}
+
+
+def _public_names(module):
+    """Return the names that ``from module import *`` would import."""
+    names = getattr(module, '__all__', None)
+    if names is None:
+        names = [name for name in vars(module) if not name.startswith('_')]
+    return names
+
+
+def _star_modules():
+    """Yield the modules of _STAR_MODULES that can be imported, skipping those
+    whose optional dependencies (such as the Onshape client) are missing.
+    """
+    for module_name in _STAR_MODULES:
+        try:
+            yield importlib.import_module(module_name)
+        except ImportError:
+            continue
+
+
+def __getattr__(name):
+    if name in _LAZY_ATTRIBUTES:
+        module_name, attribute = _LAZY_ATTRIBUTES[name]
+        value = importlib.import_module(module_name)
+        if attribute is not None:
+            value = getattr(value, attribute)
+    elif name == '__all__':
+        value = sorted(set(_LAZY_ATTRIBUTES).union(
+            *(_public_names(module) for module in _star_modules())))
+    else:
+        if name.startswith('__'):
+            raise AttributeError(
+                "module 'aguaclara' has no attribute " + repr(name))
+        for module in _star_modules():
+            if name in _public_names(module):
+                value = getattr(module, name)
+                break
+        else:
+            raise AttributeError(
+                "module 'aguaclara' has no attribute " + repr(name))
+    # Cache the value so that __getattr__ is only called once per name.
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()).union(_LAZY_ATTRIBUTES))
+
+
+if sys.version_info < (3, 7):
+    # Load every attribute now, in the same order of precedence as
+    # __getattr__.
+    for _name in _LAZY_ATTRIBUTES:
+        __getattr__(_name)
+    for _module in _star_modules():
+        for _name in _public_names(_module):
+            globals().setdefault(_name, getattr(_module, _name))
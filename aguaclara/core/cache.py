@@ -1,54 +1,232 @@
-# The cache decorator does not support objects nested within datastructures or other objects. It is quite limited
-# because the hash function is limited. This could be revisited and we could use a serialization library like Pickle
-# if this proved to be an issue (which it most likely will when we get more complex classes)
+"""Memoization for expensive functions.
+
+The :func:`ac_cache` decorator stores the results of a function in a bounded,
+thread-safe cache with least-recently-used (LRU) and optional time-to-live
+(TTL) eviction. Each decorated function has its own cache and its own hit,
+miss and eviction counters.
+
+Cache keys are built from the arguments by :func:`ac_hash`:
+
+- Pint quantities are keyed by their magnitude in base units and their
+  dimensionality, so ``1 * u.m`` and ``100 * u.cm`` share a cache entry.
+- NumPy arrays are keyed by their dtype, shape and contents.
+- Numbers and strings are keyed by type and value, so ``1``, ``1.0`` and
+  ``True`` are different keys.
+- Subclasses of :class:`HashableObject` are keyed by their attributes.
+
+Objects that are none of these are keyed by ``repr()`` with a warning, as
+``repr()`` does not guarantee replicable keys.
+
+Example:
+    >>> from aguaclara.core.cache import ac_cache
+    >>> @ac_cache(maxsize=128)
+    ... def square(x):
+    ...     return x ** 2
+    >>> square(3)
+    9
+    >>> square.cache_info()
+    CacheInfo(hits=0, misses=1, evictions=0, maxsize=128, currsize=1)
+"""
+from aguaclara.core.units import u
+import numpy as np
 
 import collections
+import collections.abc
+import functools
+import threading
+import time
 import warnings
 
-# The cache has key=(function name , parameter serialization) and value=
-__ac_cache__ = {}
+#: The default maximum number of entries in each function's cache.
+DEFAULT_MAXSIZE = 1024
+
+CacheInfo = collections.namedtuple(
+    'CacheInfo', ['hits', 'misses', 'evictions', 'maxsize', 'currsize'])
+
+# The caches of all decorated functions, by qualified function name.
+_caches = {}
+_caches_lock = threading.Lock()
+
+
+class _LRUCache:
+    """A bounded mapping with LRU and TTL eviction and usage counters."""
+
+    def __init__(self, maxsize, ttl):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data = collections.OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key):
+        """Return (True, value) for a live entry and (False, None) otherwise.
+        """
+        with self._lock:
+            try:
+                value, expires = self._data[key]
+            except KeyError:
+                self.misses += 1
+                return False, None
+            if expires is not None and expires <= time.monotonic():
+                del self._data[key]
+                self.evictions += 1
+                self.misses += 1
+                return False, None
+            self._data.move_to_end(key)
+            self.hits += 1
+            return True, value
+
+    def put(self, key, value):
+        with self._lock:
+            expires = None if self.ttl is None else time.monotonic() + self.ttl
+            self._data[key] = (value, expires)
+            self._data.move_to_end(key)
+            if self.maxsize is not None:
+                while len(self._data) > self.maxsize:
+                    self._data.popitem(last=False)
+                    self.evictions += 1
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+            self.hits = self.misses = self.evictions = 0
+
+    def info(self):
+        with self._lock:
+            return CacheInfo(self.hits, self.misses, self.evictions,
+                             self.maxsize, len(self._data))
+
+
+def ac_cache(method=None, *, maxsize=DEFAULT_MAXSIZE, ttl=None):
+    """Memoize a function in a bounded, thread-safe LRU cache.
+
+    May be used as ``@ac_cache`` or as ``@ac_cache(maxsize=..., ttl=...)``.
+    The decorated function gains ``cache_info()`` and ``cache_clear()``
+    methods. Exceptions are not cached. Array and array quantity results
+    are copied on every hit so that callers cannot modify the cached value.
 
+    Args:
+        - ``method (function)``: The function to memoize.
+        - ``maxsize (int or None)``: The maximum number of cached results.
+          The least recently used result is evicted first. None means the
+          cache is unbounded. Defaults to DEFAULT_MAXSIZE.
+        - ``ttl (float or None)``: The number of seconds a result stays in
+          the cache. None means results do not expire. Defaults to None.
 
-def ac_cache(method):
+    Returns:
+        The memoized function, or a decorator if ``method`` is not given.
+    """
+    if maxsize is not None and maxsize < 1:
+        raise ValueError('maxsize must be at least 1 or None.')
+    if ttl is not None and ttl <= 0:
+        raise ValueError('ttl must be positive or None.')
+    if method is None:
+        return functools.partial(ac_cache, maxsize=maxsize, ttl=ttl)
+
+    name = method.__module__ + '.' + method.__qualname__
+    cache = _LRUCache(maxsize, ttl)
+    with _caches_lock:
+        _caches[name] = cache
+
+    @functools.wraps(method)
     def _cache(*args, **kw):
-        global __cache__
-        param_list = [args, kw]
-        params_key = tuple([method.__name__, ac_hash(param_list)])
-        try:
-            value = __ac_cache__[params_key]
-        except KeyError:
+        params_key = (ac_hash(args), ac_hash(kw))
+        found, value = cache.get(params_key)
+        if not found:
             value = method(*args, **kw)
-            __ac_cache__[params_key] = value
-
-        return value
-
-    # Attempt to hash any object
-    def ac_hash(hashable_object):
-        if is_simple_hashable(hashable_object):
-            a_hash = repr(hashable_object)
-        elif isinstance(hashable_object, HashableObject):
-            a_hash = hashable_object.ac_hash()
-        elif isinstance(hashable_object, collections.Iterable):
-            a_hash = ac_hash_iterable_into_tuple(hashable_object)
-        else:
-            a_hash = repr(hashable_object)
-            warnings.warn("Using repr() to make a hash of {}. Please consider inheriting HashableObject class as repr "
-                          "will not guarantee replicable hashing and can result in bad cache returns.".format(
-                repr(hashable_object)), Warning, stacklevel=2)
-        return a_hash
-
-    def ac_hash_iterable_into_tuple(hashable_object_list):
-        hash_tuple = ()
-        for hashable_object in hashable_object_list:
-            hash_tuple += (ac_hash(hashable_object),)
-        return hash_tuple
-
-    primitive = (int, str, bool, ...)
-    def is_simple_hashable(thing):
-        return type(thing) in primitive
+            cache.put(params_key, value)
+        return _copy_result(value)
 
+    _cache.cache_info = cache.info
+    _cache.cache_clear = cache.clear
     return _cache
 
+
+def cache_stats():
+    """Return the CacheInfo of every memoized function, by qualified name."""
+    with _caches_lock:
+        caches = dict(_caches)
+    return {name: cache.info() for name, cache in caches.items()}
+
+
+def clear_all_caches():
+    """Empty the caches and reset the counters of every memoized function."""
+    with _caches_lock:
+        caches = list(_caches.values())
+    for cache in caches:
+        cache.clear()
+
+
+def _copy_result(value):
+    if isinstance(value, np.ndarray):
+        return value.copy()
+    if isinstance(value, u.Quantity) and isinstance(value.magnitude,
+                                                    np.ndarray):
+        return value.copy()
+    return value
+
+
+_primitive = (int, float, complex, str, bytes, bool, type(None),
+              type(Ellipsis))
+
+
+def ac_hash(hashable_object):
+    """Return a canonical, hashable key for an object."""
+    if type(hashable_object) in _primitive:
+        return (type(hashable_object).__name__, hashable_object)
+    if isinstance(hashable_object, np.generic):
+        return ('numpy', hashable_object.dtype.str, hashable_object.item())
+    if isinstance(hashable_object, u.Quantity):
+        base = hashable_object.to_base_units()
+        magnitude = base.magnitude
+        # Integer and float magnitudes of equal quantities share a key.
+        if isinstance(magnitude, np.ndarray) and magnitude.dtype.kind in 'iub':
+            magnitude = magnitude.astype(float)
+        elif isinstance(magnitude, (int, np.integer)):
+            magnitude = float(magnitude)
+        return ('Quantity', ac_hash(magnitude), str(base.dimensionality))
+    if isinstance(hashable_object, u.Unit):
+        return ('Unit', str(hashable_object))
+    if isinstance(hashable_object, np.ndarray):
+        if hashable_object.dtype == object:
+            return ('ndarray', hashable_object.shape,
+                    _hash_iterable(hashable_object.ravel()))
+        return ('ndarray', hashable_object.dtype.str, hashable_object.shape,
+                np.ascontiguousarray(hashable_object).tobytes())
+    if isinstance(hashable_object, HashableObject):
+        return (type(hashable_object).__qualname__,
+                ac_hash(hashable_object.ac_hash()))
+    if isinstance(hashable_object, collections.abc.Mapping):
+        return ('Mapping', tuple(sorted(
+            ((ac_hash(key), ac_hash(value))
+             for key, value in hashable_object.items()), key=repr)))
+    if isinstance(hashable_object, collections.abc.Set):
+        return ('Set', tuple(sorted((ac_hash(item)
+                                     for item in hashable_object), key=repr)))
+    if isinstance(hashable_object, collections.abc.Iterable):
+        return (type(hashable_object).__name__,
+                _hash_iterable(hashable_object))
+    warnings.warn("Using repr() to make a hash of {}. Please consider "
+                  "inheriting HashableObject class as repr will not "
+                  "guarantee replicable hashing and can result in bad cache "
+                  "returns.".format(repr(hashable_object)), Warning,
+                  stacklevel=2)
+    return ('repr', repr(hashable_object))
+
+
+def _hash_iterable(hashable_object_list):
+    return tuple(ac_hash(hashable_object)
+                 for hashable_object in hashable_object_list)
+
+
 class HashableObject:
+    """A base class for objects used as arguments of memoized functions.
+
+    The object is keyed by its attributes, so two objects with equal
+    attributes share cache entries.
+    """
+
     def ac_hash(self):
-        return tuple(sorted(self.__dict__.items()))
\ No newline at end of file
+        return tuple(sorted(self.__dict__.items()))
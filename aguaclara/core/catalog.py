@@ -0,0 +1,265 @@
+"""Load-once access to the pipe and fitting databases.
+
+The CSV databases in ``aguaclara/core/data`` and ``aguaclara/design/data`` are
+read into dictionaries of read-only NumPy arrays, one per column, the first
+time they are requested, and then shared by every module that asks for them.
+
+Optionally, a parsed table is also saved in a binary ``.npz`` file in a
+per-user cache directory, named by the SHA-256 hash of the CSV file. Later
+loads use the ``.npz`` file while the CSV file is unchanged, so they do not
+parse the CSV file at all. The binary cache is off unless the
+``AGUACLARA_BINARY_CACHE`` environment variable is set or
+``USE_BINARY_CACHE`` is set to True before the tables are first loaded. If
+the ``.npz`` file cannot be written, the CSV file is parsed on every first
+load instead.
+
+Example:
+    >>> from aguaclara.core import catalog
+    >>> table = catalog.load_table(catalog.PIPE_DATABASE_PATH)
+    >>> float(table['ODinch'][0])
+    0.404
+"""
+import numpy as np
+
+import csv
+import hashlib
+import os
+import tempfile
+import threading
+
+_core_data_path = os.path.join(os.path.dirname(__file__), 'data')
+_design_data_path = os.path.join(os.path.dirname(os.path.dirname(__file__)),
+                                 'design', 'data')
+
+#: Path of the pipe database used by :mod:`aguaclara.core.pipes`.
+PIPE_DATABASE_PATH = os.path.join(_core_data_path, 'pipe_database.csv')
+
+#: Path of the pipe database used by :mod:`aguaclara.design.pipeline`.
+DESIGN_PIPE_DATABASE_PATH = os.path.join(_design_data_path,
+                                         'pipe_database.csv')
+
+#: Path of the fitting database used by :mod:`aguaclara.design.pipeline`.
+FITTING_DATABASE_PATH = os.path.join(_design_data_path,
+                                     'fitting_database.csv')
+
+#: Whether parsed tables are saved to and loaded from ``.npz`` files.
+USE_BINARY_CACHE = bool(os.environ.get('AGUACLARA_BINARY_CACHE'))
+
+#: The directory of the ``.npz`` files.
+BINARY_CACHE_DIR = os.path.join(
+    os.environ.get('XDG_CACHE_HOME') or
+    os.path.join(os.path.expanduser('~'), '.cache'), 'aguaclara')
+
+_tables = {}
+_pipe_catalogs = {}
+_lock = threading.RLock()
+
+
+def load_table(path):
+    """Return a CSV table as a dictionary of read-only NumPy arrays.
+
+    Columns of integers become integer arrays, other numeric columns become
+    float arrays, with empty cells as NaN, and the rest become string
+    arrays. The table is loaded once
+    per path and shared by all callers.
+
+    Args:
+        - ``path (str)``: Path of the CSV file
+
+    Returns:
+        ``dict``: Column arrays by column name, in file order
+    """
+    path = os.path.abspath(path)
+    with _lock:
+        try:
+            return _tables[path]
+        except KeyError:
+            pass
+        with open(path, 'rb') as csv_file:
+            contents = csv_file.read()
+        digest = hashlib.sha256(contents).hexdigest()
+        cache_path = os.path.join(BINARY_CACHE_DIR, digest + '.npz')
+        table = _read_binary_cache(cache_path, digest) \
+            if USE_BINARY_CACHE else None
+        if table is None:
+            table = _parse_csv(contents.decode('utf-8-sig'))
+            if USE_BINARY_CACHE:
+                _write_binary_cache(cache_path, digest, table)
+        for column in table.values():
+            column.flags.writeable = False
+        _tables[path] = table
+        return table
+
+
+def pipe_catalog(path=PIPE_DATABASE_PATH):
+    """Return the shared :class:`PipeCatalog` of a pipe database."""
+    path = os.path.abspath(path)
+    with _lock:
+        try:
+            return _pipe_catalogs[path]
+        except KeyError:
+            _pipe_catalogs[path] = PipeCatalog(load_table(path))
+            return _pipe_catalogs[path]
+
+
+def clear():
+    """Forget all loaded tables, so that they are loaded again when next
+    requested.
+    """
+    with _lock:
+        _tables.clear()
+        _pipe_catalogs.clear()
+
+
+def _parse_csv(text):
+    rows = list(csv.reader(text.splitlines()))
+    header, rows = rows[0], [row for row in rows[1:] if row]
+    columns = zip(*rows) if rows else [()] * len(header)
+    return {name: _column_array(values)
+            for name, values in zip(header, columns)}
+
+
+def _column_array(values):
+    try:
+        return np.array([int(value) for value in values], dtype=np.int64)
+    except ValueError:
+        pass
+    try:
+        # Empty cells of numeric columns are missing values.
+        return np.array([float(value) if value.strip() else np.nan
+                         for value in values])
+    except ValueError:
+        return np.array(values, dtype=str)
+
+
+def _read_binary_cache(cache_path, digest):
+    try:
+        with np.load(cache_path, allow_pickle=False) as data:
+            if str(data['__sha256__']) != digest:
+                return None
+            return {str(name): data['column_' + str(i)]
+                    for i, name in enumerate(data['__columns__'])}
+    except (OSError, KeyError, ValueError):
+        return None
+
+
+def _write_binary_cache(cache_path, digest, table):
+    arrays = {'column_' + str(i): column
+              for i, column in enumerate(table.values())}
+    try:
+        os.makedirs(os.path.dirname(cache_path), exist_ok=True)
+        fd, temp_path = tempfile.mkstemp(
+            dir=os.path.dirname(cache_path), suffix='.npz')
+        try:
+            with os.fdopen(fd, 'wb') as temp_file:
+                np.savez(temp_file, __sha256__=np.array(digest),
+                         __columns__=np.array(list(table)), **arrays)
+            os.replace(temp_path, cache_path)
+        except BaseException:
+            os.remove(temp_path)
+            raise
+    except OSError:
+        pass
+
+
+class PipeCatalog:
+    """An index of a pipe database for fast size lookups.
+
+    The nominal (ND), outer (OD) and schedule 40 inner diameters of all pipes
+    and of the available pipes (those with a 1 in the 'Used' column) are held
+    in NumPy arrays sorted by ND, and inner diameters are indexed per SDR on
+    first use. Lookups are binary searches that accept scalars or arrays of
+    diameters in inches and return magnitudes in inches.
+    """
+
+    def __init__(self, db):
+        """Initialize a PipeCatalog from a pipe database.
+
+        :param db: pipe database with NDinch, ODinch, Used and SCH40Wall
+            columns
+        :type db: dict of numpy.ndarray or pandas.DataFrame
+        """
+        order = np.argsort(np.asarray(db['NDinch'], dtype=float),
+                           kind='stable')
+        self.nd = np.asarray(db['NDinch'], dtype=float)[order]
+        self.od = np.asarray(db['ODinch'], dtype=float)[order]
+        self.id_sch40 = (self.od
+                         - 2 * np.asarray(db['SCH40Wall'], dtype=float)[order])
+        used = np.asarray(db['Used'])[order] == 1
+        self.nd_available = self.nd[used]
+        self.od_available = np.sort(self.od[used])
+        self._od_of_nd_available = self.od[used]
+        self._id_sdr_available = {}
+        for array in (self.nd, self.od, self.id_sch40, self.nd_available,
+                      self.od_available, self._od_of_nd_available):
+            array.flags.writeable = False
+
+    def closest_nd_index(self, nd):
+        """Return the index of the nominal diameter closest to each nd,
+        taking the smaller of two equally close diameters.
+        """
+        nd = np.asarray(nd, dtype=float)
+        upper = np.clip(np.searchsorted(self.nd, nd), 1, len(self.nd) - 1)
+        lower = upper - 1
+        return np.where(nd - self.nd[lower] <= self.nd[upper] - nd,
+                        lower, upper)
+
+    def od_of_nd(self, nd):
+        """Return the outer diameter of the pipe with the closest ND."""
+        return self.od[self.closest_nd_index(nd)]
+
+    def id_sdr_of_nd(self, nd, sdr):
+        """Return the inner diameter of the pipe with the closest ND and the
+        given SDR.
+        """
+        return self.od_of_nd(nd) * (sdr - 2) / sdr
+
+    def id_sch40_of_nd(self, nd):
+        """Return the schedule 40 inner diameter of the pipe with the
+        closest ND.
+        """
+        return self.id_sch40[self.closest_nd_index(nd)]
+
+    def id_sdr_available(self, sdr):
+        """Return the inner diameters of the available pipes with an SDR."""
+        try:
+            return self._id_sdr_available[sdr]
+        except (KeyError, TypeError):
+            ids = self._od_of_nd_available * (sdr - 2) / sdr
+            ids.flags.writeable = False
+            try:
+                self._id_sdr_available[sdr] = ids
+            except TypeError:
+                pass
+            return ids
+
+    def nd_sdr_available(self, id_, sdr):
+        """Return the smallest available ND whose inner diameter with the
+        given SDR is at least id_, or NaN if there is none.
+        """
+        id_, sdr = np.broadcast_arrays(np.asarray(id_, dtype=float),
+                                       np.asarray(sdr, dtype=float))
+        result = np.full(id_.shape, np.nan)
+        for value in np.unique(sdr):
+            mask = sdr == value
+            result[mask] = self._first_at_least(
+                self.id_sdr_available(float(value)), id_[mask],
+                self.nd_available)
+        return result[()]
+
+    def nd_available_at_least(self, nd):
+        """Return the smallest available ND at least nd, or NaN."""
+        return self._first_at_least(self.nd_available, nd, self.nd_available)
+
+    def od_available_at_least(self, od):
+        """Return the smallest available OD at least od, or NaN."""
+        return self._first_at_least(self.od_available, od, self.od_available)
+
+    @staticmethod
+    def _first_at_least(keys, values, results):
+        """Return results[i] for the first sorted key that is at least each
+        value, or NaN if there is no such key.
+        """
+        index = np.searchsorted(keys, np.asarray(values, dtype=float))
+        padded = np.append(results, np.nan)
+        return padded[index]
@@ -0,0 +1,1122 @@
+"""Unit-free kernels for the functions in :mod:`aguaclara.core.physchem`.
+
+Each function in this module takes plain floats or NumPy arrays whose values
+are in SI base units (m, s, kg, K) and returns its result in SI base units.
+No units are checked or converted and no input ranges are validated, so the
+kernels are suited to evaluating large design grids in a single NumPy pass.
+The Pint Quantity functions in :mod:`aguaclara.core.physchem` validate and
+convert their inputs once and then call the kernel of the same name.
+
+Array inputs are broadcast against each other. Scalar inputs give NumPy
+scalar results.
+
+Example:
+    >>> import aguaclara.core.kernels as k
+    >>> float(k.re_pipe(0.012, 0.1, 1e-6))
+    152788.7...
+"""
+import numpy as np
+from scipy import interpolate
+
+#: Standard acceleration of gravity, in m/s².
+GRAVITY = 9.80665
+
+#: Reynolds number of the laminar/turbulent transition in pipes.
+RE_TRANSITION_PIPE = 2100
+
+#: Table of temperatures and the corresponding water density.
+#:
+#: WATER_DENSITY_TABLE[0] is a list of water temperatures, in Kelvin.
+#: WATER_DENSITY_TABLE[1] is the corresponding densities, in kg/m³.
+WATER_DENSITY_TABLE = [(273.15, 278.15, 283.15, 293.15, 303.15, 313.15,
+                        323.15, 333.15, 343.15, 353.15, 363.15, 373.15
+                        ), (999.9, 1000, 999.7, 998.2, 995.7, 992.2,
+                            988.1, 983.2, 977.8, 971.8, 965.3, 958.4
+                            )
+                       ]
+
+
+def _result(value):
+    """Return a NumPy scalar for a 0-d result and an array otherwise."""
+    return np.asarray(value, dtype=float)[()]
+
+
+def _broadcast(*args):
+    """Broadcast the arguments against each other and return writable, at
+    least 1-d float copies along with the common shape.
+    """
+    arrays = np.broadcast_arrays(*[np.asarray(arg, dtype=float)
+                                   for arg in args])
+    shape = arrays[0].shape
+    return [np.array(a, ndmin=1) for a in arrays], shape
+
+########################## Geometry ###########################
+
+
+def area_circle(DiamCircle):
+    """Return the area of a circle given its diameter (m) in m²."""
+    return _result(np.pi / 4 * np.asarray(DiamCircle)**2)
+
+
+def diam_circle(AreaCircle):
+    """Return the diameter of a circle given its area (m²) in m."""
+    return _result(np.sqrt(4 * np.asarray(AreaCircle) / np.pi))
+
+####################### Water Properties #######################
+
+
+def viscosity_dynamic_water(Temperature):
+    """Return the dynamic viscosity of water (kg/(m*s)) at a temperature in K.
+    """
+    Temperature = np.asarray(Temperature, dtype=float)
+    return _result(2.414e-5 * 10**(247.8 / (Temperature - 140)))
+
+
+#: Cubic spline through WATER_DENSITY_TABLE, built once at import. It is used
+#: for temperatures outside the range of the lookup tables below.
+_DENSITY_WATER_SPLINE = interpolate.CubicSpline(WATER_DENSITY_TABLE[0],
+                                                WATER_DENSITY_TABLE[1])
+
+#: Spacing, in K, of the water property lookup tables. The tables span the
+#: range of WATER_DENSITY_TABLE.
+WATER_TABLE_STEP = 0.0025
+
+_WATER_TABLE_MIN = WATER_DENSITY_TABLE[0][0]
+_WATER_TABLE_SIZE = int(round((WATER_DENSITY_TABLE[0][-1] - _WATER_TABLE_MIN)
+                              / WATER_TABLE_STEP)) + 1
+_WATER_TABLE_TEMPERATURES = (_WATER_TABLE_MIN
+                             + WATER_TABLE_STEP * np.arange(_WATER_TABLE_SIZE))
+_DENSITY_WATER_TABLE = _DENSITY_WATER_SPLINE(_WATER_TABLE_TEMPERATURES)
+_VISCOSITY_KINEMATIC_WATER_TABLE = (
+    2.414e-5 * 10**(247.8 / (_WATER_TABLE_TEMPERATURES - 140))
+    / _DENSITY_WATER_TABLE)
+
+#: Upper bound, in kg/m³, on the difference between density_water and the
+#: cubic spline through WATER_DENSITY_TABLE. Linear interpolation between
+#: table points spaced h apart is off by at most h²/8 * max|f''|, and the
+#: second derivative of the spline is largest at one of its knots.
+DENSITY_WATER_TABLE_ERROR = (
+    WATER_TABLE_STEP**2 / 8
+    * np.abs(_DENSITY_WATER_SPLINE(WATER_DENSITY_TABLE[0], 2)).max())
+
+#: Estimated upper bound, in m²/s, on the interpolation error of
+#: viscosity_kinematic_water, from the same h²/8 * max|f''| bound with f''
+#: taken from second differences of the table.
+VISCOSITY_KINEMATIC_WATER_TABLE_ERROR = (
+    np.abs(np.diff(_VISCOSITY_KINEMATIC_WATER_TABLE, 2)).max() / 8)
+
+
+def _water_table_lookup(table, Temperature, exact):
+    """Linearly interpolate a water property table at the given temperatures
+    in K, calling exact() for temperatures outside the table.
+    """
+    Temperature = np.asarray(Temperature, dtype=float)
+    position = (Temperature - _WATER_TABLE_MIN) / WATER_TABLE_STEP
+    if position.ndim == 0:
+        position = float(position)
+        if not 0 <= position <= _WATER_TABLE_SIZE - 1:
+            return _result(exact(Temperature))
+        index = min(int(position), _WATER_TABLE_SIZE - 2)
+        return _result(table[index] + (position - index)
+                       * (table[index + 1] - table[index]))
+    inside = (position >= 0) & (position <= _WATER_TABLE_SIZE - 1)
+    all_inside = inside.all()
+    if not all_inside:
+        position = np.where(inside, position, 0)
+    index = np.minimum(position.astype(np.intp), _WATER_TABLE_SIZE - 2)
+    lower = table[index]
+    result = lower + (position - index) * (table[index + 1] - lower)
+    if not all_inside:
+        result = np.where(inside, result, exact(Temperature))
+    return result
+
+
+def density_water(Temperature):
+    """Return the density of water (kg/m³) at a temperature in K.
+
+    Temperatures within WATER_DENSITY_TABLE are looked up in a precomputed
+    table, to within DENSITY_WATER_TABLE_ERROR of the cubic spline through
+    WATER_DENSITY_TABLE. Other temperatures are extrapolated by the spline.
+    """
+    return _water_table_lookup(_DENSITY_WATER_TABLE, Temperature,
+                               _DENSITY_WATER_SPLINE)
+
+
+def _viscosity_kinematic_water_exact(Temperature):
+    return (viscosity_dynamic_water(Temperature)
+            / _DENSITY_WATER_SPLINE(Temperature))
+
+
+def viscosity_kinematic_water(Temperature):
+    """Return the kinematic viscosity of water (m²/s) at a temperature in K.
+
+    Uses a precomputed table in the same way as density_water, to within
+    VISCOSITY_KINEMATIC_WATER_TABLE_ERROR.
+    """
+    return _water_table_lookup(_VISCOSITY_KINEMATIC_WATER_TABLE, Temperature,
+                               _viscosity_kinematic_water_exact)
+
+####################### Hydraulic Radius #######################
+
+
+def radius_hydraulic_rect(Width, Depth, OpenChannel):
+    """Return the hydraulic radius (m) of a rectangular channel of a given
+    width (m) and water depth (m). ``OpenChannel`` may be a boolean array.
+    """
+    Width = np.asarray(Width, dtype=float)
+    Depth = np.asarray(Depth, dtype=float)
+    return _result(np.where(OpenChannel,
+                            (Width*Depth) / (Width + 2*Depth),
+                            (Width*Depth) / (2 * (Width+Depth))))
+
+
+def radius_hydraulic_channel(Area, PerimWetted):
+    """Return the hydraulic radius (m) of a general channel given its cross
+    sectional area (m²) and wetted perimeter (m).
+    """
+    return _result(np.asarray(Area) / np.asarray(PerimWetted))
+
+####################### Reynolds Number #######################
+
+
+def re_pipe(FlowRate, Diam, Nu):
+    """Return the Reynolds number of flow (m³/s) through a pipe of a given
+    diameter (m) for a fluid of kinematic viscosity Nu (m²/s).
+    """
+    return _result((4 * np.asarray(FlowRate))
+                   / (np.pi * np.asarray(Diam) * np.asarray(Nu)))
+
+
+def re_rect(FlowRate, Width, Depth, Nu, OpenChannel):
+    """Return the Reynolds number of flow (m³/s) through a rectangular
+    channel.
+    """
+    FlowRate = np.asarray(FlowRate, dtype=float)
+    Width = np.asarray(Width, dtype=float)
+    Depth = np.asarray(Depth, dtype=float)
+    return _result(4 * FlowRate * radius_hydraulic_rect(Width, Depth,
+                                                        OpenChannel)
+                   / (Width * Depth * np.asarray(Nu)))
+
+
+def re_channel(Vel, Area, PerimWetted, Nu):
+    """Return the Reynolds number of flow at a velocity (m/s) through a
+    general cross section.
+    """
+    return _result(4 * radius_hydraulic_channel(Area, PerimWetted)
+                   * np.asarray(Vel) / np.asarray(Nu))
+
+########################### Friction ###########################
+
+
+#: Default relative tolerance on 1/sqrt(f) of the Colebrook refinement.
+COLEBROOK_TOLERANCE = 1e-10
+
+#: Default maximum number of Newton iterations of the Colebrook refinement.
+COLEBROOK_MAX_ITERATIONS = 50
+
+
+def friction_factor(Re, RelativeRoughness, Colebrook=False,
+                    tol=COLEBROOK_TOLERANCE,
+                    maxiter=COLEBROOK_MAX_ITERATIONS):
+    """Return the Darcy friction factor for arrays of Reynolds numbers and
+    relative roughnesses (roughness / hydraulic diameter).
+
+    Elements below RE_TRANSITION_PIPE are laminar (64/Re); the rest use the
+    Swamee-Jain equation. If Colebrook is True, the turbulent elements are
+    then refined to the implicit Colebrook equation with a vectorized Newton
+    iteration on 1/sqrt(f), starting from the Swamee-Jain value. Elements
+    that have converged to a relative tolerance of tol are dropped from the
+    iteration, which stops after maxiter iterations.
+    """
+    Re = np.asarray(Re, dtype=float)
+    RelativeRoughness = np.asarray(RelativeRoughness, dtype=float)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        turbulent = (0.25 / (np.log10(RelativeRoughness / 3.7
+                                      + 5.74 / Re ** 0.9)) ** 2)
+        laminar = 64 / Re
+    f = np.where(Re >= RE_TRANSITION_PIPE, turbulent, laminar)
+    if Colebrook:
+        f = _colebrook(f, Re, RelativeRoughness, tol, maxiter)
+    return _result(f)
+
+
+def _colebrook(f, Re, RelativeRoughness, tol, maxiter):
+    """Refine the turbulent elements of f to the Colebrook equation."""
+    (f, Re, RelativeRoughness), shape = _broadcast(f, Re, RelativeRoughness)
+    f, Re, RelativeRoughness = f.ravel(), Re.ravel(), RelativeRoughness.ravel()
+    active = np.flatnonzero((Re >= RE_TRANSITION_PIPE) & np.isfinite(f)
+                            & (f > 0))
+    x = 1 / np.sqrt(f[active])
+    for _ in range(maxiter):
+        if active.size == 0:
+            break
+        a = RelativeRoughness[active] / 3.7
+        b = 2.51 / Re[active]
+        inner = a + b * x
+        # Newton step on g(x) = x + 2 log10(a + b x) = 0.
+        step = ((x + 2 * np.log10(inner))
+                / (1 + 2 * b / (np.log(10) * inner)))
+        x = x - step
+        converged = np.abs(step) <= tol * np.abs(x)
+        f[active[converged]] = 1 / x[converged] ** 2
+        active, x = active[~converged], x[~converged]
+    f[active] = 1 / x ** 2
+    return f.reshape(shape)
+
+
+def _fric(Re, Roughness, DiamHydraulic, Colebrook=False):
+    """Return the friction factor for a Reynolds number, wall roughness (m)
+    and hydraulic diameter (m).
+    """
+    with np.errstate(divide='ignore', invalid='ignore'):
+        RelativeRoughness = (np.asarray(Roughness, dtype=float)
+                             / np.asarray(DiamHydraulic, dtype=float))
+    return friction_factor(Re, RelativeRoughness, Colebrook)
+
+
+def fric_pipe(FlowRate, Diam, Nu, Roughness, Colebrook=False):
+    """Return the friction factor for pipe flow."""
+    return _fric(re_pipe(FlowRate, Diam, Nu), Roughness, Diam, Colebrook)
+
+
+def fric_rect(FlowRate, Width, Depth, Nu, Roughness, OpenChannel,
+              Colebrook=False):
+    """Return the friction factor of a rectangular channel, using 4 times
+    the hydraulic radius as the diameter in the Swamee-Jain equation.
+    """
+    return _fric(re_rect(FlowRate, Width, Depth, Nu, OpenChannel), Roughness,
+                 4 * radius_hydraulic_rect(Width, Depth, OpenChannel),
+                 Colebrook)
+
+
+def fric_channel(Area, PerimWetted, Vel, Nu, Roughness, Colebrook=False):
+    """Return the friction factor of a general channel, using 4 times the
+    hydraulic radius as the diameter in the Swamee-Jain equation.
+    """
+    return _fric(re_channel(Vel, Area, PerimWetted, Nu), Roughness,
+                 4 * radius_hydraulic_channel(Area, PerimWetted), Colebrook)
+
+######################### Head Loss #########################
+
+
+def headloss_major_pipe(FlowRate, Diam, Length, Nu, Roughness):
+    """Return the major head loss (m) due to wall shear in a pipe."""
+    FlowRate = np.asarray(FlowRate, dtype=float)
+    return _result(fric_pipe(FlowRate, Diam, Nu, Roughness)
+                   * 8 / (GRAVITY * np.pi**2)
+                   * (np.asarray(Length) * FlowRate**2)
+                   / np.asarray(Diam)**5)
+
+
+def headloss_minor_pipe(FlowRate, Diam, KMinor):
+    """Return the minor head loss (m) due to changes in geometry in a pipe."""
+    return _result(np.asarray(KMinor) * 8 / (GRAVITY * np.pi**2)
+                   * np.asarray(FlowRate)**2 / np.asarray(Diam)**4)
+
+
+def headloss_pipe(FlowRate, Diam, Length, Nu, Roughness, KMinor):
+    """Return the total head loss (m) from major and minor losses in a pipe.
+    """
+    return _result(headloss_major_pipe(FlowRate, Diam, Length, Nu, Roughness)
+                   + headloss_minor_pipe(FlowRate, Diam, KMinor))
+
+
+def headloss_pipe_slope(FlowRate, Diam, Length, Nu, Roughness, KMinor):
+    """Return the derivative (s/m²) of :func:`headloss_pipe` with respect to
+    the flow rate, for flow rates above 0:
+
+        dh/dQ = (h_major * (2 + d(ln f)/d(ln Q)) + 2 * h_minor) / Q
+    """
+    FlowRate = np.asarray(FlowRate, dtype=float)
+    h_major = headloss_major_pipe(FlowRate, Diam, Length, Nu, Roughness)
+    h_minor = headloss_minor_pipe(FlowRate, Diam, KMinor)
+    slope_q = _fric_pipe_slopes(FlowRate, Diam, Nu, Roughness)[0]
+    return _result((h_major * (2 + slope_q) + 2 * h_minor) / FlowRate)
+
+
+def headloss_major_rect(FlowRate, Width, Depth, Length, Nu, Roughness,
+                        OpenChannel):
+    """Return the major head loss (m) due to wall shear in a rectangular
+    channel.
+    """
+    FlowRate = np.asarray(FlowRate, dtype=float)
+    return _result(fric_rect(FlowRate, Width, Depth, Nu, Roughness,
+                             OpenChannel)
+                   * np.asarray(Length)
+                   / (4 * radius_hydraulic_rect(Width, Depth, OpenChannel))
+                   * FlowRate**2
+                   / (2 * GRAVITY * (np.asarray(Width)*np.asarray(Depth))**2))
+
+
+def headloss_minor_rect(FlowRate, Width, Depth, KMinor):
+    """Return the minor head loss (m) due to expansion in a rectangular
+    channel.
+    """
+    return _result(np.asarray(KMinor) * np.asarray(FlowRate)**2
+                   / (2 * GRAVITY
+                      * (np.asarray(Width)*np.asarray(Depth))**2))
+
+
+def headloss_rect(FlowRate, Width, Depth, Length, KMinor, Nu, Roughness,
+                  OpenChannel):
+    """Return the total head loss (m) from major and minor losses in a
+    rectangular channel.
+    """
+    return _result(headloss_minor_rect(FlowRate, Width, Depth, KMinor)
+                   + headloss_major_rect(FlowRate, Width, Depth, Length, Nu,
+                                         Roughness, OpenChannel))
+
+
+def headloss_major_channel(Area, PerimWetted, Vel, Length, Nu, Roughness):
+    """Return the major head loss (m) due to wall shear in a general channel.
+    """
+    return _result(fric_channel(Area, PerimWetted, Vel, Nu, Roughness)
+                   * np.asarray(Length)
+                   / (4 * radius_hydraulic_channel(Area, PerimWetted))
+                   * np.asarray(Vel)**2 / (2*GRAVITY))
+
+
+def headloss_minor_channel(Vel, KMinor):
+    """Return the minor head loss (m) due to expansion in a general channel.
+    """
+    return _result(np.asarray(KMinor) * np.asarray(Vel)**2 / (2*GRAVITY))
+
+
+def headloss_channel(Area, Vel, PerimWetted, Length, KMinor, Nu, Roughness):
+    """Return the total head loss (m) from major and minor losses in a
+    general channel.
+    """
+    return _result(headloss_minor_channel(Vel, KMinor)
+                   + headloss_major_channel(Area, PerimWetted, Vel, Length,
+                                            Nu, Roughness))
+
+
+def headloss_manifold(FlowRate, Diam, Length, KMinor, Nu, Roughness,
+                      NumOutlets):
+    """Return the total head loss (m) through a manifold."""
+    NumOutlets = np.asarray(NumOutlets, dtype=float)
+    return _result(headloss_pipe(FlowRate, Diam, Length, Nu, Roughness,
+                                 KMinor)
+                   * ((1/3)
+                      + (1 / (2*NumOutlets))
+                      + (1 / (6*NumOutlets**2))))
+
+
+def headloss_minor_elbow(FlowRate, Diam, KMinor):
+    """Return the minor head loss (m) in an elbow."""
+    vel = np.asarray(FlowRate) / area_circle(Diam)
+    return _result(np.asarray(KMinor) * vel ** 2 / (2 * GRAVITY))
+
+######################### Orifices #########################
+
+
+def flow_orifice(Diam, Height, RatioVCOrifice):
+    """Return the flow rate (m³/s) of an orifice of a given diameter (m) at a
+    piezometric height (m). Orifices with a non-positive height have no flow.
+    """
+    Height = np.asarray(Height, dtype=float)
+    return _result(np.where(Height > 0,
+                            np.asarray(RatioVCOrifice) * area_circle(Diam)
+                            * np.sqrt(2 * GRAVITY * np.maximum(Height, 0)),
+                            0))
+
+
+#: The number of Gauss-Legendre nodes used to integrate the flow through a
+#: vertical orifice.
+ORIFICE_VERT_NODES_N = 64
+
+_ORIFICE_VERT_NODES, _ORIFICE_VERT_WEIGHTS = \
+    np.polynomial.legendre.leggauss(ORIFICE_VERT_NODES_N)
+
+
+def flow_orifice_vert(Diam, Height, RatioVCOrifice):
+    """Return the flow rate (m³/s) of an orifice in a vertical wall of a given
+    diameter (m), whose center is at a piezometric height (m).
+
+    The velocity is integrated over the submerged part of the orifice with
+    Gauss-Legendre quadrature in the angle θ, where z = c - r cos(θ). This
+    removes the square-root zeros of the integrand at both ends of the
+    interval, so that a fixed number of nodes is accurate for any height.
+    """
+    arrays, shape = _broadcast(Diam, Height, RatioVCOrifice)
+    Diam, Height, Ratio = (array.ravel() for array in arrays)
+    radius = Diam / 2
+    top = np.minimum(radius, Height)
+    center = ((top - radius) / 2)[:, np.newaxis]
+    half = ((top + radius) / 2)[:, np.newaxis]
+    theta = np.pi / 2 * (_ORIFICE_VERT_NODES + 1)
+    z = center - half * np.cos(theta)
+    width = 2 * np.sqrt(np.maximum(radius[:, np.newaxis]**2 - z**2, 0))
+    depth = np.maximum(Height[:, np.newaxis] - z, 0)
+    integral = np.pi / 2 * np.sum(
+        _ORIFICE_VERT_WEIGHTS * width * np.sqrt(depth) * half * np.sin(theta),
+        axis=-1)
+    flow = np.where(Height > -radius,
+                    Ratio * np.sqrt(2 * GRAVITY) * integral, 0)
+    return _result(flow.reshape(shape))
+
+
+def head_orifice(Diam, RatioVCOrifice, FlowRate):
+    """Return the piezometric head (m) of an orifice."""
+    return _result((np.asarray(FlowRate)
+                    / (np.asarray(RatioVCOrifice) * area_circle(Diam))
+                    )**2
+                   / (2*GRAVITY))
+
+
+def area_orifice(Height, RatioVCOrifice, FlowRate):
+    """Return the area (m²) of an orifice."""
+    return _result(np.asarray(FlowRate)
+                   / (np.asarray(RatioVCOrifice)
+                      * np.sqrt(2 * GRAVITY * np.asarray(Height))))
+
+
+def num_orifices(FlowRate, RatioVCOrifice, HeadLossOrifice, DiamOrifice):
+    """Return the number of orifices."""
+    return _result(np.ceil(area_orifice(HeadLossOrifice, RatioVCOrifice,
+                                        FlowRate)
+                           / area_circle(DiamOrifice)))
+
+########################### Flows ###########################
+
+
+def flow_transition(Diam, Nu):
+    """Return the flow rate (m³/s) of the laminar/turbulent transition."""
+    return _result(np.pi * np.asarray(Diam) * RE_TRANSITION_PIPE
+                   * np.asarray(Nu) / 4)
+
+
+def flow_hagen(Diam, HeadLossMajor, Length, Nu):
+    """Return the flow rate (m³/s) for laminar flow with only major losses.
+    """
+    return _result((np.pi*np.asarray(Diam)**4) / (128*np.asarray(Nu))
+                   * GRAVITY * np.asarray(HeadLossMajor)
+                   / np.asarray(Length))
+
+
+def flow_swamee(Diam, HeadLossMajor, Length, Nu, Roughness):
+    """Return the flow rate (m³/s) for turbulent flow with only major losses.
+    """
+    Diam = np.asarray(Diam, dtype=float)
+    HeadLossMajor = np.asarray(HeadLossMajor, dtype=float)
+    Length = np.asarray(Length, dtype=float)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        logterm = np.log10(np.asarray(Roughness) / (3.7 * Diam)
+                           + 2.51 * np.asarray(Nu)
+                           * np.sqrt(Length / (2 * GRAVITY * HeadLossMajor
+                                               * Diam**3)))
+        return _result((-np.pi / np.sqrt(2)) * Diam**(5/2) * logterm
+                       * np.sqrt(GRAVITY * HeadLossMajor / Length))
+
+
+def flow_major_pipe(Diam, HeadLossMajor, Length, Nu, Roughness):
+    """Return the flow rate (m³/s) with only major losses, for both laminar
+    and turbulent flow.
+    """
+    FlowHagen = flow_hagen(Diam, HeadLossMajor, Length, Nu)
+    return _result(np.where(FlowHagen < flow_transition(Diam, Nu),
+                            FlowHagen,
+                            flow_swamee(Diam, HeadLossMajor, Length, Nu,
+                                        Roughness)))
+
+
+def flow_minor_pipe(Diam, HeadLossMinor, KMinor):
+    """Return the flow rate (m³/s) with only minor losses."""
+    with np.errstate(divide='ignore'):
+        return _result(area_circle(Diam)
+                       * np.sqrt(2 * GRAVITY * np.asarray(HeadLossMinor)
+                                 / np.asarray(KMinor)))
+
+
+#: Default relative tolerance of the :func:`flow_pipe`, :func:`diam_pipe` and
+#: :func:`manifold_id` solvers.
+PIPE_SOLVER_TOLERANCE = 1e-10
+
+#: Default maximum number of iterations of the :func:`flow_pipe`,
+#: :func:`diam_pipe` and :func:`manifold_id` solvers.
+PIPE_SOLVER_MAX_ITERATIONS = 100
+
+
+def _fric_pipe_slopes(FlowRate, Diam, Nu, Roughness):
+    """Return d(ln f)/d(ln Q) and d(ln f)/d(ln D) of the pipe friction
+    factor, from 64/Re for laminar flow and from the Swamee-Jain equation for
+    turbulent flow.
+    """
+    Re = re_pipe(FlowRate, Diam, Nu)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        rough = np.asarray(Roughness, dtype=float) / (3.7 * np.asarray(Diam))
+        s = 5.74 / Re ** 0.9
+        scale = np.log(10) * np.log10(rough + s) * (rough + s)
+        slope_q = 1.8 * s / scale
+        slope_d = (2 * rough - 1.8 * s) / scale
+    turbulent = Re >= RE_TRANSITION_PIPE
+    return (np.where(turbulent, slope_q, -1.0),
+            np.where(turbulent, slope_d, 1.0))
+
+
+def _solve_increasing(func, x, args, tol, maxiter):
+    """Solve func(x, *args) = 0 elementwise for residuals that increase
+    with x > 0.
+
+    func returns the residual and its derivative. Each element keeps a
+    bracket (lo, hi) of its root, starting from (0, inf), and takes Newton
+    steps from its starting point x. A step that is not within tolerance is
+    replaced by bisection (or by doubling x while hi is infinite) if it
+    leaves the bracket or is not half the size of the step before last,
+    which also handles the jump in the friction factor at the
+    laminar/turbulent transition. Elements whose step or bracket is within a
+    relative tolerance of tol are dropped from the iteration, which stops
+    after maxiter iterations.
+
+    Returns the solutions and the number of iterations of each element.
+    """
+    x = np.array(x, dtype=float)
+    result = x.copy()
+    iterations = np.zeros(x.shape, dtype=int)
+    active = np.arange(x.size)
+    lo, hi = np.zeros_like(x), np.full_like(x, np.inf)
+    step = step_old = np.full_like(x, np.inf)
+    for _ in range(maxiter):
+        if active.size == 0:
+            break
+        iterations[active] += 1
+        residual, slope = func(x, *args)
+        above = residual > 0
+        hi = np.where(above, x, hi)
+        lo = np.where(above, lo, x)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            x_new = x - residual / slope
+        bounded = np.isfinite(hi)
+        small = np.abs(x_new - x) <= tol * x
+        bisect = ~small & (~(x_new > lo) | ~(x_new < hi)
+                           | (np.abs(x_new - x) > np.abs(step_old) / 2))
+        x_new = np.where(bisect, np.where(bounded, (lo + hi) / 2, 2 * lo),
+                         x_new)
+        step_old, step = step, x_new - x
+        converged = ((np.abs(step) <= tol * x_new)
+                     | (bounded & (hi - lo <= tol * hi)) | (residual == 0))
+        x = np.where(residual == 0, x, x_new)
+        result[active] = x
+        keep = ~converged
+        active = active[keep]
+        args = tuple(arg[keep] for arg in args)
+        x, lo, hi, step, step_old = (x[keep], lo[keep], hi[keep], step[keep],
+                                     step_old[keep])
+    return result, iterations
+
+
+def _flow_pipe_residual(FlowRate, Diam, HeadLoss, Length, Nu, Roughness,
+                        KMinor):
+    """Return headloss_pipe - HeadLoss and its derivative with respect to
+    the flow rate.
+    """
+    h_major = np.array(headloss_major_pipe(FlowRate, Diam, Length, Nu,
+                                           Roughness), ndmin=1)
+    h_minor = np.array(headloss_minor_pipe(FlowRate, Diam, KMinor), ndmin=1)
+    slope_q = _fric_pipe_slopes(FlowRate, Diam, Nu, Roughness)[0]
+    return (h_major + h_minor - HeadLoss,
+            (h_major * (2 + slope_q) + 2 * h_minor) / FlowRate)
+
+
+def flow_pipe(Diam, HeadLoss, Length, Nu, Roughness, KMinor,
+              tol=PIPE_SOLVER_TOLERANCE, maxiter=PIPE_SOLVER_MAX_ITERATIONS,
+              full_output=False):
+    """Return the flow rate (m³/s) in a pipe with both major and minor losses.
+
+    Elements with a non-zero KMinor solve headloss_pipe(Q) = HeadLoss
+    together with a safeguarded Newton iteration, starting from the smaller
+    of the flow rates with only major or only minor losses. The head loss
+    increases with Q in both the laminar and turbulent regimes, and the
+    Newton steps use its analytic derivative
+
+        dh/dQ = (h_major * (2 + d(ln f)/d(ln Q)) + 2 * h_minor) / Q
+
+    An element is converged when its step or its bracket of the root is
+    within a relative tolerance of tol, and the iteration stops after
+    maxiter iterations.
+
+    If full_output is True, also return the number of iterations of each
+    element (0 for elements without minor losses).
+    """
+    (Diam, HeadLoss, Length, Nu, Roughness, KMinor), shape = _broadcast(
+        Diam, HeadLoss, Length, Nu, Roughness, KMinor)
+    Diam, HeadLoss, Length, Nu, Roughness, KMinor = (
+        a.ravel() for a in (Diam, HeadLoss, Length, Nu, Roughness, KMinor))
+    FlowRate = np.array(flow_major_pipe(Diam, HeadLoss, Length, Nu,
+                                        Roughness), ndmin=1)
+    iterations = np.zeros(FlowRate.shape, dtype=int)
+    minor = KMinor != 0
+    if np.any(minor):
+        FlowRate[minor] = np.minimum(
+            FlowRate[minor],
+            flow_minor_pipe(Diam[minor], HeadLoss[minor], KMinor[minor]))
+        active = minor & (FlowRate > 0)
+        FlowRate[active], iterations[active] = _solve_increasing(
+            _flow_pipe_residual, FlowRate[active],
+            tuple(a[active] for a in (Diam, HeadLoss, Length, Nu, Roughness,
+                                      KMinor)),
+            tol, maxiter)
+    FlowRate = _result(FlowRate.reshape(shape))
+    if full_output:
+        return FlowRate, iterations.reshape(shape)[()]
+    return FlowRate
+
+########################## Diameters ##########################
+
+
+def diam_hagen(FlowRate, HeadLossMajor, Length, Nu):
+    """Return the inner diameter (m) of a pipe with laminar flow and no minor
+    losses.
+    """
+    return _result(((128 * np.asarray(Nu) * np.asarray(FlowRate)
+                     * np.asarray(Length))
+                    / (GRAVITY * np.asarray(HeadLossMajor) * np.pi)
+                    ) ** (1/4))
+
+
+def diam_swamee(FlowRate, HeadLossMajor, Length, Nu, Roughness):
+    """Return the inner diameter (m) of a pipe with turbulent flow and no
+    minor losses.
+    """
+    FlowRate = np.asarray(FlowRate, dtype=float)
+    Length = np.asarray(Length, dtype=float)
+    HeadLossMajor = np.asarray(HeadLossMajor, dtype=float)
+    a = ((np.asarray(Roughness, dtype=float) ** 1.25)
+         * ((Length * FlowRate**2)
+            / (GRAVITY * HeadLossMajor)
+            )**4.75
+         )
+    b = (np.asarray(Nu, dtype=float)**5 * FlowRate**47
+         * (Length / (GRAVITY * HeadLossMajor)) ** 26
+         )**0.2
+    return _result(0.66 * (a+b)**0.04)
+
+
+def diam_major_pipe(FlowRate, HeadLossMajor, Length, Nu, Roughness):
+    """Return the pipe inner diameter (m) that would result in the given
+    major losses, for both laminar and turbulent flow.
+    """
+    DiamLaminar = diam_hagen(FlowRate, HeadLossMajor, Length, Nu)
+    return _result(np.where(re_pipe(FlowRate, DiamLaminar, Nu)
+                            <= RE_TRANSITION_PIPE,
+                            DiamLaminar,
+                            diam_swamee(FlowRate, HeadLossMajor, Length, Nu,
+                                        Roughness)))
+
+
+def diam_minor_pipe(FlowRate, HeadLossMinor, KMinor):
+    """Return the pipe inner diameter (m) that would result in the given
+    minor losses.
+    """
+    return _result(np.sqrt(4 * np.asarray(FlowRate) / np.pi)
+                   * (np.asarray(KMinor)
+                      / (2 * GRAVITY * np.asarray(HeadLossMinor))) ** (1/4))
+
+
+def _diam_pipe_residual(Diam, FlowRate, HeadLoss, Length, Nu, Roughness,
+                        KMinor):
+    """Return HeadLoss - headloss_pipe, which increases with the diameter,
+    and its derivative with respect to the diameter.
+    """
+    h_major = np.array(headloss_major_pipe(FlowRate, Diam, Length, Nu,
+                                           Roughness), ndmin=1)
+    h_minor = np.array(headloss_minor_pipe(FlowRate, Diam, KMinor), ndmin=1)
+    slope_d = _fric_pipe_slopes(FlowRate, Diam, Nu, Roughness)[1]
+    return (HeadLoss - h_major - h_minor,
+            (h_major * (5 - slope_d) + 4 * h_minor) / Diam)
+
+
+def diam_pipe(FlowRate, HeadLoss, Length, Nu, Roughness, KMinor, guess=None,
+              warm_start=False, tol=PIPE_SOLVER_TOLERANCE,
+              maxiter=PIPE_SOLVER_MAX_ITERATIONS, full_output=False):
+    """Return the pipe inner diameter (m) that would result in the given
+    total head loss.
+
+    Elements with a non-zero KMinor solve headloss_pipe(D) = HeadLoss
+    together with the safeguarded Newton iteration of :func:`flow_pipe`,
+    using the analytic derivative
+
+        dh/dD = -(h_major * (5 - d(ln f)/d(ln D)) + 4 * h_minor) / D
+
+    Each element starts from its guess (m) if one is given, and otherwise
+    from the larger of the diameters with only major or only minor losses.
+    If warm_start is True, the elements are instead solved one index of the
+    last axis at a time, each starting from the solution at the previous
+    index, so that a sweep along that axis converges in a few iterations
+    per point. Elements without minor losses are given by
+    :func:`diam_major_pipe`.
+
+    If full_output is True, also return the number of iterations of each
+    element (0 for elements without minor losses).
+    """
+    arrays, shape = _broadcast(FlowRate, HeadLoss, Length, Nu, Roughness,
+                               KMinor)
+    # Rows of independent elements, by index of the last axis.
+    arrays = [a.reshape(-1, a.shape[-1]) for a in arrays]
+    FlowRate, HeadLoss, Length, Nu, Roughness, KMinor = arrays
+    Diam = np.array(diam_major_pipe(FlowRate, HeadLoss, Length, Nu,
+                                    Roughness), ndmin=2)
+    iterations = np.zeros(Diam.shape, dtype=int)
+    minor = KMinor != 0
+    start = np.maximum(Diam, diam_minor_pipe(FlowRate, HeadLoss, KMinor))
+    if guess is not None:
+        start = np.broadcast_to(np.asarray(guess, dtype=float),
+                                shape).reshape(Diam.shape)
+    columns = ([slice(j, j + 1) for j in range(Diam.shape[1])]
+               if warm_start and guess is None else [slice(None)])
+    previous = None
+    for column in columns:
+        active = minor[:, column]
+        x = (start[:, column] if previous is None
+             else np.broadcast_to(previous[:, None], active.shape))
+        if np.any(active):
+            Diam[:, column][active], iterations[:, column][active] = \
+                _solve_increasing(_diam_pipe_residual, x[active],
+                                  tuple(a[:, column][active] for a in arrays),
+                                  tol, maxiter)
+        previous = Diam[:, column][:, 0]
+    Diam = _result(Diam.reshape(shape))
+    if full_output:
+        return Diam, iterations.reshape(shape)[()]
+    return Diam
+
+
+def pipe_ID(FlowRate, Pressure):
+    """Return the inner diameter (m) of a pipe for a given pressure recovery
+    constraint (m).
+    """
+    return _result(np.sqrt(np.asarray(FlowRate)
+                           / ((np.pi/4)
+                              * np.sqrt(2*GRAVITY*np.asarray(Pressure)))))
+
+############################ Weirs ############################
+
+
+def width_weir_rect(FlowRate, Height, RatioVCOrifice):
+    """Return the width (m) of a rectangular weir given its flow rate (m³/s)
+    and the height (m) of the water above the weir.
+    """
+    return _result((3 / 2) * np.asarray(FlowRate)
+                   / (np.asarray(RatioVCOrifice) * np.sqrt(2 * GRAVITY)
+                      * np.asarray(Height) ** (3 / 2)))
+
+
+def headloss_weir_rect(FlowRate, Width, RatioVCOrifice):
+    """Return the head loss (m) of a rectangular or vertical pipe weir."""
+    return _result((((3/2) * np.asarray(FlowRate)
+                     / (np.asarray(RatioVCOrifice) * np.sqrt(2 * GRAVITY)
+                        * np.asarray(Width))
+                     ) ** 2) ** (1/3))
+
+
+def flow_weir_rect(Height, Width, RatioVCOrifice):
+    """Return the flow rate (m³/s) of a rectangular or vertical pipe weir."""
+    return _result((2/3) * np.asarray(RatioVCOrifice)
+                   * (np.sqrt(2*GRAVITY) * np.asarray(Height)**(3/2))
+                   * np.asarray(Width))
+
+######################## Porous Media ########################
+
+
+def re_ergun(ApproachVel, DiamMedia, Temperature, Porosity):
+    """Return the Reynolds number for flow through porous media."""
+    return _result(np.asarray(ApproachVel) * np.asarray(DiamMedia)
+                   / (viscosity_kinematic_water(Temperature)
+                      * (1 - np.asarray(Porosity))))
+
+
+def fric_ergun(ApproachVel, DiamMedia, Temperature, Porosity):
+    """Return the friction factor for flow through porous media."""
+    return _result(300 / re_ergun(ApproachVel, DiamMedia, Temperature,
+                                  Porosity) + 3.5)
+
+
+def headloss_ergun(ApproachVel, DiamMedia, Temperature, Porosity, Length):
+    """Return the frictional head loss (m) for flow through porous media."""
+    ApproachVel = np.asarray(ApproachVel, dtype=float)
+    Porosity = np.asarray(Porosity, dtype=float)
+    return _result(fric_ergun(ApproachVel, DiamMedia, Temperature, Porosity)
+                   * np.asarray(Length) / np.asarray(DiamMedia)
+                   * ApproachVel**2 / (2*GRAVITY) * (1-Porosity)
+                   / Porosity**3)
+
+
+def g_cs_ergun(ApproachVel, DiamMedia, Temperature, Porosity):
+    """Return the Camp Stein velocity gradient (1/s) for flow through porous
+    media.
+    """
+    ApproachVel = np.asarray(ApproachVel, dtype=float)
+    Porosity = np.asarray(Porosity, dtype=float)
+    return _result(np.sqrt(fric_ergun(ApproachVel, DiamMedia, Temperature,
+                                      Porosity)
+                           * ApproachVel**3 * (1-Porosity)
+                           / (2 * viscosity_kinematic_water(Temperature)
+                              * np.asarray(DiamMedia) * Porosity**4)))
+
+######################## Miscellaneous ########################
+
+
+def height_water_critical(FlowRate, Width):
+    """Return the critical local water height (m)."""
+    return _result((np.asarray(FlowRate)
+                    / (np.asarray(Width) * np.sqrt(GRAVITY))) ** (2/3))
+
+
+def vel_horizontal(HeightWaterCritical):
+    """Return the horizontal velocity (m/s) at the critical water height (m).
+    """
+    return _result(np.sqrt(GRAVITY * np.asarray(HeightWaterCritical)))
+
+
+def manifold_id_alt(q, pr_max):
+    """Return the inner diameter (m) of a manifold when major losses are
+    negligible.
+    """
+    return _result(np.sqrt(4 * np.asarray(q)
+                           / (np.pi * np.sqrt(2 * GRAVITY
+                                              * np.asarray(pr_max)))))
+
+
+def _manifold_id_map(Diam, q, h, q_ratio, n, nu, eps):
+    """Return the manifold diameter (m) that gives the head loss h with the
+    friction factor at the diameter Diam.
+    """
+    outlets = 1 / 3 + 1 / (2 * n) + 1 / (6 * n ** 2)
+    return (((8 * q ** 2) / (GRAVITY * np.pi ** 2 * h))
+            * ((1 + fric_pipe(q, Diam, nu, eps) * outlets)
+               / (1 - q_ratio ** 2))) ** (1 / 4)
+
+
+def manifold_id(q, h, q_ratio, n, nu, eps, guess=None,
+                tol=PIPE_SOLVER_TOLERANCE, maxiter=PIPE_SOLVER_MAX_ITERATIONS,
+                full_output=False):
+    """Return the inner diameter (m) of a manifold with n outlets, a total
+    flow rate q (m³/s), a head loss h (m) and a ratio q_ratio of the smallest
+    to the largest outlet flow rate.
+
+    The diameter is the fixed point of
+
+        D = (8 q² / (g π² h) * (1 + f(D) * (1/3 + 1/(2n) + 1/(6n²)))
+             / (1 - q_ratio²)) ** (1/4)
+
+    which is solved for all elements together with Steffensen's method: each
+    iteration takes two fixed-point steps and then the Aitken extrapolation
+    of the three diameters, or the second step if the extrapolation is not a
+    positive number. Each element starts from its guess (m) if one is given,
+    and otherwise from the diameter without friction. An element is
+    converged when a fixed-point step is within a relative tolerance of tol,
+    and the iteration stops after maxiter iterations.
+
+    If full_output is True, also return the number of iterations of each
+    element and whether it converged.
+    """
+    arrays, shape = _broadcast(q, h, q_ratio, n, nu, eps)
+    arrays = tuple(a.ravel() for a in arrays)
+    q, h, q_ratio, n = arrays[:4]
+    if guess is None:
+        x = (((8 * q ** 2) / (GRAVITY * np.pi ** 2 * h))
+             / (1 - q_ratio ** 2)) ** (1 / 4)
+    else:
+        x = np.broadcast_to(np.asarray(guess, dtype=float), shape).ravel()
+    Diam = np.array(x, dtype=float)
+    iterations = np.zeros(Diam.shape, dtype=int)
+    converged = np.zeros(Diam.shape, dtype=bool)
+    active = np.arange(Diam.size)
+    args = arrays
+    for _ in range(maxiter):
+        if active.size == 0:
+            break
+        iterations[active] += 1
+        x1 = np.array(_manifold_id_map(x, *args), ndmin=1)
+        x2 = np.array(_manifold_id_map(x1, *args), ndmin=1)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            accelerated = x - (x1 - x) ** 2 / (x2 - 2 * x1 + x)
+        done = np.abs(x2 - x1) <= tol * x2
+        x = np.where(done | ~(accelerated > 0) | ~np.isfinite(accelerated),
+                     x2, accelerated)
+        Diam[active] = x
+        converged[active] = done
+        keep = ~done
+        active, x = active[keep], x[keep]
+        args = tuple(arg[keep] for arg in args)
+    Diam = _result(Diam.reshape(shape))
+    if full_output:
+        return (Diam, iterations.reshape(shape)[()],
+                converged.reshape(shape)[()])
+    return Diam
+
+
+#: Default relative tolerance of the :func:`horiz_chan_w` and
+#: :func:`horiz_chan_h` solvers.
+CHANNEL_SOLVER_TOLERANCE = 1e-10
+
+#: Default maximum number of iterations of the :func:`horiz_chan_w` and
+#: :func:`horiz_chan_h` solvers.
+CHANNEL_SOLVER_MAX_ITERATIONS = 100
+
+
+def _solve_bracketed(func, x, args, tol, maxiter):
+    """Solve func(x, *args) = 0 elementwise for residuals that are negative
+    below the root and positive above it, for x > 0.
+
+    Each element starts from x and halves or doubles it until the root is
+    bracketed, and then narrows the bracket (lo, hi) with the Illinois
+    variant of false position, using bisection when a step does not fall
+    strictly inside the bracket. Elements whose residual is zero or whose
+    bracket is within a relative tolerance of tol are dropped from the
+    iteration, which stops after maxiter residual evaluations.
+
+    Returns the solutions, the number of iterations of each element and
+    whether each element converged.
+    """
+    x = np.array(x, dtype=float)
+    result = x.copy()
+    iterations = np.zeros(x.shape, dtype=int)
+    converged = np.zeros(x.shape, dtype=bool)
+    active = np.arange(x.size)
+    lo = f_lo = np.full_like(x, np.nan)
+    hi = f_hi = np.full_like(x, np.nan)
+    # The end of the bracket that was last replaced, -1 for lo and 1 for hi.
+    side = np.zeros(x.shape, dtype=int)
+    for _ in range(maxiter):
+        if active.size == 0:
+            break
+        iterations[active] += 1
+        residual = np.array(func(x, *args), ndmin=1)
+        above = residual > 0
+        # Illinois: halve the residual kept at the other end of the bracket
+        # when the same end is replaced twice in a row.
+        f_lo = np.where(above & (side == 1), f_lo / 2, f_lo)
+        f_hi = np.where(~above & (side == -1), f_hi / 2, f_hi)
+        hi, f_hi = np.where(above, x, hi), np.where(above, residual, f_hi)
+        lo, f_lo = np.where(above, lo, x), np.where(above, f_lo, residual)
+        side = np.where(above, 1, -1)
+        bracketed = np.isfinite(lo) & np.isfinite(hi)
+        done = (residual == 0) | (bracketed & (hi - lo <= tol * hi))
+        result[active] = x
+        converged[active] = done
+        with np.errstate(divide='ignore', invalid='ignore'):
+            x_new = (lo * f_hi - hi * f_lo) / (f_hi - f_lo)
+        x_new = np.where(~(x_new > lo) | ~(x_new < hi), (lo + hi) / 2,
+                         x_new)
+        x_new = np.where(np.isnan(lo), hi / 2,
+                         np.where(np.isnan(hi), 2 * lo, x_new))
+        keep = ~done
+        active = active[keep]
+        args = tuple(arg[keep] for arg in args)
+        x, lo, hi, f_lo, f_hi, side = (x_new[keep], lo[keep], hi[keep],
+                                       f_lo[keep], f_hi[keep], side[keep])
+    return result, iterations, converged
+
+
+def _horiz_chan_w_residual(Width, q, depth, hl, l, nu, eps, manifold, k):
+    """Return the difference between the channel width and the width that
+    gives the head loss hl with the losses at that width.
+    """
+    radius = radius_hydraulic_rect(Width, depth, True)
+    return Width - (np.sqrt((1 + k + fric_rect(q, Width, depth, nu, eps, True)
+                             * (l / (4 * radius)) * (1 - 2 * manifold / 3))
+                            / (2 * GRAVITY * hl))
+                    * (q / depth))
+
+
+def horiz_chan_w(q, depth, hl, l, nu, eps, manifold, k,
+                 tol=CHANNEL_SOLVER_TOLERANCE,
+                 maxiter=CHANNEL_SOLVER_MAX_ITERATIONS, full_output=False):
+    """Return the width (m) of an open channel with a flow rate q (m³/s),
+    an upstream water depth (m), a head loss hl (m), a length l (m) and a
+    minor loss coefficient k. If manifold is True, the flow leaves the
+    channel uniformly along its length, which reduces the major losses to a
+    third.
+
+    The head loss is limited to a third of the depth. The width is solved
+    for with the bracketed false position iteration of
+    :func:`_solve_bracketed`, starting from the width without losses, so
+    each element is converged to a relative tolerance of tol unless it
+    reaches maxiter iterations.
+
+    If full_output is True, also return the number of iterations of each
+    element and whether it converged.
+    """
+    arrays, shape = _broadcast(q, depth, hl, l, nu, eps, manifold, k)
+    q, depth, hl, l, nu, eps, manifold, k = (a.ravel() for a in arrays)
+    hl = np.minimum(hl, depth / 3)
+    depth = depth - hl
+    Width, iterations, converged = _solve_bracketed(
+        _horiz_chan_w_residual, q / (depth * np.sqrt(2 * GRAVITY * hl)),
+        (q, depth, hl, l, nu, eps, manifold, k), tol, maxiter)
+    Width = _result(Width.reshape(shape))
+    if full_output:
+        return (Width, iterations.reshape(shape)[()],
+                converged.reshape(shape)[()])
+    return Width
+
+
+def _horiz_chan_h_residual(Height, q, w, hl, l, nu, eps, manifold):
+    """Return the difference between the channel water height and the
+    height that gives the head loss hl with the losses at that height.
+    """
+    hl = np.minimum(hl, Height / 3)
+    depth = Height - hl
+    radius = radius_hydraulic_rect(w, depth, True)
+    return Height - ((q / w) * np.sqrt(
+        (1 + fric_rect(q, w, depth, nu, eps, True) * (l / (4 * radius))
+         * (1 - 2 * manifold / 3))
+        / (2 * GRAVITY * hl)) + hl)
+
+
+def horiz_chan_h(q, w, hl, l, nu, eps, manifold,
+                 tol=CHANNEL_SOLVER_TOLERANCE,
+                 maxiter=CHANNEL_SOLVER_MAX_ITERATIONS, full_output=False):
+    """Return the upstream water height (m) of an open channel with a flow
+    rate q (m³/s), a width w (m), a head loss hl (m) and a length l (m). If
+    manifold is True, the flow leaves the channel uniformly along its
+    length, which reduces the major losses to a third.
+
+    The head loss is limited to a third of the height. The height is solved
+    for with the bracketed false position iteration of
+    :func:`_solve_bracketed`, starting from the height without major losses,
+    so each element is converged to a relative tolerance of tol unless it
+    reaches maxiter iterations.
+
+    If full_output is True, also return the number of iterations of each
+    element and whether it converged.
+    """
+    arrays, shape = _broadcast(q, w, hl, l, nu, eps, manifold)
+    q, w, hl, l, nu, eps, manifold = (a.ravel() for a in arrays)
+    Height, iterations, converged = _solve_bracketed(
+        _horiz_chan_h_residual, q / (w * np.sqrt(2 * GRAVITY * hl)) + hl,
+        (q, w, hl, l, nu, eps, manifold), tol, maxiter)
+    Height = _result(Height.reshape(shape))
+    if full_output:
+        return (Height, iterations.reshape(shape)[()],
+                converged.reshape(shape)[()])
+    return Height
+
+
+def pipe_flow_index(FlowRate, Diams, HeadLoss, Length, Nu, Roughness,
+                    KMinor):
+    """Return the index of the smallest of the sorted inner diameters Diams
+    (m) whose flow capacity with the given head loss is at least FlowRate
+    (m³/s), or len(Diams) if there is none.
+
+    The flow capacity of :func:`flow_pipe` increases with the diameter, so
+    the index is found by a binary search that needs about log2(len(Diams))
+    flow_pipe solves, each of which is evaluated for all elements together.
+    """
+    Diams = np.asarray(Diams, dtype=float)
+    arrays, shape = _broadcast(FlowRate, HeadLoss, Length, Nu, Roughness,
+                               KMinor)
+    FlowRate, *args = (a.ravel() for a in arrays)
+    lo = np.zeros(FlowRate.shape, dtype=int)
+    hi = np.full(FlowRate.shape, Diams.size)
+    active = np.flatnonzero(lo < hi)
+    while active.size > 0:
+        mid = (lo[active] + hi[active]) // 2
+        capacity = flow_pipe(Diams[mid], *(a[active] for a in args))
+        enough = FlowRate[active] <= capacity
+        hi[active] = np.where(enough, mid, hi[active])
+        lo[active] = np.where(enough, lo[active], mid + 1)
+        active = active[lo[active] < hi[active]]
+    return lo.reshape(shape)[()]
@@ -1,20 +1,67 @@
 """Contains functions pertaining to the design of physical and chemical unit
 processes of AguaClara water treatment plants.
+
+Most functions validate and convert their Pint Quantity inputs once and then
+evaluate the unit-free kernel of the same name in
+:mod:`aguaclara.core.kernels`.
 """
 
 from aguaclara.core.units import u
+from aguaclara.core.cache import ac_cache
 import aguaclara.core.constants as con
+import aguaclara.core.kernels as kernels
 import aguaclara.core.utility as ut
 import aguaclara.core.pipes as pipe
 
 import numpy as np
-from scipy import interpolate, integrate
 import warnings
 
+# SI units of the values passed to and returned by the kernels.
+_M = u.m
+_M2 = u.m**2
+_M3_S = u.m**3/u.s
+_M2_S = u.m**2/u.s
+_M_S = u.m/u.s
+
+
+def _si(value, units):
+    """Return the magnitude of a quantity in the given units, for passing to
+    the kernels. Plain numbers are assumed to already be in those units.
+    """
+    if isinstance(value, u.Quantity):
+        return value.m_as(units)
+    return value
+
+
+def _solve(kernel, *args, **kw):
+    """Run a kernel solver and return its result and whether every element
+    converged.
+
+    The flag is cached with the result by the callers, so that a cache hit
+    on a result that did not converge warns again.
+    """
+    result, iterations, converged = kernel(*args, full_output=True, **kw)
+    return result, bool(np.all(converged))
+
+
+@ac_cache
+def _manifold_id(*args, **kw):
+    return _solve(kernels.manifold_id, *args, **kw)
+
+
+@ac_cache
+def _horiz_chan_w(*args, **kw):
+    return _solve(kernels.horiz_chan_w, *args, **kw)
+
+
+@ac_cache
+def _horiz_chan_h(*args, **kw):
+    return _solve(kernels.horiz_chan_h, *args, **kw)
+
 ############################ Gas ##############################
 
 
-@ut.list_handler()
+@ut.list_handler(broadcast=True)
 def density_air(Pressure, MolarMass, Temperature):
     """
     .. deprecated::
@@ -25,7 +72,7 @@ def density_air(Pressure, MolarMass, Temperature):
     return density_gas(Pressure, MolarMass, Temperature)
 
 
-@ut.list_handler()
+@ut.list_handler(broadcast=True)
 def density_gas(Pressure, MolarMass, Temperature):
     """Return the density of air at the given pressure, molar mass, and
     temperature.
@@ -45,7 +92,7 @@ def density_gas(Pressure, MolarMass, Temperature):
 ########################## Geometry ###########################
 
 
-@ut.list_handler()
+@ut.list_handler(broadcast=True)
 def area_circle(DiamCircle):
     """Return the area of a circle given its diameter.
 
@@ -56,10 +103,10 @@ def area_circle(DiamCircle):
     :rtype: u.m**2
     """
     ut.check_range([DiamCircle.magnitude, ">0", "DiamCircle"])
-    return (np.pi / 4 * DiamCircle**2)
+    return kernels.area_circle(DiamCircle.magnitude) * DiamCircle.units**2
 
 
-@ut.list_handler()
+@ut.list_handler(broadcast=True)
 def diam_circle(AreaCircle):
     """Return the diameter of a circle given its area.
 
@@ -71,27 +118,22 @@ def diam_circle(AreaCircle):
     """
 
     ut.check_range([AreaCircle.magnitude, ">0", "AreaCircle"])
-    return np.sqrt(4 * AreaCircle / np.pi)
+    return kernels.diam_circle(AreaCircle.magnitude) * AreaCircle.units**0.5
 
 ####################### Water Properties #######################
 
 
 #:
-RE_TRANSITION_PIPE = 2100
+RE_TRANSITION_PIPE = kernels.RE_TRANSITION_PIPE
 
 #: Table of temperatures and the corresponding water density.
 #:
 #: WATER_DENSITY_TABLE[0] is a list of water temperatures, in Kelvin.
 #: WATER_DENSITY_TABLE[1] is the corresponding densities, in kg/m³.
-WATER_DENSITY_TABLE = [(273.15, 278.15, 283.15, 293.15, 303.15, 313.15,
-                        323.15, 333.15, 343.15, 353.15, 363.15, 373.15
-                        ), (999.9, 1000, 999.7, 998.2, 995.7, 992.2,
-                            988.1, 983.2, 977.8, 971.8, 965.3, 958.4
-                            )
-                       ]
+WATER_DENSITY_TABLE = kernels.WATER_DENSITY_TABLE
 
 
-@ut.list_handler()
+@ut.list_handler(broadcast=True)
 def viscosity_dynamic(temp):
     """
     .. deprecated::
@@ -103,7 +145,7 @@ def viscosity_dynamic(temp):
     return viscosity_dynamic_water(temp)
 
 
-@ut.list_handler()
+@ut.list_handler(broadcast=True)
 def viscosity_dynamic_water(Temperature):
     """Return the dynamic viscosity of water at a given temperature.
 
@@ -114,11 +156,11 @@ def viscosity_dynamic_water(Temperature):
     :rtype: u.kg/(u.m*u.s)
     """
     ut.check_range([Temperature.magnitude, ">=0", "Temperature in Kelvin"])
-    return 2.414 * (10**-5) * u.kg/(u.m*u.s) * 10**(247.8*u.degK /
-                                                    (Temperature - 140*u.degK))
+    return (kernels.viscosity_dynamic_water(Temperature.m_as(u.degK))
+            * u.kg/(u.m*u.s))
 
 
-@ut.list_handler()
+@ut.list_handler(broadcast=True)
 def density_water(Temperature=None, *, temp=None):
     """Return the density of water at a given temperature.
 
@@ -140,13 +182,10 @@ def density_water(Temperature=None, *, temp=None):
         Temperature = temp
 
     ut.check_range([Temperature.magnitude, ">=0", "Temperature in Kelvin"])
-    rhointerpolated = interpolate.CubicSpline(WATER_DENSITY_TABLE[0],
-                                              WATER_DENSITY_TABLE[1])
-    Temperature = Temperature.to(u.degK).magnitude
-    return rhointerpolated(Temperature).item() * u.kg/u.m**3
+    return kernels.density_water(Temperature.m_as(u.degK)) * u.kg/u.m**3
 
 
-@ut.list_handler()
+@ut.list_handler(broadcast=True)
 def viscosity_kinematic(temp):
     """
     .. deprecated::
@@ -158,7 +197,7 @@ def viscosity_kinematic(temp):
     return viscosity_kinematic_water(temp)
 
 
-@ut.list_handler()
+@ut.list_handler(broadcast=True)
 def viscosity_kinematic_water(Temperature):
     """Return the kinematic viscosity of water at a given temperature.
 
@@ -169,12 +208,13 @@ def viscosity_kinematic_water(Temperature):
     :rtype: u.m**2/u.s
     """
     ut.check_range([Temperature.magnitude, ">=0", "Temperature in Kelvin"])
-    return (viscosity_dynamic_water(Temperature) / density_water(Temperature))
+    return (kernels.viscosity_kinematic_water(Temperature.m_as(u.degK))
+            * _M2_S)
 
 ####################### Hydraulic Radius #######################
 
 
-@ut.list_handler()
+@ut.list_handler(broadcast=True)
 def radius_hydraulic(Width, Depth, openchannel):
     """
     .. deprecated::
@@ -185,7 +225,7 @@ def radius_hydraulic(Width, Depth, openchannel):
     return radius_hydraulic_rect(Width, Depth, openchannel)
 
 
-@ut.list_handler()
+@ut.list_handler(broadcast=True)
 def radius_hydraulic_rect(Width, Depth, OpenChannel):
     """Return the hydraulic radius of a rectangular channel given width and
     depth of water.
@@ -203,13 +243,13 @@ def radius_hydraulic_rect(Width, Depth, OpenChannel):
     ut.check_range([Width.magnitude, ">0", "Width"],
                    [Depth.magnitude, ">0", "Depth"],
                    [OpenChannel, "boolean", "OpenChannel"])
-    if OpenChannel:
-        return ((Width*Depth) / (Width + 2*Depth))
-    else:
-        return ((Width*Depth) / (2 * (Width+Depth)))
+    return (kernels.radius_hydraulic_rect(Width.magnitude,
+                                          Depth.m_as(Width.units),
+                                          OpenChannel)
+            * Width.units)
 
 
-@ut.list_handler()
+@ut.list_handler(broadcast=True)
 def radius_hydraulic_general(Area, PerimWetted):
     """
     .. deprecated::
@@ -221,7 +261,7 @@ def radius_hydraulic_general(Area, PerimWetted):
     return radius_hydraulic_channel(Area, PerimWetted)
 
 
-@ut.list_handler()
+@ut.list_handler(broadcast=True)
 def radius_hydraulic_channel(Area, PerimWetted):
     """Return the hydraulic radius of a general channel given cross sectional
     area and wetted perimeter.
@@ -236,12 +276,14 @@ def radius_hydraulic_channel(Area, PerimWetted):
     """
     ut.check_range([Area.magnitude, ">0", "Area"],
                    [PerimWetted.magnitude, ">0", "Wetted perimeter"])
-    return (Area / PerimWetted)
+    return (kernels.radius_hydraulic_channel(Area.magnitude,
+                                             PerimWetted.magnitude)
+            * (Area.units / PerimWetted.units))
 
 ####################### Reynolds Number #######################
 
 
-@ut.list_handler()
+@ut.list_handler(broadcast=True)
 def re_pipe(FlowRate, Diam, Nu):
     """Return the Reynolds number of flow through a pipe.
 
@@ -258,10 +300,11 @@ def re_pipe(FlowRate, Diam, Nu):
     ut.check_range([FlowRate.magnitude, ">0", "Flow rate"],
                    [Diam.magnitude, ">0", "Diameter"],
                    [Nu.magnitude, ">0", "Nu"])
-    return ((4 * FlowRate) / (np.pi * Diam * Nu)).to(u.dimensionless)
+    return kernels.re_pipe(_si(FlowRate, _M3_S), _si(Diam, _M),
+                           _si(Nu, _M2_S)) * u.dimensionless
 
 
-@ut.list_handler()
+@ut.list_handler(broadcast=True)
 def re_rect(FlowRate, Width, Depth, Nu, OpenChannel=None, *, openchannel=None):
     """Return the Reynolds number of flow through a rectangular channel.
 
@@ -292,11 +335,15 @@ def re_rect(FlowRate, Width, Depth, Nu, OpenChannel=None, *, openchannel=None):
                       UserWarning)
         OpenChannel = openchannel
 
-    return (4 * FlowRate * radius_hydraulic_rect(Width, Depth, OpenChannel)
-            / (Width * Depth * Nu)).to(u.dimensionless)
+    ut.check_range([Width.magnitude, ">0", "Width"],
+                   [Depth.magnitude, ">0", "Depth"],
+                   [OpenChannel, "boolean", "OpenChannel"])
+    return kernels.re_rect(_si(FlowRate, _M3_S), _si(Width, _M),
+                           _si(Depth, _M), _si(Nu, _M2_S),
+                           OpenChannel) * u.dimensionless
 
 
-@ut.list_handler()
+@ut.list_handler(broadcast=True)
 def re_general(Vel, Area, PerimWetted, Nu):
     """
     .. deprecated::
@@ -307,7 +354,7 @@ def re_general(Vel, Area, PerimWetted, Nu):
     return re_channel(Vel, Area, PerimWetted, Nu)
 
 
-@ut.list_handler()
+@ut.list_handler(broadcast=True)
 def re_channel(Vel, Area, PerimWetted, Nu):
     """Return the Reynolds number of flow through a general cross section.
 
@@ -324,13 +371,17 @@ def re_channel(Vel, Area, PerimWetted, Nu):
     :rtype: u.dimensionless
     """
     ut.check_range([Vel.magnitude, ">=0", "Velocity"],
-                   [Nu.magnitude, ">0", "Nu"])
-    return (4 * radius_hydraulic_channel(Area, PerimWetted) * Vel / Nu).to(u.dimensionless)
+                   [Nu.magnitude, ">0", "Nu"],
+                   [Area.magnitude, ">0", "Area"],
+                   [PerimWetted.magnitude, ">0", "Wetted perimeter"])
+    return kernels.re_channel(_si(Vel, _M_S), _si(Area, _M2),
+                              _si(PerimWetted, _M),
+                              _si(Nu, _M2_S)) * u.dimensionless
 
 ########################### Friction ###########################
 
 
-@ut.list_handler()
+@ut.list_handler(broadcast=True)
 def fric(FlowRate, Diam, Nu, PipeRough):
     """
     .. deprecated::
@@ -340,13 +391,14 @@ def fric(FlowRate, Diam, Nu, PipeRough):
     return fric_pipe(FlowRate, Diam, Nu, PipeRough)
 
 
-@ut.list_handler()
-def fric_pipe(FlowRate, Diam, Nu, Roughness):
+@ut.list_handler(broadcast=True)
+def fric_pipe(FlowRate, Diam, Nu, Roughness, *, Colebrook=False):
     """Return the friction factor for pipe flow.
 
     For laminar flow, the friction factor is 64 is divided the Reynolds number.
     For turbulent flows, friction factor is calculated using the Swamee-Jain
-    equation, which works best for Re > 3000 and ε/Diam < 0.02.
+    equation, which works best for Re > 3000 and ε/Diam < 0.02. The
+    Swamee-Jain value can be refined to the implicit Colebrook equation.
 
     :param FlowRate: flow rate through pipe
     :type FlowRate: u.m**3/u.s
@@ -356,25 +408,25 @@ def fric_pipe(FlowRate, Diam, Nu, Roughness):
     :type Nu: u.m**2/u.s
     :param Roughness: roughness of pipe
     :type Roughness: u.m
+    :param Colebrook: if True, refine turbulent friction factors to the
+        Colebrook equation. Defaults to False.
+    :type Colebrook: boolean
 
     :return: friction factor of flow through pipe
     :rtype: u.dimensionless
     """
-    ut.check_range([Roughness.magnitude, ">=0", "Pipe roughness"])
-    if re_pipe(FlowRate, Diam, Nu) >= RE_TRANSITION_PIPE:
-        f = (0.25 / (np.log10(Roughness / (3.7 * Diam)
-                              + 5.74 / re_pipe(FlowRate, Diam, Nu) ** 0.9
-                              )
-                     ) ** 2
-             )
-    else:
-        f = 64 / re_pipe(FlowRate, Diam, Nu)
-    return f * u.dimensionless
+    ut.check_range([Roughness.magnitude, ">=0", "Pipe roughness"],
+                   [FlowRate.magnitude, ">0", "Flow rate"],
+                   [Diam.magnitude, ">0", "Diameter"],
+                   [Nu.magnitude, ">0", "Nu"])
+    return kernels.fric_pipe(_si(FlowRate, _M3_S), _si(Diam, _M),
+                             _si(Nu, _M2_S), _si(Roughness, _M),
+                             Colebrook) * u.dimensionless
 
 
-@ut.list_handler()
+@ut.list_handler(broadcast=True)
 def fric_rect(FlowRate, Width, Depth, Nu, Roughness=None, OpenChannel=None, *,
-              PipeRough=None, openchannel=None):
+              PipeRough=None, openchannel=None, Colebrook=False):
     """Return the friction factor of a rectangular channel.
 
     The Swamee-Jain equation is adapted for a rectangular channel.
@@ -391,6 +443,9 @@ def fric_rect(FlowRate, Width, Depth, Nu, Roughness=None, OpenChannel=None, *,
     :type Roughness: u.m
     :param OpenChannel: true if channel is open, false if closed
     :type OpenChannel: boolean
+    :param Colebrook: if True, refine turbulent friction factors to the
+        Colebrook equation. Defaults to False.
+    :type Colebrook: boolean
 
     :param PipeRough: deprecated; use Roughness instead
     :param openchannel: deprecated; use OpenChannel instead
@@ -416,28 +471,20 @@ def fric_rect(FlowRate, Width, Depth, Nu, Roughness=None, OpenChannel=None, *,
                           UserWarning)
             OpenChannel = openchannel
 
-    ut.check_range([Roughness.magnitude, ">=0", "Pipe roughness"])
-    if re_rect(FlowRate, Width, Depth, Nu, OpenChannel) >= RE_TRANSITION_PIPE:
-        # Diam = 4*R_h in adapted Swamee-Jain equation
-        return (0.25 * u.dimensionless
-                / (np.log10((Roughness
-                             / (3.7 * 4
-                                * radius_hydraulic_rect(Width, Depth,
-                                                        OpenChannel)
-                                )
-                             )
-                            + (5.74 / (re_rect(FlowRate, Width, Depth,
-                                               Nu, OpenChannel) ** 0.9)
-                               )
-                            )
-                   ) ** 2
-                )
-    else:
-        return 64 * u.dimensionless / re_rect(FlowRate, Width, Depth, Nu,
-                                              OpenChannel)
+    ut.check_range([Roughness.magnitude, ">=0", "Pipe roughness"],
+                   [FlowRate.magnitude, ">0", "Flow rate"],
+                   [Nu.magnitude, ">0", "Nu"],
+                   [Width.magnitude, ">0", "Width"],
+                   [Depth.magnitude, ">0", "Depth"],
+                   [OpenChannel, "boolean", "OpenChannel"])
+    # Diam = 4*R_h in adapted Swamee-Jain equation
+    return kernels.fric_rect(_si(FlowRate, _M3_S), _si(Width, _M),
+                             _si(Depth, _M), _si(Nu, _M2_S),
+                             _si(Roughness, _M), OpenChannel,
+                             Colebrook) * u.dimensionless
 
 
-@ut.list_handler()
+@ut.list_handler(broadcast=True)
 def fric_general(Area, PerimWetted, Vel, Nu, PipeRough):
     """
     .. deprecated::
@@ -448,8 +495,8 @@ def fric_general(Area, PerimWetted, Vel, Nu, PipeRough):
     return fric_channel(Area, PerimWetted, Vel, Nu, PipeRough)
 
 
-@ut.list_handler()
-def fric_channel(Area, PerimWetted, Vel, Nu, Roughness):
+@ut.list_handler(broadcast=True)
+def fric_channel(Area, PerimWetted, Vel, Nu, Roughness, *, Colebrook=False):
     """Return the friction factor for a general channel.
 
     The Swamee-Jain equation is adapted for a general cross-section.
@@ -462,35 +509,30 @@ def fric_channel(Area, PerimWetted, Vel, Nu, Roughness):
     :type Vel: u.m/u.s
     :param Nu: kinematic viscosity of fluid
     :type Nu: u.m**2/u.s
-    :param PipeRough: roughness of channel
-    :type PipeRough: u.m
+    :param Roughness: roughness of channel
+    :type Roughness: u.m
+    :param Colebrook: if True, refine turbulent friction factors to the
+        Colebrook equation. Defaults to False.
+    :type Colebrook: boolean
 
     :return: friction factor for flow through general channel
     :rtype: u.dimensionless
     """
-    ut.check_range([Roughness.magnitude, ">=0", "Pipe roughness"])
-    if re_channel(Vel, Area, PerimWetted, Nu) >= RE_TRANSITION_PIPE:
-        # Diam = 4*R_h in adapted Swamee-Jain equation
-        f = (0.25 /
-             (np.log10((Roughness
-                        / (3.7 * 4
-                           * radius_hydraulic_channel(Area, PerimWetted)
-                           )
-                        )
-                       + (5.74
-                          / re_channel(Vel, Area, PerimWetted, Nu) ** 0.9
-                          )
-                       )
-              ) ** 2
-             )
-    else:
-        f = 64 / re_channel(Vel, Area, PerimWetted, Nu)
-    return f * u.dimensionless
+    ut.check_range([Roughness.magnitude, ">=0", "Pipe roughness"],
+                   [Vel.magnitude, ">=0", "Velocity"],
+                   [Nu.magnitude, ">0", "Nu"],
+                   [Area.magnitude, ">0", "Area"],
+                   [PerimWetted.magnitude, ">0", "Wetted perimeter"])
+    # Diam = 4*R_h in adapted Swamee-Jain equation
+    return kernels.fric_channel(_si(Area, _M2), _si(PerimWetted, _M),
+                                _si(Vel, _M_S), _si(Nu, _M2_S),
+                                _si(Roughness, _M),
+                                Colebrook) * u.dimensionless
 
 ######################### Head Loss #########################
 
 
-@ut.list_handler()
+@ut.list_handler(broadcast=True)
 def headloss_fric(FlowRate, Diam, Length, Nu, PipeRough):
     """
     .. deprecated::
@@ -501,7 +543,7 @@ def headloss_fric(FlowRate, Diam, Length, Nu, PipeRough):
     return headloss_major_pipe(FlowRate, Diam, Length, Nu, PipeRough)
 
 
-@ut.list_handler()
+@ut.list_handler(broadcast=True)
 def headloss_major_pipe(FlowRate, Diam, Length, Nu, Roughness):
     """Return the major head loss (due to wall shear) in a pipe.
 
@@ -521,14 +563,17 @@ def headloss_major_pipe(FlowRate, Diam, Length, Nu, Roughness):
     :return: major head loss in pipe
     :rtype: u.m
     """
-    ut.check_range([Length.magnitude, ">0", "Length"])
-    return (fric_pipe(FlowRate, Diam, Nu, Roughness)
-            * 8 / (u.gravity * np.pi**2)
-            * (Length * FlowRate**2) / Diam**5
-            ).to(u.m)
+    ut.check_range([Length.magnitude, ">0", "Length"],
+                   [Roughness.magnitude, ">=0", "Pipe roughness"],
+                   [FlowRate.magnitude, ">0", "Flow rate"],
+                   [Diam.magnitude, ">0", "Diameter"],
+                   [Nu.magnitude, ">0", "Nu"])
+    return kernels.headloss_major_pipe(_si(FlowRate, _M3_S), _si(Diam, _M),
+                                       _si(Length, _M), _si(Nu, _M2_S),
+                                       _si(Roughness, _M)) * _M
 
 
-@ut.list_handler()
+@ut.list_handler(broadcast=True)
 def headloss_exp(FlowRate, Diam, KMinor):
     """
     .. deprecated::
@@ -539,7 +584,7 @@ def headloss_exp(FlowRate, Diam, KMinor):
     return headloss_minor_pipe(FlowRate, Diam, KMinor)
 
 
-@ut.list_handler()
+@ut.list_handler(broadcast=True)
 def headloss_minor_pipe(FlowRate, Diam, KMinor):
     """Return the minor head loss (due to changes in geometry) in a pipe.
 
@@ -558,10 +603,11 @@ def headloss_minor_pipe(FlowRate, Diam, KMinor):
     ut.check_range([FlowRate.magnitude, ">0", "Flow rate"],
                    [Diam.magnitude, ">0", "Diameter"],
                    [KMinor, ">=0", "K minor"])
-    return (KMinor * 8 / (u.gravity * np.pi**2) * FlowRate**2 / Diam**4).to(u.m)
+    return kernels.headloss_minor_pipe(_si(FlowRate, _M3_S), _si(Diam, _M),
+                                       _si(KMinor, u.dimensionless)) * _M
 
 
-@ut.list_handler()
+@ut.list_handler(broadcast=True)
 def headloss(FlowRate, Diam, Length, Nu, PipeRough, KMinor):
     """
     .. deprecated::
@@ -572,7 +618,7 @@ def headloss(FlowRate, Diam, Length, Nu, PipeRough, KMinor):
     return headloss_pipe(FlowRate, Diam, Length, Nu, PipeRough, KMinor)
 
 
-@ut.list_handler()
+@ut.list_handler(broadcast=True)
 def headloss_pipe(FlowRate, Diam, Length, Nu, Roughness, KMinor):
     """Return the total head loss from major and minor losses in a pipe.
 
@@ -594,11 +640,19 @@ def headloss_pipe(FlowRate, Diam, Length, Nu, Roughness, KMinor):
     :return: total head loss in pipe
     :rtype: u.m
     """
-    return (headloss_major_pipe(FlowRate, Diam, Length, Nu, Roughness)
-            + headloss_minor_pipe(FlowRate, Diam, KMinor))
+    ut.check_range([Length.magnitude, ">0", "Length"],
+                   [Roughness.magnitude, ">=0", "Pipe roughness"],
+                   [FlowRate.magnitude, ">0", "Flow rate"],
+                   [Diam.magnitude, ">0", "Diameter"],
+                   [Nu.magnitude, ">0", "Nu"],
+                   [KMinor, ">=0", "K minor"])
+    return kernels.headloss_pipe(_si(FlowRate, _M3_S), _si(Diam, _M),
+                                 _si(Length, _M), _si(Nu, _M2_S),
+                                 _si(Roughness, _M),
+                                 _si(KMinor, u.dimensionless)) * _M
 
 
-@ut.list_handler()
+@ut.list_handler(broadcast=True)
 def headloss_fric_rect(FlowRate, Width, Depth, Length, Nu, PipeRough, openchannel):
     """
     .. deprecated::
@@ -609,7 +663,7 @@ def headloss_fric_rect(FlowRate, Width, Depth, Length, Nu, PipeRough, openchanne
     return headloss_major_rect(FlowRate, Width, Depth, Length, Nu, PipeRough, openchannel)
 
 
-@ut.list_handler()
+@ut.list_handler(broadcast=True)
 def headloss_major_rect(FlowRate, Width, Depth, Length, Nu, Roughness, OpenChannel):
     """Return the major head loss due to wall shear in a rectangular channel.
 
@@ -633,17 +687,20 @@ def headloss_major_rect(FlowRate, Width, Depth, Length, Nu, Roughness, OpenChann
     :return: major head loss in rectangular channel
     :rtype: u.m
     """
-    ut.check_range([Length.magnitude, ">0", "Length"])
-    return (fric_rect(FlowRate, Width, Depth, Nu,
-                      Roughness, OpenChannel)
-            * Length
-            / (4 * radius_hydraulic_rect(Width, Depth, OpenChannel))
-            * FlowRate**2
-            / (2 * u.gravity * (Width*Depth)**2)
-            ).to(u.m)
+    ut.check_range([Length.magnitude, ">0", "Length"],
+                   [Roughness.magnitude, ">=0", "Pipe roughness"],
+                   [FlowRate.magnitude, ">0", "Flow rate"],
+                   [Nu.magnitude, ">0", "Nu"],
+                   [Width.magnitude, ">0", "Width"],
+                   [Depth.magnitude, ">0", "Depth"],
+                   [OpenChannel, "boolean", "OpenChannel"])
+    return kernels.headloss_major_rect(_si(FlowRate, _M3_S), _si(Width, _M),
+                                       _si(Depth, _M), _si(Length, _M),
+                                       _si(Nu, _M2_S), _si(Roughness, _M),
+                                       OpenChannel) * _M
 
 
-@ut.list_handler()
+@ut.list_handler(broadcast=True)
 def headloss_exp_rect(FlowRate, Width, Depth, KMinor):
     """
     .. deprecated::
@@ -654,7 +711,7 @@ def headloss_exp_rect(FlowRate, Width, Depth, KMinor):
     return headloss_minor_rect(FlowRate, Width, Depth, KMinor)
 
 
-@ut.list_handler()
+@ut.list_handler(broadcast=True)
 def headloss_minor_rect(FlowRate, Width, Depth, KMinor):
     """Return the minor head loss due to expansion in a rectangular channel.
 
@@ -676,12 +733,12 @@ def headloss_minor_rect(FlowRate, Width, Depth, KMinor):
                    [Width.magnitude, ">0", "Width"],
                    [Depth.magnitude, ">0", "Depth"],
                    [KMinor, ">=0", "K minor"])
-    return (KMinor * FlowRate**2
-            / (2 * u.gravity * (Width*Depth)**2)
-            ).to(u.m)
+    return kernels.headloss_minor_rect(_si(FlowRate, _M3_S), _si(Width, _M),
+                                       _si(Depth, _M),
+                                       _si(KMinor, u.dimensionless)) * _M
 
 
-@ut.list_handler()
+@ut.list_handler(broadcast=True)
 def headloss_rect(FlowRate, Width, Depth, Length, KMinor, Nu, Roughness=None,
                   OpenChannel=None, *, PipeRough=None, openchannel=None):
     """Return the total head loss from major and minor losses in a rectangular
@@ -730,12 +787,22 @@ def headloss_rect(FlowRate, Width, Depth, Length, KMinor, Nu, Roughness=None,
                           UserWarning)
             OpenChannel = openchannel
 
-    return (headloss_minor_rect(FlowRate, Width, Depth, KMinor)
-            + headloss_major_rect(FlowRate, Width, Depth, Length,
-                                  Nu, Roughness, OpenChannel))
+    ut.check_range([Length.magnitude, ">0", "Length"],
+                   [Roughness.magnitude, ">=0", "Pipe roughness"],
+                   [FlowRate.magnitude, ">0", "Flow rate"],
+                   [Nu.magnitude, ">0", "Nu"],
+                   [Width.magnitude, ">0", "Width"],
+                   [Depth.magnitude, ">0", "Depth"],
+                   [OpenChannel, "boolean", "OpenChannel"],
+                   [KMinor, ">=0", "K minor"])
+    return kernels.headloss_rect(_si(FlowRate, _M3_S), _si(Width, _M),
+                                 _si(Depth, _M), _si(Length, _M),
+                                 _si(KMinor, u.dimensionless),
+                                 _si(Nu, _M2_S), _si(Roughness, _M),
+                                 OpenChannel) * _M
 
 
-@ut.list_handler()
+@ut.list_handler(broadcast=True)
 def headloss_fric_general(Area, PerimWetted, Vel, Length, Nu, PipeRough):
     """
     .. deprecated::
@@ -746,7 +813,7 @@ def headloss_fric_general(Area, PerimWetted, Vel, Length, Nu, PipeRough):
     return headloss_major_channel(Area, PerimWetted, Vel, Length, Nu, PipeRough)
 
 
-@ut.list_handler()
+@ut.list_handler(broadcast=True)
 def headloss_major_channel(Area, PerimWetted, Vel, Length, Nu, Roughness):
     """Return the major head loss due to wall shear in a general channel.
 
@@ -768,14 +835,20 @@ def headloss_major_channel(Area, PerimWetted, Vel, Length, Nu, Roughness):
     :return: major head loss in general channel
     :rtype: u.m
     """
-    ut.check_range([Length.magnitude, ">0", "Length"])
-    return (fric_channel(Area, PerimWetted, Vel, Nu, Roughness) * Length
-            / (4 * radius_hydraulic_channel(Area, PerimWetted))
-            * Vel**2 / (2*u.gravity)
-            ).to(u.m)
+    ut.check_range([Length.magnitude, ">0", "Length"],
+                   [Roughness.magnitude, ">=0", "Pipe roughness"],
+                   [Vel.magnitude, ">=0", "Velocity"],
+                   [Nu.magnitude, ">0", "Nu"],
+                   [Area.magnitude, ">0", "Area"],
+                   [PerimWetted.magnitude, ">0", "Wetted perimeter"])
+    return kernels.headloss_major_channel(_si(Area, _M2),
+                                          _si(PerimWetted, _M),
+                                          _si(Vel, _M_S), _si(Length, _M),
+                                          _si(Nu, _M2_S),
+                                          _si(Roughness, _M)) * _M
 
 
-@ut.list_handler()
+@ut.list_handler(broadcast=True)
 def headloss_exp_general(Vel, KMinor):
     """
     .. deprecated::
@@ -786,7 +859,7 @@ def headloss_exp_general(Vel, KMinor):
     return headloss_minor_channel(Vel, KMinor)
 
 
-@ut.list_handler()
+@ut.list_handler(broadcast=True)
 def headloss_minor_channel(Vel, KMinor):
     """Return the minor head loss due to expansion in a general channel.
 
@@ -802,10 +875,11 @@ def headloss_minor_channel(Vel, KMinor):
     """
     ut.check_range([Vel.magnitude, ">0", "Velocity"],
                    [KMinor, '>=0', 'K minor'])
-    return (KMinor * Vel**2 / (2*u.gravity)).to(u.m)
+    return kernels.headloss_minor_channel(_si(Vel, _M_S),
+                                          _si(KMinor, u.dimensionless)) * _M
 
 
-@ut.list_handler()
+@ut.list_handler(broadcast=True)
 def headloss_gen(Area, Vel, PerimWetted, Length, KMinor, Nu, PipeRough):
     """
     .. deprecated::
@@ -816,7 +890,7 @@ def headloss_gen(Area, Vel, PerimWetted, Length, KMinor, Nu, PipeRough):
     return headloss_channel(Area, Vel, PerimWetted, Length, KMinor, Nu, PipeRough)
 
 
-@ut.list_handler()
+@ut.list_handler(broadcast=True)
 def headloss_channel(Area, Vel, PerimWetted, Length, KMinor, Nu, Roughness):
     """Return the total head loss from major and minor losses in a general
     channel.
@@ -841,12 +915,20 @@ def headloss_channel(Area, Vel, PerimWetted, Length, KMinor, Nu, Roughness):
     :return: total head loss in general channel
     :rtype: u.m
     """
-    return (headloss_minor_channel(Vel, KMinor)
-            + headloss_major_channel(Area, PerimWetted, Vel,
-                                     Length, Nu, Roughness)).to(u.m)
+    ut.check_range([Vel.magnitude, ">0", "Velocity"],
+                   [KMinor, '>=0', 'K minor'],
+                   [Length.magnitude, ">0", "Length"],
+                   [Roughness.magnitude, ">=0", "Pipe roughness"],
+                   [Nu.magnitude, ">0", "Nu"],
+                   [Area.magnitude, ">0", "Area"],
+                   [PerimWetted.magnitude, ">0", "Wetted perimeter"])
+    return kernels.headloss_channel(_si(Area, _M2), _si(Vel, _M_S),
+                                    _si(PerimWetted, _M), _si(Length, _M),
+                                    _si(KMinor, u.dimensionless),
+                                    _si(Nu, _M2_S), _si(Roughness, _M)) * _M
 
 
-@ut.list_handler()
+@ut.list_handler(broadcast=True)
 def headloss_manifold(FlowRate, Diam, Length, KMinor, Nu, Roughness=None, NumOutlets=None, *, PipeRough=None):
     """Return the total head loss through the manifold.
 
@@ -883,15 +965,20 @@ def headloss_manifold(FlowRate, Diam, Length, KMinor, Nu, Roughness=None, NumOut
                       UserWarning)
         Roughness = PipeRough
 
-    return (headloss_pipe(FlowRate, Diam, Length, Nu, Roughness, KMinor)
-            * ((1/3)
-               + (1 / (2*NumOutlets))
-               + (1 / (6*NumOutlets**2))
-               )
-            ).to(u.m)
+    ut.check_range([Length.magnitude, ">0", "Length"],
+                   [Roughness.magnitude, ">=0", "Pipe roughness"],
+                   [FlowRate.magnitude, ">0", "Flow rate"],
+                   [Diam.magnitude, ">0", "Diameter"],
+                   [Nu.magnitude, ">0", "Nu"],
+                   [KMinor, ">=0", "K minor"])
+    return kernels.headloss_manifold(_si(FlowRate, _M3_S), _si(Diam, _M),
+                                     _si(Length, _M),
+                                     _si(KMinor, u.dimensionless),
+                                     _si(Nu, _M2_S), _si(Roughness, _M),
+                                     _si(NumOutlets, u.dimensionless)) * _M
 
 
-@ut.list_handler()
+@ut.list_handler(broadcast=True)
 def elbow_minor_loss(q, id_, k):
     """
     .. deprecated::
@@ -902,7 +989,7 @@ def elbow_minor_loss(q, id_, k):
     return headloss_minor_elbow(q, id_, k)
 
 
-@ut.list_handler()
+@ut.list_handler(broadcast=True)
 def headloss_minor_elbow(FlowRate, Diam, KMinor):
     """Return the minor head loss (due to changes in geometry) in an elbow.
 
@@ -916,14 +1003,14 @@ def headloss_minor_elbow(FlowRate, Diam, KMinor):
     :return: minor head loss in pipe
     :rtype: u.m
     """
-    vel = FlowRate / area_circle(Diam)
-    minor_loss = KMinor * vel ** 2 / (2 * u.gravity)
-    return minor_loss.to(u.m)
+    ut.check_range([Diam.magnitude, ">0", "DiamCircle"])
+    return kernels.headloss_minor_elbow(_si(FlowRate, _M3_S), _si(Diam, _M),
+                                        _si(KMinor, u.dimensionless)) * _M
 
 ######################### Orifices #########################
 
 
-@ut.list_handler()
+@ut.list_handler(broadcast=True)
 def flow_orifice(Diam, Height, RatioVCOrifice):
     """Return the flow rate of the orifice.
 
@@ -939,14 +1026,11 @@ def flow_orifice(Diam, Height, RatioVCOrifice):
     """
     ut.check_range([Diam.magnitude, ">0", "Diameter"],
                    [RatioVCOrifice, "0-1", "VC orifice ratio"])
-    if Height.magnitude > 0:
-        return (RatioVCOrifice * area_circle(Diam)
-                * np.sqrt(2 * u.gravity * Height)).to(u.m**3/u.s)
-    else:
-        return 0 * u.m**3/u.s
+    return kernels.flow_orifice(_si(Diam, _M), _si(Height, _M),
+                                _si(RatioVCOrifice, u.dimensionless)) * _M3_S
 
 
-@ut.list_handler()
+@ut.list_handler(broadcast=True)
 def flow_orifice_vert(Diam, Height, RatioVCOrifice):
     """Return the vertical flow rate of the orifice.
 
@@ -961,21 +1045,12 @@ def flow_orifice_vert(Diam, Height, RatioVCOrifice):
     :rtype: u.m**3/u.s
     """
     ut.check_range([RatioVCOrifice, "0-1", "VC orifice ratio"])
-    Diam = Diam.to(u.m)
-    Height = Height.to(u.m)
-    if Height > -Diam / 2:
-        flow_vert = integrate.quad(lambda z: (Diam*np.sin(np.arccos(z*u.m/(Diam/2)))
-                                              * np.sqrt(Height - z*u.m)
-                                              ).magnitude,
-                                   - Diam.magnitude / 2,
-                                   min(Diam/2, Height).magnitude)
-        return (flow_vert[0] * u.m**2.5 * RatioVCOrifice *
-                np.sqrt(2 * u.gravity)).to(u.m**3/u.s)
-    else:
-        return 0 * u.m**3/u.s
+    return kernels.flow_orifice_vert(_si(Diam, _M), _si(Height, _M),
+                                     _si(RatioVCOrifice, u.dimensionless)
+                                     ) * _M3_S
 
 
-@ut.list_handler()
+@ut.list_handler(broadcast=True)
 def head_orifice(Diam, RatioVCOrifice, FlowRate):
     """Return the piezometric head of the orifice.
 
@@ -992,14 +1067,15 @@ def head_orifice(Diam, RatioVCOrifice, FlowRate):
     ut.check_range([Diam.magnitude, ">0", "Diameter"],
                    [FlowRate.magnitude, ">0", "Flow rate"],
                    [RatioVCOrifice, "0-1", "VC orifice ratio"])
-    return ((FlowRate
-             / (RatioVCOrifice * area_circle(Diam))
-             )**2
-            / (2*u.gravity)
-            ).to(u.m)
+    if np.any(np.equal(RatioVCOrifice, 0)):
+        raise ZeroDivisionError("VC orifice ratio is 0, so the orifice "
+                                "cannot pass any flow.")
+    return kernels.head_orifice(_si(Diam, _M),
+                                _si(RatioVCOrifice, u.dimensionless),
+                                _si(FlowRate, _M3_S)) * _M
 
 
-@ut.list_handler()
+@ut.list_handler(broadcast=True)
 def area_orifice(Height, RatioVCOrifice, FlowRate):
     """Return the area of the orifice.
 
@@ -1016,11 +1092,12 @@ def area_orifice(Height, RatioVCOrifice, FlowRate):
     ut.check_range([Height.magnitude, ">0", "Height"],
                    [FlowRate.magnitude, ">0", "Flow rate"],
                    [RatioVCOrifice, "0-1, >0", "VC orifice ratio"])
-    return (FlowRate / (RatioVCOrifice * np.sqrt(2 * u.gravity *
-                                                 Height))).to(u.m**2)
+    return kernels.area_orifice(_si(Height, _M),
+                                _si(RatioVCOrifice, u.dimensionless),
+                                _si(FlowRate, _M3_S)) * _M2
 
 
-@ut.list_handler()
+@ut.list_handler(broadcast=True)
 def num_orifices(FlowRate, RatioVCOrifice, HeadLossOrifice, DiamOrifice):
     """Return the number of orifices.
 
@@ -1036,13 +1113,19 @@ def num_orifices(FlowRate, RatioVCOrifice, HeadLossOrifice, DiamOrifice):
     :return: number of orifices
     :rtype: u.dimensionless
     """
-    return np.ceil(area_orifice(HeadLossOrifice, RatioVCOrifice, FlowRate)
-                   / area_circle(DiamOrifice)).to(u.dimensionless)
+    ut.check_range([HeadLossOrifice.magnitude, ">0", "Height"],
+                   [FlowRate.magnitude, ">0", "Flow rate"],
+                   [RatioVCOrifice, "0-1, >0", "VC orifice ratio"],
+                   [DiamOrifice.magnitude, ">0", "DiamCircle"])
+    return kernels.num_orifices(_si(FlowRate, _M3_S),
+                                _si(RatioVCOrifice, u.dimensionless),
+                                _si(HeadLossOrifice, _M),
+                                _si(DiamOrifice, _M)) * u.dimensionless
 
 ########################### Flows ###########################
 
 
-@ut.list_handler()
+@ut.list_handler(broadcast=True)
 def flow_transition(Diam, Nu):
     """Return the flow rate for the laminar/turbulent transition.
 
@@ -1056,10 +1139,10 @@ def flow_transition(Diam, Nu):
     """
     ut.check_range([Diam.magnitude, ">0", "Diameter"],
                    [Nu.magnitude, ">0", "Nu"])
-    return (np.pi * Diam * RE_TRANSITION_PIPE * Nu / 4).to(u.m**3/u.s)
+    return kernels.flow_transition(_si(Diam, _M), _si(Nu, _M2_S)) * _M3_S
 
 
-@ut.list_handler()
+@ut.list_handler(broadcast=True)
 def flow_hagen(Diam, HeadLossMajor=None, Length=None, Nu=None, *, HeadLossFric=None):
     """Return the flow rate for laminar flow with only major losses.
 
@@ -1094,11 +1177,11 @@ def flow_hagen(Diam, HeadLossMajor=None, Length=None, Nu=None, *, HeadLossFric=N
                    [Length.magnitude, ">0", "Length"],
                    [HeadLossMajor.magnitude, ">=0", "Headloss due to friction"],
                    [Nu.magnitude, ">0", "Nu"])
-    return ((np.pi*Diam**4) / (128*Nu) * u.gravity * HeadLossMajor
-            / Length).to(u.m**3/u.s)
+    return kernels.flow_hagen(_si(Diam, _M), _si(HeadLossMajor, _M),
+                              _si(Length, _M), _si(Nu, _M2_S)) * _M3_S
 
 
-@ut.list_handler()
+@ut.list_handler(broadcast=True)
 def flow_swamee(Diam, HeadLossMajor=None, Length=None, Nu=None, Roughness=None, *, HeadLossFric=None, PipeRough=None):
     """Return the flow rate for turbulent flow with only major losses.
 
@@ -1146,18 +1229,12 @@ def flow_swamee(Diam, HeadLossMajor=None, Length=None, Nu=None, Roughness=None,
                    [HeadLossMajor.magnitude, ">0", "Headloss due to friction"],
                    [Nu.magnitude, ">0", "Nu"],
                    [Roughness.magnitude, ">=0", "Pipe roughness"])
-    logterm = np.log10(Roughness / (3.7 * Diam)
-                       + 2.51 * Nu * np.sqrt(Length / (2 * u.gravity
-                                                       * HeadLossMajor
-                                                       * Diam**3)
-                                             )
-                       )
-    return ((-np.pi / np.sqrt(2)) * Diam**(5/2) * logterm
-            * np.sqrt(u.gravity * HeadLossMajor / Length)
-            ).to(u.m**3/u.s)
+    return kernels.flow_swamee(_si(Diam, _M), _si(HeadLossMajor, _M),
+                               _si(Length, _M), _si(Nu, _M2_S),
+                               _si(Roughness, _M)) * _M3_S
 
 
-@ut.list_handler()
+@ut.list_handler(broadcast=True)
 def flow_pipemajor(Diam, HeadLossFric, Length, Nu, PipeRough):
     """
     .. deprecated::
@@ -1168,7 +1245,7 @@ def flow_pipemajor(Diam, HeadLossFric, Length, Nu, PipeRough):
     return flow_major_pipe(Diam, HeadLossFric, Length, Nu, PipeRough)
 
 
-@ut.list_handler()
+@ut.list_handler(broadcast=True)
 def flow_major_pipe(Diam, HeadLossMajor, Length, Nu, Roughness):
     """Return the flow rate with only major losses.
 
@@ -1188,14 +1265,17 @@ def flow_major_pipe(Diam, HeadLossMajor, Length, Nu, Roughness):
     :return: flow rate with only major losses
     :rtype: u.m**3/u.s
     """
-    FlowHagen = flow_hagen(Diam, HeadLossMajor, Length, Nu)
-    if FlowHagen < flow_transition(Diam, Nu):
-        return FlowHagen
-    else:
-        return flow_swamee(Diam, HeadLossMajor, Length, Nu, Roughness)
+    ut.check_range([Diam.magnitude, ">0", "Diameter"],
+                   [Length.magnitude, ">0", "Length"],
+                   [HeadLossMajor.magnitude, ">=0", "Headloss due to friction"],
+                   [Nu.magnitude, ">0", "Nu"],
+                   [Roughness.magnitude, ">=0", "Pipe roughness"])
+    return kernels.flow_major_pipe(_si(Diam, _M), _si(HeadLossMajor, _M),
+                                   _si(Length, _M), _si(Nu, _M2_S),
+                                   _si(Roughness, _M)) * _M3_S
 
 
-@ut.list_handler()
+@ut.list_handler(broadcast=True)
 def flow_pipeminor(Diam, HeadLossExpans, KMinor):
     """
     .. deprecated::
@@ -1206,7 +1286,7 @@ def flow_pipeminor(Diam, HeadLossExpans, KMinor):
     return flow_minor_pipe(Diam, HeadLossExpans, KMinor)
 
 
-@ut.list_handler()
+@ut.list_handler(broadcast=True)
 def flow_minor_pipe(Diam, HeadLossMinor, KMinor):
     """Return the flow rate with only minor losses.
 
@@ -1224,18 +1304,22 @@ def flow_minor_pipe(Diam, HeadLossMinor, KMinor):
     """
     ut.check_range([HeadLossMinor.magnitude, ">=0",
                     "Headloss due to expansion"],
-                   [KMinor, ">0", "K minor"])
-    return (area_circle(Diam) * np.sqrt(2 * u.gravity * HeadLossMinor
-                                        / KMinor)
-            ).to(u.m**3/u.s)
+                   [KMinor, ">0", "K minor"],
+                   [Diam.magnitude, ">0", "DiamCircle"])
+    return kernels.flow_minor_pipe(_si(Diam, _M), _si(HeadLossMinor, _M),
+                                   _si(KMinor, u.dimensionless)) * _M3_S
 
 
-@ut.list_handler()
-def flow_pipe(Diam, HeadLoss, Length, Nu, Roughness=None, KMinor=None, *, PipeRough=None):
+@ut.list_handler(broadcast=True)
+def flow_pipe(Diam, HeadLoss, Length, Nu, Roughness=None, KMinor=None, *,
+              PipeRough=None, tol=kernels.PIPE_SOLVER_TOLERANCE,
+              maxiter=kernels.PIPE_SOLVER_MAX_ITERATIONS):
     """Return the flow rate in a pipe.
 
     This function works for both major and minor losses as well as
-    both laminar and turbulent flows.
+    both laminar and turbulent flows. With minor losses, the flow rate is
+    solved for with a safeguarded Newton iteration; see
+    :func:`aguaclara.core.kernels.flow_pipe`.
 
     :param Diam: diameter of pipe
     :type Diam: u.m
@@ -1251,6 +1335,12 @@ def flow_pipe(Diam, HeadLoss, Length, Nu, Roughness=None, KMinor=None, *, PipeRo
     :type KMinor: u.dimensionless or unitless
 
     :param PipeRough: deprecated; use Roughness instead
+    :param tol: relative tolerance on the flow rate, defaults to
+        kernels.PIPE_SOLVER_TOLERANCE
+    :type tol: float, optional
+    :param maxiter: maximum number of iterations, defaults to
+        kernels.PIPE_SOLVER_MAX_ITERATIONS
+    :type maxiter: int, optional
 
     :return: flow rate in pipe
     :rtype: u.m**3/u.s
@@ -1266,39 +1356,22 @@ def flow_pipe(Diam, HeadLoss, Length, Nu, Roughness=None, KMinor=None, *, PipeRo
                           UserWarning)
             Roughness = PipeRough
 
-    if KMinor == 0:
-        FlowRate = flow_major_pipe(Diam, HeadLoss, Length, Nu,
-                                   Roughness)
-    else:
-        FlowRatePrev = 0
-        err = 1.0
-        FlowRate = min(flow_major_pipe(Diam, HeadLoss, Length,
-                                       Nu, Roughness),
-                       flow_minor_pipe(Diam, HeadLoss, KMinor)
-                       )
-        while err > 0.01:
-            FlowRatePrev = FlowRate
-            HLFricNew = (HeadLoss * headloss_major_pipe(FlowRate, Diam, Length,
-                                                        Nu, Roughness)
-                         / (headloss_major_pipe(FlowRate, Diam, Length,
-                                                Nu, Roughness)
-                            + headloss_minor_pipe(FlowRate, Diam, KMinor)
-                            )
-                         )
-            FlowRate = flow_major_pipe(Diam, HLFricNew, Length,
-                                       Nu, Roughness)
-            if FlowRate == 0:
-                err = 0.0
-            else:
-                err = (abs(FlowRate - FlowRatePrev)
-                       / ((FlowRate + FlowRatePrev) / 2)
-                       )
-    return FlowRate.to(u.m**3/u.s)
+    ut.check_range([Diam.magnitude, ">0", "Diameter"],
+                   [Length.magnitude, ">0", "Length"],
+                   [HeadLoss.magnitude, ">=0", "Headloss"],
+                   [Nu.magnitude, ">0", "Nu"],
+                   [Roughness.magnitude, ">=0", "Pipe roughness"],
+                   [KMinor, ">=0", "K minor"])
+    return kernels.flow_pipe(_si(Diam, _M), _si(HeadLoss, _M),
+                             _si(Length, _M), _si(Nu, _M2_S),
+                             _si(Roughness, _M),
+                             _si(KMinor, u.dimensionless), tol=tol,
+                             maxiter=maxiter) * _M3_S
 
 ########################## Diameters ##########################
 
 
-@ut.list_handler()
+@ut.list_handler(broadcast=True)
 def diam_hagen(FlowRate, HeadLossMajor=None, Length=None, Nu=None, *, HeadLossFric=None):
     """Return the inner diameter of a pipe with laminar flow and no minor losses.
 
@@ -1338,12 +1411,11 @@ def diam_hagen(FlowRate, HeadLossMajor=None, Length=None, Nu=None, *, HeadLossFr
                    [Length.magnitude, ">0", "Length"],
                    [HeadLossMajor.magnitude, ">0", "Headloss due to friction"],
                    [Nu.magnitude, ">0", "Nu"])
-    return (((128 * Nu * FlowRate * Length)
-             / (u.gravity * HeadLossMajor * np.pi)
-             ) ** (1/4)).to(u.m)
+    return kernels.diam_hagen(_si(FlowRate, _M3_S), _si(HeadLossMajor, _M),
+                              _si(Length, _M), _si(Nu, _M2_S)) * _M
 
 
-@ut.list_handler()
+@ut.list_handler(broadcast=True)
 def diam_swamee(FlowRate, HeadLossMajor=None, Length=None, Nu=None, Roughness=None, *, HeadLossFric=None, PipeRough=None):
     """Return the inner diameter of a pipe with turbulent flow and no minor losses.
 
@@ -1397,18 +1469,12 @@ def diam_swamee(FlowRate, HeadLossMajor=None, Length=None, Nu=None, Roughness=No
                    [HeadLossMajor.magnitude, ">0", "Headloss due to friction"],
                    [Nu.magnitude, ">0", "Nu"],
                    [Roughness.magnitude, ">=0", "Pipe roughness"])
-    a = ((Roughness ** 1.25)
-         * ((Length * FlowRate**2)
-            / (u.gravity * HeadLossMajor)
-            )**4.75
-         ).to_base_units()
-    b = (Nu**5 * FlowRate**47
-         * (Length / (u.gravity * HeadLossMajor)) ** 26
-         ).to_base_units()**0.2
-    return (0.66 * (a+b)**0.04).to(u.m)
+    return kernels.diam_swamee(_si(FlowRate, _M3_S), _si(HeadLossMajor, _M),
+                               _si(Length, _M), _si(Nu, _M2_S),
+                               _si(Roughness, _M)) * _M
 
 
-@ut.list_handler()
+@ut.list_handler(broadcast=True)
 def diam_pipemajor(FlowRate, HeadLossFric, Length, Nu, PipeRough):
     """
     .. deprecated::
@@ -1419,7 +1485,7 @@ def diam_pipemajor(FlowRate, HeadLossFric, Length, Nu, PipeRough):
     return diam_major_pipe(FlowRate, HeadLossFric, Length, Nu, PipeRough)
 
 
-@ut.list_handler()
+@ut.list_handler(broadcast=True)
 def diam_major_pipe(FlowRate, HeadLossMajor, Length, Nu, Roughness):
     """Return the pipe inner diameter that would result in given major losses.
 
@@ -1439,15 +1505,17 @@ def diam_major_pipe(FlowRate, HeadLossMajor, Length, Nu, Roughness):
     :return: inner diameter of pipe
     :rtype: u.m
     """
-    DiamLaminar = diam_hagen(FlowRate, HeadLossMajor, Length, Nu)
-    if re_pipe(FlowRate, DiamLaminar, Nu) <= RE_TRANSITION_PIPE:
-        return DiamLaminar
-    else:
-        return diam_swamee(FlowRate, HeadLossMajor, Length,
-                           Nu, Roughness)
+    ut.check_range([FlowRate.magnitude, ">0", "Flow rate"],
+                   [Length.magnitude, ">0", "Length"],
+                   [HeadLossMajor.magnitude, ">0", "Headloss due to friction"],
+                   [Nu.magnitude, ">0", "Nu"],
+                   [Roughness.magnitude, ">=0", "Pipe roughness"])
+    return kernels.diam_major_pipe(_si(FlowRate, _M3_S),
+                                   _si(HeadLossMajor, _M), _si(Length, _M),
+                                   _si(Nu, _M2_S), _si(Roughness, _M)) * _M
 
 
-@ut.list_handler()
+@ut.list_handler(broadcast=True)
 def diam_pipeminor(FlowRate, HeadLossExpans, KMinor):
     """
     .. deprecated::
@@ -1458,7 +1526,7 @@ def diam_pipeminor(FlowRate, HeadLossExpans, KMinor):
     return diam_minor_pipe(FlowRate, HeadLossExpans, KMinor)
 
 
-@ut.list_handler()
+@ut.list_handler(broadcast=True)
 def diam_minor_pipe(FlowRate, HeadLossMinor, KMinor):
     """Return the pipe inner diameter that would result in the given minor losses.
 
@@ -1477,18 +1545,23 @@ def diam_minor_pipe(FlowRate, HeadLossMinor, KMinor):
     ut.check_range([FlowRate.magnitude, ">0", "Flow rate"],
                    [KMinor, ">=0", "K minor"],
                    [HeadLossMinor.magnitude, ">0", "Headloss due to expansion"])
-    return (np.sqrt(4 * FlowRate / np.pi)
-            * (KMinor / (2 * u.gravity * HeadLossMinor)) ** (1/4)
-            ).to(u.m)
+    return kernels.diam_minor_pipe(_si(FlowRate, _M3_S),
+                                   _si(HeadLossMinor, _M),
+                                   _si(KMinor, u.dimensionless)) * _M
 
 
-@ut.list_handler()
-def diam_pipe(FlowRate, HeadLoss, Length, Nu, PipeRough, KMinor):
+@ac_cache
+@ut.list_handler(broadcast=True)
+def diam_pipe(FlowRate, HeadLoss, Length, Nu, PipeRough, KMinor, *,
+              warm_start=False, tol=kernels.PIPE_SOLVER_TOLERANCE,
+              maxiter=kernels.PIPE_SOLVER_MAX_ITERATIONS):
     """Return the pipe inner diameter that would result in the given total head
     loss.
 
     This function applies to both laminar and turbulent flow and
-    incorporates both minor and major losses.
+    incorporates both minor and major losses. With minor losses, the
+    diameter is solved for with a safeguarded Newton iteration; see
+    :func:`aguaclara.core.kernels.diam_pipe`.
 
     :param FlowRate: flow rate of pipe
     :type FlowRate: u.m**3/u.s
@@ -1502,37 +1575,35 @@ def diam_pipe(FlowRate, HeadLoss, Length, Nu, PipeRough, KMinor):
     :type PipeRough: u.m
     :param KMinor: minor loss coefficient
     :type KMinor: u.dimensionless or unitless
+    :param warm_start: whether to start the solution at each index of the
+        last axis of the result from the solution at the previous index, which
+        speeds up sweeps over a finely spaced input, defaults to False
+    :type warm_start: bool, optional
+    :param tol: relative tolerance on the diameter, defaults to
+        kernels.PIPE_SOLVER_TOLERANCE
+    :type tol: float, optional
+    :param maxiter: maximum number of iterations, defaults to
+        kernels.PIPE_SOLVER_MAX_ITERATIONS
+    :type maxiter: int, optional
 
     :return: inner diameter of pipe
     :rtype: u.m
     """
-    if KMinor == 0:
-        Diam = diam_major_pipe(FlowRate, HeadLoss, Length, Nu,
-                               PipeRough)
-    else:
-        Diam = max(diam_major_pipe(FlowRate, HeadLoss,
-                                   Length, Nu, PipeRough),
-                   diam_minor_pipe(FlowRate, HeadLoss, KMinor))
-        err = 1.00
-        while err > 0.001:
-            DiamPrev = Diam
-            HLFricNew = (HeadLoss * headloss_major_pipe(FlowRate, Diam, Length,
-                                                        Nu, PipeRough
-                                                        )
-                         / (headloss_major_pipe(FlowRate, Diam, Length,
-                                                Nu, PipeRough
-                                                )
-                            + headloss_minor_pipe(FlowRate, Diam, KMinor
-                                                  )
-                            )
-                         )
-            Diam = diam_major_pipe(FlowRate, HLFricNew, Length, Nu, PipeRough
-                                   )
-            err = abs(Diam - DiamPrev) / ((Diam + DiamPrev) / 2)
-    return Diam.to(u.m)
+    ut.check_range([FlowRate.magnitude, ">0", "Flow rate"],
+                   [Length.magnitude, ">0", "Length"],
+                   [HeadLoss.magnitude, ">0", "Headloss"],
+                   [Nu.magnitude, ">0", "Nu"],
+                   [PipeRough.magnitude, ">=0", "Pipe roughness"],
+                   [KMinor, ">=0", "K minor"])
+    return kernels.diam_pipe(_si(FlowRate, _M3_S), _si(HeadLoss, _M),
+                             _si(Length, _M), _si(Nu, _M2_S),
+                             _si(PipeRough, _M),
+                             _si(KMinor, u.dimensionless),
+                             warm_start=warm_start, tol=tol,
+                             maxiter=maxiter) * _M
 
 
-@ut.list_handler()
+@ut.list_handler(broadcast=True)
 def pipe_ID(FlowRate, Pressure):
     """Return the inner diameter of a pipe for a given pressure
     recovery constraint.
@@ -1547,12 +1618,12 @@ def pipe_ID(FlowRate, Pressure):
     """
     ut.check_range([FlowRate.magnitude, ">0", "Flow rate"],
                    [Pressure.magnitude, ">0", "Pressure"])
-    return np.sqrt(FlowRate/((np.pi/4)*np.sqrt(2*u.gravity*Pressure))).to(u.m)
+    return kernels.pipe_ID(_si(FlowRate, _M3_S), _si(Pressure, _M)) * _M
 
 ############################ Weirs ############################
 
 
-@ut.list_handler()
+@ut.list_handler(broadcast=True)
 def width_rect_weir(FlowRate, Height):
     """
     .. deprecated::
@@ -1563,7 +1634,7 @@ def width_rect_weir(FlowRate, Height):
     return width_weir_rect(FlowRate, Height)
 
 
-@ut.list_handler()
+@ut.list_handler(broadcast=True)
 def width_weir_rect(FlowRate, Height):
     """Return the width of a rectangular weir given its flow rate and the
     height of the water above the weir. For a weir that is a vertical pipe,
@@ -1579,12 +1650,11 @@ def width_weir_rect(FlowRate, Height):
     """
     ut.check_range([FlowRate.magnitude, ">0", "Flow rate"],
                    [Height.magnitude, ">0", "Height"])
-    return ((3 / 2) * FlowRate / (con.VC_ORIFICE_RATIO
-                                  * np.sqrt(2 * u.gravity) * Height ** (3 / 2))
-            ).to(u.m)
+    return kernels.width_weir_rect(_si(FlowRate, _M3_S), _si(Height, _M),
+                                   con.VC_ORIFICE_RATIO) * _M
 
 
-@ut.list_handler()
+@ut.list_handler(broadcast=True)
 def headloss_weir(FlowRate, Width):
     """
     .. deprecated::
@@ -1595,7 +1665,7 @@ def headloss_weir(FlowRate, Width):
     return headloss_weir_rect(FlowRate, Width)
 
 
-@ut.list_handler()
+@ut.list_handler(broadcast=True)
 def headloss_weir_rect(FlowRate, Width):
     """Return the head loss of a rectangular or vertical pipe weir.
 
@@ -1612,12 +1682,11 @@ def headloss_weir_rect(FlowRate, Width):
     """
     ut.check_range([FlowRate.magnitude, ">0", "Flow rate"],
                    [Width.magnitude, ">0", "Width"])
-    return ((((3/2) * FlowRate
-              / (con.VC_ORIFICE_RATIO * np.sqrt(2 * u.gravity) * Width)
-              ) ** 2).to(u.m**3)) ** (1/3)
+    return kernels.headloss_weir_rect(_si(FlowRate, _M3_S), _si(Width, _M),
+                                      con.VC_ORIFICE_RATIO) * _M
 
 
-@ut.list_handler()
+@ut.list_handler(broadcast=True)
 def flow_rect_weir(Height, Width):
     """
     .. deprecated::
@@ -1628,7 +1697,7 @@ def flow_rect_weir(Height, Width):
     return flow_weir_rect(Height, Width)
 
 
-@ut.list_handler()
+@ut.list_handler(broadcast=True)
 def flow_weir_rect(Height, Width):
     """Return the flow rate of a rectangular or vertical pipe weir.
 
@@ -1642,9 +1711,8 @@ def flow_weir_rect(Height, Width):
     """
     ut.check_range([Height.magnitude, ">0", "Height"],
                    [Width.magnitude, ">0", "Width"])
-    return ((2/3) * con.VC_ORIFICE_RATIO
-            * (np.sqrt(2*u.gravity) * Height**(3/2))
-            * Width).to(u.m**3/u.s)
+    return kernels.flow_weir_rect(_si(Height, _M), _si(Width, _M),
+                                  con.VC_ORIFICE_RATIO) * _M3_S
 
 ######################## Porous Media ########################
 
@@ -1652,7 +1720,18 @@ class DeprecatedFunctionError(Exception):
     def __init__(self, message):
         self.message = message
 
-@ut.list_handler()
+
+def _check_ergun(ApproachVel, DiamMedia, Temperature, Porosity):
+    """Check the inputs shared by the Ergun porous media functions."""
+    ut.check_range([ApproachVel.magnitude, ">0", "ApproachVel"],
+                   [DiamMedia.magnitude, ">0", "DiamMedia"],
+                   [Porosity, "0-1", "Porosity"],
+                   [Temperature.magnitude, ">=0", "Temperature in Kelvin"])
+    if np.any(np.equal(_si(Porosity, u.dimensionless), 1)):
+        raise ValueError("Porosity is " + str(Porosity) + " must be great than\
+            or equal to 0 and less than 1")
+
+@ut.list_handler(broadcast=True)
 def headloss_kozeny(Length, DiamMedia=None, ApproachVel=None, Porosity=None, Nu=None, *, Diam=None, Vel=None):
     """
     .. deprecated::
@@ -1661,7 +1740,7 @@ def headloss_kozeny(Length, DiamMedia=None, ApproachVel=None, Porosity=None, Nu=
     raise DeprecatedFunctionError("This function is deprecated. Please use headloss_ergun.")
 
 
-@ut.list_handler()
+@ut.list_handler(broadcast=True)
 def re_ergun(ApproachVel, DiamMedia, Temperature, Porosity):
     """Return the Reynolds number for flow through porous media.
 
@@ -1677,18 +1756,13 @@ def re_ergun(ApproachVel, DiamMedia, Temperature, Porosity):
     :return: Reynolds number for flow through porous media
     :rtype: u.dimensionless
     """
-    ut.check_range([ApproachVel.magnitude, ">0", "ApproachVel"],
-                   [DiamMedia.magnitude, ">0", "DiamMedia"],
-                   [Porosity, "0-1", "Porosity"])
-    if Porosity == 1:
-        raise ValueError("Porosity is " + str(Porosity) + " must be great than\
-            or equal to 0 and less than 1")
-    return (ApproachVel * DiamMedia /
-            (viscosity_kinematic_water(Temperature)
-             * (1 - Porosity))).to(u.dimensionless)
+    _check_ergun(ApproachVel, DiamMedia, Temperature, Porosity)
+    return kernels.re_ergun(_si(ApproachVel, _M_S), _si(DiamMedia, _M),
+                            Temperature.m_as(u.degK),
+                            _si(Porosity, u.dimensionless)) * u.dimensionless
 
 
-@ut.list_handler()
+@ut.list_handler(broadcast=True)
 def fric_ergun(ApproachVel, DiamMedia, Temperature, Porosity):
     """Return the friction factor for flow through porous media.
 
@@ -1704,11 +1778,13 @@ def fric_ergun(ApproachVel, DiamMedia, Temperature, Porosity):
     :return: friction factor for flow through porous media
     :rtype: u.dimensionless
     """
-    return (300 / re_ergun(ApproachVel, DiamMedia, Temperature, Porosity)
-            + 3.5 * u.dimensionless)
+    _check_ergun(ApproachVel, DiamMedia, Temperature, Porosity)
+    return kernels.fric_ergun(_si(ApproachVel, _M_S), _si(DiamMedia, _M),
+                              Temperature.m_as(u.degK),
+                              _si(Porosity, u.dimensionless)) * u.dimensionless
 
 
-@ut.list_handler()
+@ut.list_handler(broadcast=True)
 def headloss_ergun(ApproachVel, DiamMedia, Temperature, Porosity, Length):
     """Return the frictional head loss for flow through porous media.
 
@@ -1726,12 +1802,14 @@ def headloss_ergun(ApproachVel, DiamMedia, Temperature, Porosity, Length):
     :return: frictional head loss for flow through porous media
     :rtype: u.m
     """
-    return (fric_ergun(ApproachVel, DiamMedia, Temperature, Porosity)
-            * Length / DiamMedia * ApproachVel**2 / (2*u.gravity) * (1-Porosity)
-            / Porosity**3).to(u.m)
+    _check_ergun(ApproachVel, DiamMedia, Temperature, Porosity)
+    return kernels.headloss_ergun(_si(ApproachVel, _M_S), _si(DiamMedia, _M),
+                                  Temperature.m_as(u.degK),
+                                  _si(Porosity, u.dimensionless),
+                                  _si(Length, _M)) * _M
 
 
-@ut.list_handler()
+@ut.list_handler(broadcast=True)
 def g_cs_ergun(ApproachVel, DiamMedia, Temperature, Porosity):
     """Camp Stein velocity gradient for flow through porous media.
 
@@ -1747,15 +1825,15 @@ def g_cs_ergun(ApproachVel, DiamMedia, Temperature, Porosity):
     :return: Camp Stein velocity gradient for flow through porous media
     :rtype: u.Hz
     """
-    return np.sqrt(fric_ergun(ApproachVel, DiamMedia, Temperature, Porosity)
-                   * ApproachVel**3 * (1-Porosity)
-                   / (2 * viscosity_kinematic_water(Temperature) * DiamMedia
-                      * Porosity**4)).to(u.Hz)
+    _check_ergun(ApproachVel, DiamMedia, Temperature, Porosity)
+    return kernels.g_cs_ergun(_si(ApproachVel, _M_S), _si(DiamMedia, _M),
+                              Temperature.m_as(u.degK),
+                              _si(Porosity, u.dimensionless)) * u.Hz
 
 ######################## Miscellaneous ########################
 
 
-@ut.list_handler()
+@ut.list_handler(broadcast=True)
 def height_water_critical(FlowRate, Width):
     """Return the critical local water height.
 
@@ -1769,10 +1847,11 @@ def height_water_critical(FlowRate, Width):
     """
     ut.check_range([FlowRate.magnitude, ">0", "Flow rate"],
                    [Width.magnitude, ">0", "Width"])
-    return ((FlowRate / (Width * np.sqrt(1*u.gravity))) ** (2/3)).to(u.m)
+    return kernels.height_water_critical(_si(FlowRate, _M3_S),
+                                         _si(Width, _M)) * _M
 
 
-@ut.list_handler()
+@ut.list_handler(broadcast=True)
 def vel_horizontal(HeightWaterCritical):
     """Return the horizontal velocity. (at the critical water depth??????)
 
@@ -1783,43 +1862,63 @@ def vel_horizontal(HeightWaterCritical):
     :rtype: u.m/u.s
     """
     ut.check_range([HeightWaterCritical.magnitude, ">0", "Critical height of water"])
-    return np.sqrt(u.gravity * HeightWaterCritical).to(u.m/u.s)
+    return kernels.vel_horizontal(_si(HeightWaterCritical, _M)) * _M_S
 
 
-@ut.list_handler()
+@ut.list_handler(broadcast=True)
 def manifold_id_alt(q, pr_max):
     """Return the inner diameter of a manifold when major losses are
     negligible.
     """
-    manifold_id_alt = np.sqrt(
-        4 * q / (
-            np.pi * np.sqrt(
-                2 * u.gravity * pr_max
-            )
-        )
-    )
-    return manifold_id_alt
-
-
-@ut.list_handler()
-def manifold_id(q, h, l, q_ratio, nu, eps, k, n):
-    id_new = 2 * u.inch
-    id_old = 0 * u.inch
-    error = 1
-    while error > 0.01:
-        id_old = id_new
-        id_new = (
-            ((8 * q ** 2) / (u.gravity * np.pi ** 2 * h)) *
-            (
-                (
-                    1 + fric_pipe(q, id_old, nu, eps) *
-                    (1 / 3 + 1 / (2 * n) + 1 / (6 * n ** 2))
-                ) /
-                (1 - q_ratio ** 2)
-            )
-        ) ** (1 / 4)
-        error = np.abs(id_old - id_new) / id_new
-    return id_new
+    return kernels.manifold_id_alt(_si(q, _M3_S), _si(pr_max, _M)) * _M
+
+
+@ut.list_handler(broadcast=True)
+def manifold_id(q, h, l, q_ratio, nu, eps, k, n, *,
+                tol=kernels.PIPE_SOLVER_TOLERANCE,
+                maxiter=kernels.PIPE_SOLVER_MAX_ITERATIONS):
+    """Return the inner diameter of a manifold.
+
+    The diameter is solved for with an accelerated fixed-point iteration;
+    see :func:`aguaclara.core.kernels.manifold_id`. A warning is raised if
+    any element has not converged after maxiter iterations.
+
+    :param q: total flow rate of the manifold
+    :type q: u.m**3/u.s
+    :param h: head loss of the manifold
+    :type h: u.m
+    :param l: length of the manifold (unused)
+    :type l: u.m
+    :param q_ratio: ratio of the smallest to the largest outlet flow rate
+    :type q_ratio: u.dimensionless or unitless
+    :param nu: kinematic viscosity of fluid
+    :type nu: u.m**2/u.s
+    :param eps: roughness of pipe
+    :type eps: u.m
+    :param k: minor loss coefficient (unused)
+    :type k: u.dimensionless or unitless
+    :param n: number of outlets
+    :type n: int
+    :param tol: relative tolerance on the diameter, defaults to
+        kernels.PIPE_SOLVER_TOLERANCE
+    :type tol: float, optional
+    :param maxiter: maximum number of iterations, defaults to
+        kernels.PIPE_SOLVER_MAX_ITERATIONS
+    :type maxiter: int, optional
+
+    :return: inner diameter of the manifold
+    :rtype: u.m
+    """
+    ut.check_range([q.magnitude, ">0", "Flow rate"],
+                   [nu.magnitude, ">0", "Nu"],
+                   [eps.magnitude, ">=0", "Pipe roughness"])
+    diam, converged = _manifold_id(
+        _si(q, _M3_S), _si(h, _M), _si(q_ratio, u.dimensionless), n,
+        _si(nu, _M2_S), _si(eps, _M), tol=tol, maxiter=maxiter)
+    if not converged:
+        warnings.warn('manifold_id did not converge in {} iterations.'
+                      .format(maxiter), UserWarning)
+    return diam * _M
 
 
 @ut.list_handler()
@@ -1831,50 +1930,154 @@ def manifold_nd(q, h, l, q_ratio, nu, eps, k, n, sdr):
     return manifold_nd
 
 
-@ut.list_handler()
-def horiz_chan_w(q, depth, hl, l, nu, eps, manifold, k):
-    hl = min(hl, depth / 3)
-    horiz_chan_w_new = q / ((depth - hl) * np.sqrt(2 * u.gravity * hl))
-
-    error = 1
-    i = 0
-    while error > 0.001 and i < 20:
-        w = horiz_chan_w_new
-        i = i + 1
-        horiz_chan_w_new = np.sqrt(
-            (
-                1 + k +
-                    fric_rect(q, w, depth - hl, nu, eps, True) *
-                    (l / (4 * radius_hydraulic_rect(w, depth - hl, True))) *
-                    (1 - (2 * (int(manifold) / 3)))
-            ) / (2 * u.gravity * hl)
-        ) * (q / (depth - hl))
-        error = np.abs(horiz_chan_w_new - w) / (horiz_chan_w_new + w)
-    return horiz_chan_w_new.to(u.m)
-
-
-@ut.list_handler()
-def horiz_chan_h(q, w, hl, l, nu, eps, manifold):
-    h_new = (q / (w * np.sqrt(2 * u.gravity * hl))) + hl
-    error = 1
-    i = 0
-    while error > 0.001 and i < 200:
-        h = h_new
-        hl_local = min(hl, h / 3)
-        i = i + 1
-        h_new = (q/ w) * np.sqrt((1 + \
-            fric_rect(q, w, h - hl_local, nu, eps, True) * (l / (4 * \
-                radius_hydraulic_rect(w, h - hl_local, True))) * (1 - 2 * (int(manifold) / 3))
-        )/ (2 * u.gravity * hl_local)) + (hl_local)
-        error = np.abs(h_new - h) / (h_new + h)
-    return h_new.to(u.m)
-
+@ut.list_handler(broadcast=True)
+def horiz_chan_w(q, depth, hl, l, nu, eps, manifold, k, *,
+                 tol=kernels.CHANNEL_SOLVER_TOLERANCE,
+                 maxiter=kernels.CHANNEL_SOLVER_MAX_ITERATIONS):
+    """Return the width of an open channel for a given head loss.
+
+    The head loss is limited to a third of the depth. The width is solved
+    for with a bracketed false position iteration; see
+    :func:`aguaclara.core.kernels.horiz_chan_w`. A warning is raised if any
+    element has not converged after maxiter iterations.
+
+    :param q: flow rate of the channel
+    :type q: u.m**3/u.s
+    :param depth: upstream water depth of the channel
+    :type depth: u.m
+    :param hl: head loss of the channel
+    :type hl: u.m
+    :param l: length of the channel
+    :type l: u.m
+    :param nu: kinematic viscosity of fluid
+    :type nu: u.m**2/u.s
+    :param eps: roughness of the channel
+    :type eps: u.m
+    :param manifold: true if the flow leaves the channel uniformly along
+        its length
+    :type manifold: boolean
+    :param k: minor loss coefficient
+    :type k: u.dimensionless or unitless
+    :param tol: relative tolerance on the width, defaults to
+        kernels.CHANNEL_SOLVER_TOLERANCE
+    :type tol: float, optional
+    :param maxiter: maximum number of iterations, defaults to
+        kernels.CHANNEL_SOLVER_MAX_ITERATIONS
+    :type maxiter: int, optional
+
+    :return: width of the channel
+    :rtype: u.m
+    """
+    ut.check_range([q.magnitude, ">0", "Flow rate"],
+                   [(depth - np.minimum(hl, depth / 3)).magnitude, ">0",
+                    "Depth"],
+                   [nu.magnitude, ">0", "Nu"],
+                   [eps.magnitude, ">=0", "Roughness"])
+    width, converged = _horiz_chan_w(
+        _si(q, _M3_S), _si(depth, _M), _si(hl, _M), _si(l, _M),
+        _si(nu, _M2_S), _si(eps, _M), manifold, _si(k, u.dimensionless),
+        tol=tol, maxiter=maxiter)
+    if not converged:
+        warnings.warn('horiz_chan_w did not converge in {} iterations.'
+                      .format(maxiter), UserWarning)
+    return width * _M
+
+
+@ut.list_handler(broadcast=True)
+def horiz_chan_h(q, w, hl, l, nu, eps, manifold, *,
+                 tol=kernels.CHANNEL_SOLVER_TOLERANCE,
+                 maxiter=kernels.CHANNEL_SOLVER_MAX_ITERATIONS):
+    """Return the upstream water height of an open channel for a given head
+    loss.
 
-@ut.list_handler()
+    The head loss is limited to a third of the height. The height is solved
+    for with a bracketed false position iteration; see
+    :func:`aguaclara.core.kernels.horiz_chan_h`. A warning is raised if any
+    element has not converged after maxiter iterations.
+
+    :param q: flow rate of the channel
+    :type q: u.m**3/u.s
+    :param w: width of the channel
+    :type w: u.m
+    :param hl: head loss of the channel
+    :type hl: u.m
+    :param l: length of the channel
+    :type l: u.m
+    :param nu: kinematic viscosity of fluid
+    :type nu: u.m**2/u.s
+    :param eps: roughness of the channel
+    :type eps: u.m
+    :param manifold: true if the flow leaves the channel uniformly along
+        its length
+    :type manifold: boolean
+    :param tol: relative tolerance on the height, defaults to
+        kernels.CHANNEL_SOLVER_TOLERANCE
+    :type tol: float, optional
+    :param maxiter: maximum number of iterations, defaults to
+        kernels.CHANNEL_SOLVER_MAX_ITERATIONS
+    :type maxiter: int, optional
+
+    :return: upstream water height of the channel
+    :rtype: u.m
+    """
+    ut.check_range([q.magnitude, ">0", "Flow rate"],
+                   [w.magnitude, ">0", "Width"],
+                   [nu.magnitude, ">0", "Nu"],
+                   [eps.magnitude, ">=0", "Roughness"])
+    height, converged = _horiz_chan_h(
+        _si(q, _M3_S), _si(w, _M), _si(hl, _M), _si(l, _M), _si(nu, _M2_S),
+        _si(eps, _M), manifold, tol=tol, maxiter=maxiter)
+    if not converged:
+        warnings.warn('horiz_chan_h did not converge in {} iterations.'
+                      .format(maxiter), UserWarning)
+    return height * _M
+
+
+@ac_cache
+@ut.list_handler(broadcast=True)
 def pipe_flow_nd(q, sdr, hl, l, nu, eps, k):
-    i = 0
-    id_sdr_all_available = pipe.ID_SDR_all_available(sdr)
-    while q > flow_pipe(id_sdr_all_available[i], hl, l, nu, eps, k):
-        i_d = id_sdr_all_available[i]
-        i += 1
-    return pipe.ND_SDR_available(i_d, sdr)
+    """Return the nominal diameter of the smallest available pipe with a
+    given SDR that can carry a flow rate with a given head loss.
+
+    The available pipes are searched by bisection, since their flow capacity
+    increases with their inner diameter; see
+    :func:`aguaclara.core.kernels.pipe_flow_index`.
+
+    :param q: flow rate of the pipe
+    :type q: u.m**3/u.s
+    :param sdr: standard dimension ratio of the pipe
+    :type sdr: int
+    :param hl: total head loss from major and minor losses
+    :type hl: u.m
+    :param l: length of the pipe
+    :type l: u.m
+    :param nu: kinematic viscosity of fluid
+    :type nu: u.m**2/u.s
+    :param eps: roughness of the pipe
+    :type eps: u.m
+    :param k: minor loss coefficient
+    :type k: u.dimensionless or unitless
+
+    :return: nominal diameter of the pipe
+    :rtype: u.inch
+    """
+    ut.check_range([l.magnitude, ">0", "Length"],
+                   [hl.magnitude, ">=0", "Headloss"],
+                   [nu.magnitude, ">0", "Nu"],
+                   [eps.magnitude, ">=0", "Pipe roughness"],
+                   [k, ">=0", "K minor"])
+    args = np.broadcast_arrays(_si(q, _M3_S), np.asarray(sdr), _si(hl, _M),
+                               _si(l, _M), _si(nu, _M2_S), _si(eps, _M),
+                               _si(k, u.dimensionless))
+    q, sdr = args[:2]
+    nd = np.empty(q.shape)
+    for value in np.unique(sdr):
+        mask = sdr == value
+        ids = pipe.catalog.id_sdr_available(value.item())
+        index = kernels.pipe_flow_index(
+            q[mask], (ids * u.inch).m_as(_M), *(a[mask] for a in args[2:]))
+        if np.any(index == ids.size):
+            raise ValueError("No available pipe with an SDR of {} can carry "
+                             "the flow rate".format(value))
+        nd[mask] = pipe.catalog.nd_available[index]
+    return nd[()] * u.inch
@@ -2,15 +2,47 @@
 outer diameters of pipes based on their standard dimension ratio (SDR).
 """
 from aguaclara.core.units import u
+from aguaclara.core.catalog import PipeCatalog
+import aguaclara.core.catalog as cat
 import aguaclara.core.utility as ut
 import numpy as np
-import pandas as pd
+import sys
 
-import os.path
-dir_path = os.path.dirname(__file__)
-csv_path = os.path.join(dir_path, 'data/pipe_database.csv')
-with open(csv_path) as pipedbfile:
-    pipedb = pd.read_csv(pipedbfile)
+csv_path = cat.PIPE_DATABASE_PATH
+
+_pipedb = None
+
+
+def get_pipedb():
+    """Return the pipe database as a pandas DataFrame.
+
+    The DataFrame is only created, and pandas imported, on the first call.
+    """
+    global _pipedb
+    if _pipedb is None:
+        import pandas as pd
+        _pipedb = pd.DataFrame(
+            {column: np.array(values)
+             for column, values in cat.load_table(csv_path).items()})
+    return _pipedb
+
+
+def __getattr__(name):
+    # pipedb is kept for backwards compatibility; use get_pipedb().
+    if name == 'pipedb':
+        return get_pipedb()
+    raise AttributeError(
+        "module " + repr(__name__) + " has no attribute " + repr(name))
+
+
+if sys.version_info < (3, 7):
+    # Module __getattr__ (PEP 562) requires Python 3.7, so the pipedb alias
+    # is created when the module is imported.
+    pipedb = get_pipedb()
+
+
+#: The PipeCatalog of the pipe database.
+catalog = cat.pipe_catalog(csv_path)
 
 # TODO: Add a deprecation warning for this once manifold design code has been
 # implemented. The socket_depth and cap_thickness functions are used in
@@ -26,8 +58,7 @@ class Pipe:
 
     @property
     def od(self):
-        index = (np.abs(np.array(pipedb['NDinch']) - self.nd.magnitude)).argmin()
-        return pipedb.iloc[index, 1] * u.inch
+        return catalog.od_of_nd(self.nd.to(u.inch).magnitude) * u.inch
 
     @property
     def id_sdr(self):
@@ -35,11 +66,10 @@ class Pipe:
 
     @property
     def id_sch40(self):
-        myindex = (np.abs(np.array(pipedb['NDinch']) - self.nd.magnitude)).argmin()
-        return (pipedb.iloc[myindex, 1] - 2 * (pipedb.iloc[myindex, 5])) * u.inch
+        return catalog.id_sch40_of_nd(self.nd.to(u.inch).magnitude) * u.inch
 
 
-@ut.list_handler()
+@ut.list_handler(broadcast=True)
 def OD(ND):
     """Return a pipe's outer diameter according to its nominal diameter.
 
@@ -50,19 +80,13 @@ def OD(ND):
     :rtype: u.inch
     """
     # The pipe schedule is not required here because all of the pipes of a
-    # given nominal diameter have the same outer diameter.
-    #
-    # Steps:
-    # 1. Find the index of the closest nominal diameter.
-    #    (Should this be changed to find the next largest ND?)
-    # 2. Take the values of the array, subtract the ND, take the absolute
-    #    value, find the index of the minimium value.
-    ND = ND.to(u.inch).magnitude
-    index = (np.abs(np.array(pipedb['NDinch']) - (ND))).argmin()
-    return pipedb.iloc[index, 1] * u.inch
+    # given nominal diameter have the same outer diameter. The outer diameter
+    # is that of the closest nominal diameter.
+    # (Should this be changed to find the next largest ND?)
+    return catalog.od_of_nd(ND.to(u.inch).magnitude) * u.inch
 
 
-@ut.list_handler()
+@ut.list_handler(broadcast=True)
 def fitting_od(pipe_nd, fitting_sdr=41):
     pipe_od = OD(pipe_nd)
     fitting_nd = ND_SDR_available(pipe_od, fitting_sdr)
@@ -70,7 +94,7 @@ def fitting_od(pipe_nd, fitting_sdr=41):
     return fitting_od
 
 
-@ut.list_handler()
+@ut.list_handler(broadcast=True)
 def ID_SDR(ND, SDR):
     """Return the inner diameter of a pipe given its nominal diameter and SDR
     (standard diameter ratio).
@@ -80,18 +104,14 @@ def ID_SDR(ND, SDR):
     return OD(ND) * (SDR-2) / SDR
 
 
-@ut.list_handler()
+@ut.list_handler(broadcast=True)
 def ID_sch40(ND):
     """Return the inner diameter for schedule 40 pipes.
 
-    The wall thickness for these pipes is in the pipedb.
-
-    Take the values of the array, subtract the ND, take the absolute
-    value, find the index of the minimium value.
+    The wall thickness for these pipes is in the pipedb. The inner diameter
+    is that of the closest nominal diameter.
     """
-    ND = ND.to(u.inch).magnitude
-    myindex = (np.abs(np.array(pipedb['NDinch']) - (ND))).argmin()
-    return (pipedb.iloc[myindex, 1] - 2*(pipedb.iloc[myindex, 5])) * u.inch
+    return catalog.id_sch40_of_nd(ND.to(u.inch).magnitude) * u.inch
 
 
 def ND_all_available():
@@ -100,11 +120,7 @@ def ND_all_available():
     NDs available are those commonly used as based on the 'Used' column
     in the pipedb.
     """
-    ND_all_available = []
-    for i in range(len(pipedb['NDinch'])):
-        if pipedb.iloc[i, 4] == 1:
-            ND_all_available.append((pipedb['NDinch'][i]))
-    return ND_all_available * u.inch
+    return catalog.nd_available.copy() * u.inch
 
 
 def od_all_available():
@@ -113,11 +129,7 @@ def od_all_available():
     NDs available are those commonly used as based on the 'Used' column
     in the pipedb.
     """
-    od_all_available = []
-    for i in range(len(pipedb['ODinch'])):
-        if pipedb.iloc[i, 4] == 1:
-            od_all_available.append((pipedb['ODinch'][i]))
-    return od_all_available * u.inch
+    return catalog.od_available.copy() * u.inch
 
 
 @ut.list_handler()
@@ -127,57 +139,55 @@ def ID_SDR_all_available(SDR):
     IDs available are those commonly used based on the 'Used' column
     in the pipedb.
     """
-    ID = []
-    ND = ND_all_available()
-    for i in range(len(ND)):
-        ID.append(ID_SDR(ND[i], SDR).magnitude)
-    return ID * u.inch
+    return catalog.id_sdr_available(SDR).copy() * u.inch
 
 
-@ut.list_handler()
+@ut.list_handler(broadcast=True)
 def ND_SDR_available(ID, SDR):
     """ Return an available ND given an ID and a schedule.
 
-    Takes the values of the array, compares to the ID, and finds the index
-    of the first value greater or equal.
+    Finds the smallest available ND whose inner diameter with the given SDR
+    is greater than or equal to the ID. Returns None (or NaN, for array
+    inputs) if the ID is larger than that of every available pipe.
     """
-    for i in range(len(np.array(ID_SDR_all_available(SDR)))):
-        if np.array(ID_SDR_all_available(SDR))[i] >= (ID.to(u.inch)).magnitude:
-            return ND_all_available()[i]
+    nd = catalog.nd_sdr_available(ID.to(u.inch).magnitude, SDR)
+    if np.ndim(nd) == 0 and np.isnan(nd):
+        return None
+    return nd * u.inch
 
 
-@ut.list_handler()
+@ut.list_handler(broadcast=True)
 def ND_available(NDguess):
     """Return the minimum ND that is available.
 
-    1. Extract the magnitude in inches from the nominal diameter.
-    2. Find the index of the closest nominal diameter.
-    3. Take the values of the array, subtract the ND, take the
-       absolute value, find the index of the minimium value.
+    Finds the smallest available ND that is greater than or equal to the
+    guess by binary search.
     """
-    myindex = (ND_all_available() >= NDguess)
-    return min(ND_all_available()[myindex])
+    nd = catalog.nd_available_at_least(NDguess.to(u.inch).magnitude)
+    if np.any(np.isnan(nd)):
+        raise ValueError("No available ND is at least " + str(NDguess))
+    return nd * u.inch
 
 
-@ut.list_handler()
+@ut.list_handler(broadcast=True)
 def od_available(od_guess):
     """Return the minimum OD that is available.
 
-    1. Extract the magnitude in inches from the outer diameter.
-    2. Find the index of the closest outer diameter.
-    3. Take the values of the array, subtract the OD, take the
-       absolute value, find the index of the minimium value.
+    Finds the smallest available OD that is greater than or equal to the
+    guess by binary search.
     """
-    myindex = (od_all_available() >= od_guess)
-    return min(od_all_available()[myindex])
+    od = catalog.od_available_at_least(od_guess.to(u.inch).magnitude)
+    if np.any(np.isnan(od)):
+        raise ValueError("No available OD is at least " + str(od_guess))
+    return od * u.inch
 
 
-@ut.list_handler()
+@ut.list_handler(broadcast=True)
 def socket_depth(nd):
     return nd / 2
 
 
-@ut.list_handler()
+@ut.list_handler(broadcast=True)
 def cap_thickness(nd):
     cap_thickness = (fitting_od(nd) - OD(ND_available(nd))) / 2
     return cap_thickness
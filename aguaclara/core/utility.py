@@ -12,7 +12,12 @@ from aguaclara.core.units import u
 import numpy as np
 from math import log10, floor, ceil
 import warnings
+import contextlib
 import functools
+import threading
+
+# Records whether a broadcast evaluation is in progress on the current thread.
+_broadcast_state = threading.local()
 
 
 def optional_units(arg_positions, keys):
@@ -240,7 +245,7 @@ def get_sdr(spec):
         raise ValueError('Not a valid SDR.')
     return int(spec[3:])
 
-def list_handler():
+def list_handler(broadcast=False):
     """Wraps a scalar function to output a NumPy array if passed one or more inputs
     as sequences (lists, tuples or NumPy arrays). For each sequence input, this
     wrapper will recursively evaluate the function with the sequence replaced
@@ -251,12 +256,37 @@ def list_handler():
     [f(x_1), ..., f(x_n)]. For a function passed multiple sequences of
     dimensions d_1, ..., d_n (from left to right), the result would be a
     d_1 x ... x d_n array.
+
+    Args:
+        - ``broadcast (bool)``: If True, the wrapped function must accept NumPy
+          arrays (with or without units). Instead of being evaluated once per
+          element, it is evaluated once, with each sequence input reshaped so
+          that it lies along its own axes of the output. The output has the
+          same shape as the recursive evaluation would give. Sequences that
+          cannot be converted to a single array, such as lists of quantities,
+          fall back to the recursive evaluation. Functions called from inside
+          a broadcast evaluation must also accept arrays. Defaults to False.
     """
     def decorate(func):
         @functools.wraps(func) # For Sphinx documentation of decorated functions
         def wrapper(*args, **kwargs):
             """Run through the wrapped function once for each array element.
             """
+            if broadcast:
+                # Arrays passed in from an enclosing broadcast evaluation are
+                # already aligned with the output axes.
+                if getattr(_broadcast_state, "active", False):
+                    return func(*args, **kwargs)
+                broadcast_args = _broadcast_sequences(args, kwargs)
+                if broadcast_args is not None:
+                    args, kwargs, shape = broadcast_args
+                    _broadcast_state.active = True
+                    try:
+                        result = func(*args, **kwargs)
+                    finally:
+                        _broadcast_state.active = False
+                    return _broadcast_result(result, shape)
+
             # Identify the first positional argument that is a sequence.
             # Pint units must be ignored to include sequences with units.
             argsFirstSequence = None
@@ -312,6 +342,141 @@ def list_handler():
     return decorate
 
 
+def _as_sequence_array(arg):
+    """Return a sequence argument as a NumPy array (with units, if it has any).
+
+    Returns None if arg is not a sequence, and raises TypeError if it is a
+    sequence that cannot be converted to a single numeric array.
+    """
+    if isinstance(arg, u.Quantity):
+        if not isinstance(arg.magnitude, (list, tuple, np.ndarray)):
+            return None
+        array = np.asarray(arg.magnitude)
+        units = arg.units
+    elif isinstance(arg, (list, tuple, np.ndarray)):
+        if _contains_quantity(arg):
+            raise TypeError("Sequence of quantities cannot be converted to a "
+                            "single array.")
+        array = np.asarray(arg)
+        units = None
+    else:
+        return None
+    if array.dtype == object:
+        raise TypeError("Sequence cannot be converted to a numeric array.")
+    return array, units
+
+
+def _contains_quantity(seq):
+    """Return True if a (possibly nested) list or tuple contains a quantity."""
+    if isinstance(seq, u.Quantity):
+        return True
+    if isinstance(seq, (list, tuple)):
+        return any(_contains_quantity(item) for item in seq)
+    return False
+
+
+def _broadcast_sequences(args, kwargs):
+    """Reshape the sequence arguments of a function call so that each lies
+    along its own axes, from left to right, positional arguments first.
+
+    Returns the new positional and keyword arguments and the shape of the
+    output, or None if there are no sequences or a sequence cannot be
+    converted to an array.
+    """
+    args = list(args)
+    kwargs = dict(kwargs)
+    sequences = []
+    try:
+        for num, arg in enumerate(args):
+            array = _as_sequence_array(arg)
+            if array is not None:
+                sequences.append((args, num, array))
+        for keyword, arg in kwargs.items():
+            array = _as_sequence_array(arg)
+            if array is not None:
+                sequences.append((kwargs, keyword, array))
+    except TypeError:
+        return None
+    if not sequences:
+        return None
+
+    shape = tuple(dim for _, _, (array, _) in sequences
+                  for dim in array.shape)
+    offset = 0
+    for container, key, (array, units) in sequences:
+        new_shape = ((1,) * offset + array.shape
+                     + (1,) * (len(shape) - offset - array.ndim))
+        offset += array.ndim
+        array = array.reshape(new_shape)
+        container[key] = array if units is None else u.Quantity(array, units)
+    return args, kwargs, shape
+
+
+def _broadcast_result(result, shape):
+    """Broadcast the result of a vectorized evaluation to the output shape."""
+    if isinstance(result, u.Quantity):
+        return np.array(np.broadcast_to(result.magnitude, shape)) * result.units
+    return np.array(np.broadcast_to(result, shape))
+
+
+# The checks that check_range understands, in the order that they are made.
+# Each maps to a function returning a mask of the values that fail the check,
+# the type of error to raise and the end of the error message.
+_RANGE_CHECKS = {
+    '>0': (lambda x: x <= 0, ValueError, "must be greater than 0."),
+    '>=0': (lambda x: x < 0, ValueError, "must be 0 or greater."),
+    '0-1': (lambda x: np.logical_not((0 <= x) & (x <= 1)), ValueError,
+            "must be between 0 and 1."),
+    '<0': (lambda x: x >= 0, ValueError, "must be less than 0."),
+    '<=0': (lambda x: x > 0, ValueError, "must be 0 or less."),
+    'int': (lambda x: x != np.trunc(x), TypeError,
+            "must be a numeric integer."),
+    'boolean': (None, TypeError, "must be a boolean."),
+}
+
+_SCALAR_TYPES = (int, float, np.number, np.bool_)
+
+# Records the number of trusted_inputs blocks that are open on the current
+# thread.
+_trusted_state = threading.local()
+
+
+@functools.lru_cache(maxsize=None)
+def _compile_range(spec):
+    """Return the checks named by a range spec string, in check order."""
+    requests = "".join(spec.lower().split()).split(",")
+    for request in requests:
+        if request not in _RANGE_CHECKS:
+            raise RuntimeError("Unknown parameter validation "
+                               "request: {0}.".format(request))
+    return tuple(check for check in _RANGE_CHECKS if check in requests)
+
+
+@contextlib.contextmanager
+def trusted_inputs():
+    """Skip the input validation of check_range within a with block.
+
+    This is meant for the inner loops of solvers whose inputs have already
+    been validated at their boundary. The setting applies only to the
+    current thread, so other threads still validate their inputs. Blocks may
+    be nested.
+
+    Example:
+        >>> with trusted_inputs():
+        ...     check_range([-1, ">0", "Length"])
+    """
+    _trusted_state.depth = getattr(_trusted_state, "depth", 0) + 1
+    try:
+        yield
+    finally:
+        _trusted_state.depth -= 1
+
+
+def inputs_trusted():
+    """Return True if check_range is currently skipping validation."""
+    return getattr(_trusted_state, "depth", 0) > 0
+
+
 def check_range(*args):
     """Check whether passed paramters fall within approved ranges.
 
@@ -327,56 +492,73 @@ def check_range(*args):
 
     If [2] is not supplied, "Input" will be appended as a generic name.
 
-    Range requests that this function understands are listed in the
-    knownChecks sequence.
+    Range requests that this function understands are the keys of
+    _RANGE_CHECKS. Range strings are compiled once and the values are checked
+    with vectorized NumPy comparisons. If several values are out of range,
+    the error is for the first of them. No validation is done inside a
+    trusted_inputs block on the current thread.
     """
-    knownChecks = ('>0', '>=0', '0-1', '<0', '<=0', 'int', 'boolean')
+    if getattr(_trusted_state, "depth", 0):
+        return
     for arg in args:
-        #Converts arg to a mutable list
-        arg = [*arg]
         if len(arg) == 1:
             #arg[1] details what range the parameter should fall within; if
             #len(arg) is 1 that means a validity was not specified and the
             #parameter should not have been passed in its current form
             raise TypeError("No range-validity parameter provided.")
-        elif len(arg) == 2:
-            #Appending 'Input" to the end allows us to give more descriptive
-            #error messages that do not fail if no description was supplied.
-            arg.append("Input")
-        #This ensures that all whitespace is removed before checking if the
-        #request is understood
-        arg[1] = "".join(arg[1].lower().split())
-        #This block checks that each range request is understood.
-        #If the request is a compound one, it must be separated into individual
-        #requests for validity comprehension
-        for i in arg[1].split(","):
-            if i not in knownChecks:
-                raise RuntimeError("Unknown parameter validation "
-                                       "request: {0}.".format(i))
-        if not isinstance(arg[0], (list, tuple, np.ndarray)):
-            arg[0] = [arg[0]]
-        for i in arg[0]:
-            if '>0' in arg[1] and i <= 0:
-                raise ValueError("{1} is {0} but must be greater than "
-                                 "0.".format(i, arg[2]))
-            if '>=0' in arg[1] and i <0:
-                raise ValueError("{1} is {0} but must be 0 or "
-                                 "greater.".format(i, arg[2]))
-            if '0-1' in arg[1] and not 0 <= i <= 1:
-                raise ValueError("{1} is {0} but must be between 0 and "
-                                 "1.".format(i, arg[2]))
-            if '<0' in arg[1] and i >= 0:
-                raise ValueError("{1} is {0} but must be less than "
-                                 "0.".format(i, arg[2]))
-            if '<=0' in arg[1] and i >0:
-                raise ValueError("{1} is {0} but must be 0 or "
-                                 "less.".format(i, arg[2]))
-            if 'int' in arg[1] and int(i) != i:
-                raise TypeError("{1} is {0} but must be a numeric "
-                                "integer.".format(i, arg[2]))
-            if 'boolean' in arg[1] and type(i) != bool:
-                raise TypeError("{1} is {0} but must be a "
-                                "boolean.".format(i, arg[2]))
+        value, spec = arg[0], arg[1]
+        #Appending 'Input" to the end allows us to give more descriptive
+        #error messages that do not fail if no description was supplied.
+        name = arg[2] if len(arg) > 2 else "Input"
+        checks = _compile_range(spec)
+        if isinstance(value, u.Quantity):
+            value = value.magnitude
+        if isinstance(value, _SCALAR_TYPES):
+            for check in checks:
+                if check == 'boolean':
+                    failed = not isinstance(value, (bool, np.bool_))
+                else:
+                    failed = _RANGE_CHECKS[check][0](value)
+                if failed:
+                    _raise_range_error(np.ravel(value)[0], check, name)
+            continue
+        values = np.ravel(value)
+        if values.dtype == object:
+            _check_range_elements(values, checks, name)
+            continue
+        failures = [_check_failures(values, check) for check in checks]
+        failed = np.logical_or.reduce(failures) if failures else None
+        if failed is None or not failed.any():
+            continue
+        index = np.argmax(failed)
+        for check, failure in zip(checks, failures):
+            if failure[index]:
+                _raise_range_error(values[index], check, name)
+
+
+def _check_failures(values, check):
+    """Return a mask of the values that fail a check."""
+    if check == 'boolean':
+        return np.full(values.shape, values.dtype != bool)
+    return np.asarray(_RANGE_CHECKS[check][0](values))
+
+
+def _check_range_elements(values, checks, name):
+    """Check the values of an object array one element at a time."""
+    for value in values:
+        for check in checks:
+            if check == 'boolean':
+                failed = not isinstance(value, (bool, np.bool_))
+            else:
+                failed = _RANGE_CHECKS[check][0](np.asarray(value))
+            if failed:
+                _raise_range_error(value, check, name)
+
+
+def _raise_range_error(value, check, name):
+    error, message = _RANGE_CHECKS[check][1:]
+    raise error("{1} is {0} but {2}".format(value, name, message))
+
 
 def array_qtys_to_strs(lst):
     """Convert Pint quantities in a NumPy array to strings.
@@ -0,0 +1,257 @@
+"""Design a component for every row of a CSV or Parquet file.
+
+:func:`design_batch` reads the design inputs of many components (for example,
+the flow rate, temperature and expert inputs of candidate plant sites) from a
+table, designs each one on a pool of worker processes, and writes the
+selected properties of each design to another table.
+
+Quantities and numbers are written as numeric columns. The magnitudes of each
+column are in one unit, and the units of the columns are written to a JSON
+file beside the output, as given by :func:`units_path`, in the format of the
+``attrs['units']`` of :func:`aguaclara.design.sweep.sweep`. Other properties,
+such as subcomponents and arrays, are written as strings, as by
+:func:`aguaclara.design.component.serialize_property`.
+
+The input is read and the output written in chunks of rows, and only a few
+chunks are being designed at a time, so the memory used does not grow with
+the number of rows.
+
+Each column of the input is a design input, named as in
+:func:`aguaclara.design.sweep.sweep`: inputs of subcomponents are given by
+their path, such as ``etf.floc.hl``. An empty cell leaves the input at its
+default. The units of each input column, and optionally of each output, are
+given with the ``units`` argument.
+
+Example:
+    >>> import json
+    >>> from aguaclara.design.batch import design_batch, units_path
+    >>> from aguaclara.design.plant import Plant
+    >>> design_batch(Plant, 'sites.csv', 'designs.csv',
+    ...              ['sed.tank_n', 'etf.ent.l'],
+    ...              units={'q': 'L/s', 'temp': 'degC', 'etf.floc.hl': 'cm'})
+    3
+    >>> units = json.load(open(units_path('designs.csv')))
+    >>> units['etf.ent.l']
+    'inch'
+"""
+from aguaclara.core.units import u
+from aguaclara.design.component import serialize_property
+from aguaclara.design.sweep import design_chunk, encode, decode
+
+import numpy as np
+import pandas as pd
+import collections
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+# The number of rows that are read, designed by a worker process, and written
+# at a time, unless given.
+CHUNK_ROWS_N = 64
+
+# The number of chunks per worker process that are being designed or waiting
+# to be written at a time.
+CHUNKS_PER_PROCESS_N = 2
+
+
+def units_path(output_path):
+    """Return the path of the JSON file of the units of the columns of an
+    output of :func:`design_batch`, such as ``designs.units.json`` for
+    ``designs.csv``.
+    """
+    return os.path.splitext(output_path)[0] + '.units.json'
+
+
+def _convert(value):
+    """Convert an output on a worker process: scalar quantities and numbers
+    are kept, and other values are serialized as strings.
+    """
+    if isinstance(value, u.Quantity):
+        if np.ndim(value.magnitude) == 0:
+            return encode(value)
+    elif isinstance(value, (bool, int, float, np.bool_, np.number)):
+        return value.item() if isinstance(value, np.generic) else value
+    return str(serialize_property(value))
+
+
+def _format(path):
+    """Return the table format of a file from its extension."""
+    extension = os.path.splitext(path)[1].lower()
+    if extension == '.csv':
+        return 'csv'
+    if extension in ('.parquet', '.pq'):
+        return 'parquet'
+    raise ValueError('The format of {} is not supported. Use a .csv or '
+                     '.parquet file.'.format(path))
+
+
+def _import_pyarrow():
+    try:
+        import pyarrow
+        import pyarrow.parquet
+    except ImportError:
+        raise ImportError('Reading and writing Parquet files requires '
+                          'pyarrow. Install it with "pip install pyarrow".')
+    return pyarrow
+
+
+def _read_chunks(path, chunksize):
+    """Yield the rows of a table as DataFrames of ``chunksize`` rows."""
+    if _format(path) == 'csv':
+        yield from pd.read_csv(path, chunksize=chunksize)
+    else:
+        pyarrow = _import_pyarrow()
+        for batch in pyarrow.parquet.ParquetFile(path).iter_batches(
+                batch_size=chunksize):
+            yield batch.to_pandas()
+
+
+class _Writer:
+    """Append DataFrames to a CSV or Parquet file."""
+
+    def __init__(self, path):
+        self.path = path
+        self.format = _format(path)
+        self.parquet_writer = None
+        self.rows_n = 0
+
+    def write(self, table, string_columns):
+        """Append a table. The columns in ``string_columns`` are typed as
+        strings, and the other empty columns as numbers, in a Parquet file,
+        whose types are fixed by the first table.
+        """
+        if self.format == 'csv':
+            table.to_csv(self.path, mode='w' if self.rows_n == 0 else 'a',
+                         header=self.rows_n == 0, index=False)
+        else:
+            pyarrow = _import_pyarrow()
+            if self.parquet_writer is None:
+                # Fix the types of the output columns, which may be all empty
+                # in the first chunk.
+                schema = pyarrow.Schema.from_pandas(table,
+                                                    preserve_index=False)
+                for index, field in enumerate(schema):
+                    if field.name in string_columns:
+                        schema = schema.set(index, pyarrow.field(
+                            field.name, pyarrow.string()))
+                    elif pyarrow.types.is_null(field.type):
+                        schema = schema.set(index, pyarrow.field(
+                            field.name, pyarrow.float64()))
+                self.parquet_writer = pyarrow.parquet.ParquetWriter(
+                    self.path, schema)
+            self.parquet_writer.write_table(pyarrow.Table.from_pandas(
+                table, schema=self.parquet_writer.schema,
+                preserve_index=False))
+        self.rows_n += len(table)
+
+    def close(self):
+        if self.parquet_writer is not None:
+            self.parquet_writer.close()
+
+
+def _points(table, units):
+    """Return the design inputs of each row of a table."""
+    points = []
+    for row in table.to_dict('records'):
+        point = {}
+        for name, value in row.items():
+            if pd.isna(value):
+                continue
+            if name in units:
+                value = u.Quantity(value, units[name])
+            elif isinstance(value, np.generic):
+                value = value.item()
+            point[name] = encode(value)
+        points.append(point)
+    return points
+
+
+def design_batch(component_class, input_path, output_path, outputs,
+                 units=None, processes=None, chunksize=CHUNK_ROWS_N):
+    """Design a component for every row of a CSV or Parquet file.
+
+    A row whose design raises an exception does not stop the batch; its
+    outputs are empty and its ``error`` is the exception message.
+
+    Args:
+        - ``component_class (type)``: The Component subclass to design, such
+          as ``Plant``
+        - ``input_path (str)``: The path of the input .csv or .parquet file,
+          with a column for each design input
+        - ``output_path (str)``: The path of the output .csv or .parquet
+          file, which is overwritten
+        - ``outputs (list)``: The paths of the properties to write, such as
+          ``'sed.tank_n'``
+
+    Keyword Args:
+        - ``units (dict)``: The units of each input column that is a
+          quantity, by column name, such as ``{'q': 'L/s'}``, and optionally
+          of output columns, by path (optional). The magnitudes of an output
+          whose units are not given are in the units of its first value.
+        - ``processes (int)``: The number of worker processes (optional,
+          defaults to the number of CPUs). If 1, the designs are run in this
+          process.
+        - ``chunksize (int)``: The number of rows per chunk (optional,
+          defaults to ``CHUNK_ROWS_N``)
+
+    Returns:
+        ``int``: The number of rows written. The output has the columns of
+        the input, a column for each output, and ``error``. The units of its
+        columns are written to :func:`units_path` of the output path.
+    """
+    units = units or {}
+    if processes is None:
+        processes = os.cpu_count() or 1
+    writer = _Writer(output_path)
+    # The units of each column that has them, as in sweep().
+    column_units = {}
+    string_columns = {'error'}
+
+    def write(table, results):
+        table = table.copy()
+        for name in table.columns:
+            if name in units:
+                column_units[name] = str(u.Unit(units[name]))
+        for i, path in enumerate(outputs):
+            column = []
+            for values, _ in results:
+                value = None if values is None else decode(values[i])
+                if isinstance(value, u.Quantity):
+                    if path not in column_units:
+                        column_units[path] = str(
+                            u.Unit(units[path]) if path in units
+                            else value.units)
+                    value = value.m_as(column_units[path])
+                elif isinstance(value, str) and writer.rows_n == 0:
+                    string_columns.add(path)
+                column.append(value)
+            table[path] = column
+        table['error'] = [error for _, error in results]
+        writer.write(table, string_columns)
+
+    try:
+        if processes <= 1:
+            for table in _read_chunks(input_path, chunksize):
+                write(table, design_chunk(component_class,
+                                          _points(table, units), outputs,
+                                          _convert))
+        else:
+            with ProcessPoolExecutor(max_workers=processes) as executor:
+                # Write the chunks in order, keeping at most a few per
+                # process in memory.
+                pending = collections.deque()
+                for table in _read_chunks(input_path, chunksize):
+                    pending.append((table, executor.submit(
+                        design_chunk, component_class,
+                        _points(table, units), outputs, _convert)))
+                    if len(pending) >= processes * CHUNKS_PER_PROCESS_N:
+                        table, future = pending.popleft()
+                        write(table, future.result())
+                while pending:
+                    table, future = pending.popleft()
+                    write(table, future.result())
+    finally:
+        writer.close()
+    with open(units_path(output_path), 'w') as units_file:
+        json.dump(column_units, units_file, indent=2, sort_keys=True)
+    return writer.rows_n
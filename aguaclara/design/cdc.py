@@ -11,7 +11,7 @@ Example:
 import aguaclara.core.physchem as pc
 import aguaclara.core.utility as ut
 from aguaclara.core.units import u
-from aguaclara.design.component import Component
+from aguaclara.design.component import Component, uncached_property
 import warnings
 
 import numpy as np
@@ -22,6 +22,15 @@ class CDC(Component):
     Design Inputs:
         - ``q (float * u.L / u.s)``: Flow rate (required)
     """
+    SERIALIZED_FIELDS = (
+        'q', 'temp', 'chem_tank_dimensions_supplier', 'chem_tank_vol_supplier',
+        'coag_dose_conc_max', 'coag_sack_mass', 'coag_stock_conc',
+        'coag_stock_conc_est', 'coag_stock_min_est_time', 'coag_tube_id',
+        'coag_type', 'error_ratio', 'hl', 'train_n', 'tube_k', 'coag_q_max',
+        'coag_sack_n', 'coag_stock_time_min', 'coag_stock_vol', 'coag_tank_h',
+        'coag_tank_r', 'coag_tube_l', 'coag_tubes_active_n', 'coag_tubes_n'
+    )
+
     def __init__(self, **kwargs):
         self.hl = 20 * u.cm
         self.coag_type='pacl'
@@ -123,7 +132,7 @@ class CDC(Component):
             coag_nu = self.pacl_nu(coag_conc)
         return coag_nu
 
-    @property
+    @uncached_property
     def coag_q_max_est(self):
         """The estimated maximum permissible flow rate of the coagulant stock,
         based on a whole number of sacks of coagulant used.
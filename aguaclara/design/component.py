@@ -36,19 +36,411 @@ Otherwise, subcomponents will inherit the main component's ``q`` and ``temp``:
     >>> plant.filter.q
     40 liter / second
 
+Derived values defined with ``@property`` in a subclass are cached. Each
+one is computed on first access, and the inputs and other properties that it
+reads (on any component) are recorded. Assigning an attribute discards the
+cached values that depend on it, directly or through other properties:
+
+.. code-block:: python
+
+    >>> floc = Flocculator(q = 20 * u.L / u.s)
+    >>> floc.chan_w     # computes vel_grad_avg, vol, chan_n, ...
+    >>> floc.chan_w     # cached
+    >>> floc.hl = 35 * u.cm
+    >>> floc.chan_w     # recomputed, since chan_w depends on hl
+
+Properties whose value can change without an attribute being assigned, or
+that must run on every access (to raise a warning, for example), can opt out
+with :func:`uncached_property`.
+
+Methods that assign derived inputs to a component or its subcomponents, such
+as ``set_subcomponents()``, are marked with :func:`design_step`. After an
+input of a designed component is changed, ``update()`` re-runs only the
+design steps that read it (directly or through properties), until the design
+is consistent again, and reports what changed:
+
+.. code-block:: python
+
+    >>> plant = Plant(q = 20 * u.L / u.s)
+    >>> plant.etf.floc.hl = 35 * u.cm
+    >>> report = plant.update()
+    >>> report.changes['etf.ent.floc_chan_w']
+    (<Quantity(33, 'centimeter')>, <Quantity(37, 'centimeter')>)
+
 .. # TODO: update the a code example with the complete Onshape design flow.
 """
 from aguaclara.core.units import u
 import aguaclara.core.utility as ut
 
 import numpy as np
+import collections
+import functools
 import json
+import threading
+import types
+import warnings
 from pprint import pprint
-from abc import ABC, abstractmethod
+from abc import ABC, ABCMeta, abstractmethod
 from urllib.parse import quote_plus
 
 
-class Component(ABC):
+class _Tracking(threading.local):
+    """The per-thread state of the dependency tracking.
+
+    Attributes:
+        - ``frames``: The dependency sets of the cached properties and design
+          steps being run, innermost last
+        - ``steps``: The design steps being run, as (component, name) pairs
+        - ``changes``: The value of each attribute before it was first
+          assigned, by (component, name), while ``Component.update()`` runs
+        - ``depth``: The number of components being constructed
+        - ``marked``: The design steps that were marked to be re-run while
+          components were being constructed, as (state, name) pairs
+    """
+    def __init__(self):
+        self.frames = []
+        self.steps = set()
+        self.changes = None
+        self.depth = 0
+        self.marked = []
+
+
+_tracking = _Tracking()
+
+# Attributes whose reads are not recorded as dependencies.
+_UNTRACKED = frozenset(['__dict__', '__class__', '_state'])
+
+# The previous value of an attribute that did not exist.
+_MISSING = object()
+
+#: The maximum number of passes of ``Component.update()`` over the design
+#: steps of a component tree.
+UPDATE_MAX_PASSES = 100
+
+UpdateReport = collections.namedtuple('UpdateReport', ['steps', 'changes'])
+UpdateReport.__doc__ = """The result of ``Component.update()``.
+
+Attributes:
+    - ``steps (list)``: The paths of the design steps that were re-run, such
+      as ``'etf._design_ent_floc'``, in the order they were run
+    - ``changes (dict)``: The attributes that the steps assigned new values
+      to, as ``{path: (old, new)}``
+"""
+
+
+#: The default relative tolerance of :func:`fixed_point`.
+FIXED_POINT_RTOL = 0.01
+
+#: The default maximum number of iterations of :func:`fixed_point`.
+FIXED_POINT_MAX_ITERATIONS = 50
+
+#: The default number of previous iterates that :func:`fixed_point` uses to
+#: accelerate convergence.
+FIXED_POINT_MEMORY = 2
+
+FixedPointInfo = collections.namedtuple(
+    'FixedPointInfo', ['iterations', 'converged', 'residuals'])
+FixedPointInfo.__doc__ = """The convergence of :func:`fixed_point`.
+
+Attributes:
+    - ``iterations (int)``: The number of times the design was evaluated
+    - ``converged (bool)``: Whether the relative tolerance was met
+    - ``residuals (list)``: The relative residual of each iteration
+"""
+
+
+def fixed_point(func, x0, rtol=FIXED_POINT_RTOL,
+                maxiter=FIXED_POINT_MAX_ITERATIONS, memory=FIXED_POINT_MEMORY):
+    """Solve ``x = func(x)`` for the design value that couples two components.
+
+    ``func`` designs the components from a guess of the value (for example,
+    the flocculator from a guess of the entrance tank length) and returns the
+    value that the design results in. The iteration is accelerated with
+    Anderson mixing of the last ``memory`` iterates, which is the secant
+    method for a single value. An accelerated step that increases the
+    residual is discarded in favour of the plain step ``x = func(x)``.
+
+    The last call of ``func`` is with the returned value, so the components
+    are left designed for it. A ``UserWarning`` is raised if the tolerance is
+    not met within ``maxiter`` iterations.
+
+    Args:
+        - ``func (function)``: The design function
+        - ``x0 (float * u.m, for example)``: The initial guess. May be an
+          array.
+
+    Keyword Args:
+        - ``rtol (float)``: The tolerance on ``|func(x) - x| / |func(x)|``
+          (optional, defaults to ``FIXED_POINT_RTOL``)
+        - ``maxiter (int)``: The maximum number of iterations (optional,
+          defaults to ``FIXED_POINT_MAX_ITERATIONS``)
+        - ``memory (int)``: The number of previous iterates used for
+          acceleration, or 0 for none (optional, defaults to
+          ``FIXED_POINT_MEMORY``)
+
+    Returns:
+        - The solution, in the units of ``x0``
+        - A :class:`FixedPointInfo`
+    """
+    units = getattr(x0, 'units', None)
+
+    def magnitude(x):
+        x = x.to(units).magnitude if units is not None else x
+        return np.array(x, dtype=float)
+
+    def quantity(x):
+        x = x if np.ndim(x) else x.item()
+        return x * units if units is not None else x
+
+    x = magnitude(x0)
+    xs, gs = [], []
+    residuals = []
+    for iteration in range(1, maxiter + 1):
+        g = magnitude(func(quantity(x)))
+        f = g - x
+        scale = np.where(g == 0, 1, np.abs(g))
+        residuals.append(float(np.max(np.abs(f) / scale)))
+        if residuals[-1] <= rtol:
+            return quantity(x), FixedPointInfo(iteration, True, residuals)
+
+        if len(residuals) > 1 and residuals[-1] > residuals[-2]:
+            # The last step made things worse, so restart the history.
+            xs, gs = [], []
+        if iteration == maxiter:
+            break
+        xs = (xs + [x])[-(memory + 1):]
+        gs = (gs + [g])[-(memory + 1):]
+        x = g
+        if len(xs) > 1:
+            fs = np.array(gs) - np.array(xs)
+            df = np.diff(fs, axis=0).reshape(len(fs) - 1, -1)
+            dg = np.diff(np.array(gs), axis=0).reshape(len(gs) - 1, -1)
+            gamma = np.linalg.lstsq(df.T, f.ravel(), rcond=None)[0]
+            accelerated = (g.ravel() - dg.T @ gamma).reshape(g.shape)
+            if np.all(np.isfinite(accelerated)):
+                x = accelerated
+
+    warnings.warn('fixed_point did not converge in {} iterations; the '
+                  'relative residual is {:.3g}.'.format(maxiter,
+                                                        residuals[-1]),
+                  UserWarning)
+    return quantity(x), FixedPointInfo(maxiter, False, residuals)
+
+# The shared, empty containers of a _State that has not written them yet.
+_EMPTY_DICT = types.MappingProxyType({})
+_EMPTY_SET = frozenset()
+
+
+class _State:
+    """The caches and dependency records of a Component.
+
+    The records that only design steps and coupled solves use start out as
+    shared empty containers and are allocated by ``writable()``, so that a
+    component that is never designed, such as one segment of a long
+    pipeline, stays small.
+    """
+    __slots__ = ('cached', 'dependents', 'steps', 'dirty', 'inherited',
+                 'convergence')
+
+    def __init__(self):
+        # Cached property values, by name.
+        self.cached = {}
+        # The cached properties and design steps (as (component, name)
+        # pairs) that read each attribute of the component, by name. A lone
+        # dependent is stored as a 1-tuple rather than a set.
+        self.dependents = {}
+        # The arguments of each design step that has run, by name, in the
+        # order the steps first ran.
+        self.steps = _EMPTY_DICT
+        # The names of the design steps whose inputs have been assigned
+        # since they last ran.
+        self.dirty = _EMPTY_SET
+        # The subcomponents whose q and temp were set by set_subcomponents.
+        self.inherited = _EMPTY_SET
+        # The FixedPointInfo of the last coupled solve, by name.
+        self.convergence = _EMPTY_DICT
+
+    def writable(self, name):
+        """Return the record called name, allocating it if it is empty."""
+        value = getattr(self, name)
+        if value is _EMPTY_DICT:
+            value = {}
+            setattr(self, name, value)
+        elif value is _EMPTY_SET:
+            value = set()
+            setattr(self, name, value)
+        return value
+
+
+def _state(component):
+    return object.__getattribute__(component, '_state')
+
+
+def _same(old, new):
+    """Return True if two attribute values are known to be equal."""
+    if old is new:
+        return True
+    if old is _MISSING or new is _MISSING:
+        return False
+    try:
+        return bool(np.all(old == new))
+    except Exception:
+        return False
+
+
+def _register(dependent, dependencies):
+    """Register a cached property or design step as a dependent of the
+    attributes that it read.
+    """
+    for component, name in dependencies:
+        dependents = _state(component).dependents
+        current = dependents.get(name)
+        if current is None:
+            dependents[name] = (dependent,)
+        elif type(current) is tuple:
+            if current[0] != dependent:
+                dependents[name] = {current[0], dependent}
+        else:
+            current.add(dependent)
+
+
+class _CachedProperty(property):
+    """A read-only property of a Component that caches its value.
+
+    While the getter runs, every attribute read on a Component is recorded as
+    a dependency. The value is cached on the instance, and the property is
+    registered as a dependent of each attribute that it read, so that
+    assigning any of those attributes discards the value.
+    """
+
+    def __init__(self, fget, doc=None, name=None):
+        super().__init__(fget, doc=doc)
+        self.name = name
+
+    def __set_name__(self, owner, name):
+        self.name = name
+
+    def __get__(self, obj, objtype=None):
+        if obj is None:
+            return self
+        cached = _state(obj).cached
+        try:
+            return cached[self.name]
+        except KeyError:
+            pass
+        dependencies = set()
+        _tracking.frames.append(dependencies)
+        try:
+            value = self.fget(obj)
+        finally:
+            _tracking.frames.pop()
+        _register((obj, self.name), dependencies)
+        cached[self.name] = value
+        return value
+
+
+class uncached_property(property):
+    """A property of a Component that is evaluated on every access.
+
+    Use this instead of ``@property`` for derived values that must not be
+    cached, such as deprecated properties that raise a warning.
+    """
+
+
+def design_step(method):
+    """Decorate a Component method that assigns derived inputs to the
+    component or its subcomponents, such as ``set_subcomponents()``.
+
+    The attributes that the method reads are recorded. When one of them is
+    assigned, the step is marked to be re-run, with the arguments of its
+    last call, by ``Component.update()``. Assignments made by a step do not
+    mark the step itself.
+    """
+    name = method.__name__
+
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        key = (self, name)
+        outermost = key not in _tracking.steps
+        if outermost:
+            steps = _state(self).writable('steps')
+            steps.pop(name, None)
+            steps[name] = (args, kwargs)
+            _tracking.steps.add(key)
+        dependencies = set()
+        _tracking.frames.append(dependencies)
+        try:
+            return method(self, *args, **kwargs)
+        finally:
+            _tracking.frames.pop()
+            if outermost:
+                _tracking.steps.discard(key)
+                if name in _state(self).dirty:
+                    _state(self).dirty.discard(name)
+            _register(key, dependencies)
+    return wrapper
+
+
+class _ComponentMeta(ABCMeta):
+    """The metaclass of Component.
+
+    Attribute reads in a constructor are not recorded as dependencies of the
+    property or design step that called it. Once the outermost component has
+    been constructed, the design steps that were marked during construction
+    are unmarked, so ``Component.update()`` only re-runs the steps affected
+    by later assignments.
+    """
+
+    def __call__(cls, *args, **kwargs):
+        _tracking.frames.append(set())
+        _tracking.depth += 1
+        try:
+            component = super().__call__(*args, **kwargs)
+        finally:
+            _tracking.depth -= 1
+            _tracking.frames.pop()
+            if _tracking.depth == 0:
+                marked, _tracking.marked = _tracking.marked, []
+        if _tracking.depth == 0 and _tracking.changes is None:
+            for state, name in marked:
+                state.dirty.discard(name)
+        return component
+
+
+# Fields that are not serialized.
+_SERIAL_IGNORED = frozenset([
+    'subcomponents',
+    'convergence',
+    'Q_DEFAULT',
+    'TEMP_DEFAULT',
+    'SERIALIZED_FIELDS',
+    'onshape_config',
+    'onshape_url_default',
+    'onshape_url_configured',
+])
+
+
+def _serialize_value(value):
+    """Convert a field of a component to a value that can be written as
+    JSON.
+    """
+    if isinstance(value, Component):
+        return value.serialize()
+    if isinstance(value, u.Quantity):
+        return {'magnitude': _serialize_value(value.magnitude),
+                'units': str(value.units)}
+    if isinstance(value, (np.ndarray, np.generic)):
+        return value.tolist()
+    if isinstance(value, (list, tuple)):
+        return [_serialize_value(item) for item in value]
+    if isinstance(value, dict):
+        return {str(key): _serialize_value(item)
+                for key, item in value.items()}
+    if value is None or isinstance(value, (bool, int, float, str)):
+        return value
+    return str(value)
+
+class Component(ABC, metaclass=_ComponentMeta):
     """An abstract class representing AguaClara plant components.
     
     This class provides subclasses with the ability to record and propogate a
@@ -59,13 +451,174 @@ class Component(ABC):
     TEMP_DEFAULT = 20 * u.degC
     onshape_url_default = ''
 
+    # The names of the fields written by serialize(), or None for all public
+    # inputs, properties and constants.
+    SERIALIZED_FIELDS = None
+
+    def __init_subclass__(cls, **kwargs):
+        """Cache the read-only properties defined by a subclass."""
+        super().__init_subclass__(**kwargs)
+        for name, value in list(vars(cls).items()):
+            if (type(value) is property and value.fset is None
+                    and value.fdel is None):
+                setattr(cls, name,
+                        _CachedProperty(value.fget, value.__doc__, name))
+
+    def __new__(cls, *args, **kwargs):
+        self = super().__new__(cls)
+        object.__setattr__(self, '_state', _State())
+        return self
+
+    def __getattribute__(self, name):
+        try:
+            return object.__getattribute__(self, name)
+        finally:
+            frames = _tracking.frames
+            if frames and name not in _UNTRACKED:
+                frames[-1].add((self, name))
+
+    def __setattr__(self, name, value):
+        old = object.__getattribute__(self, '__dict__').get(name, _MISSING)
+        object.__setattr__(self, name, value)
+        changes = _tracking.changes
+        if changes is not None and (self, name) not in changes:
+            changes[(self, name)] = old
+        # Assigning an equal value keeps the cached properties, so that
+        # Component.update() stops once the design steps stop changing.
+        if not _same(old, value):
+            self._invalidate(name)
+
+    def __delattr__(self, name):
+        object.__delattr__(self, name)
+        self._invalidate(name)
+
+    def _invalidate(self, name):
+        """Discard the cached properties that depend on an attribute of this
+        component, directly or through other properties, and mark the design
+        steps that depend on them to be re-run.
+
+        Returns the discarded properties as a set of (component, name) pairs.
+        """
+        discarded = set()
+        stack = [(self, name)]
+        while stack:
+            component, attribute = stack.pop()
+            dependents = _state(component).dependents.pop(attribute, ())
+            for dependent in dependents:
+                state = _state(dependent[0])
+                if dependent[1] in state.steps:
+                    if dependent not in _tracking.steps:
+                        state.writable('dirty').add(dependent[1])
+                        if _tracking.depth:
+                            _tracking.marked.append((state, dependent[1]))
+                    continue
+                state.cached.pop(dependent[1], None)
+                if dependent not in discarded:
+                    discarded.add(dependent)
+                    stack.append(dependent)
+        return discarded
+
+    def clear_cache(self):
+        """Discard all cached properties of this component and the cached
+        properties of other components that depend on them.
+        """
+        for name in list(_state(self).cached):
+            self._invalidate(name)
+        _state(self).cached.clear()
+
+    @uncached_property
+    def convergence(self):
+        """The :class:`FixedPointInfo` of the last run of each coupled design
+        of this component, by name.
+        """
+        return dict(_state(self).convergence)
+
+    def _solve_coupled(self, name, func, x0, **kwargs):
+        """Solve a coupled design of this component with :func:`fixed_point`
+        and record its convergence as ``self.convergence[name]``.
+        """
+        x, info = fixed_point(func, x0, **kwargs)
+        _state(self).writable('convergence')[name] = info
+        return x
+
+    def _walk(self):
+        """Return (path, component) pairs for this component and every
+        component reachable through its attributes, breadth first. The path
+        of this component is ``''``.
+        """
+        found = [('', self)]
+        seen = {id(self)}
+        for path, component in found:
+            for name, value in vars(component).items():
+                if isinstance(value, Component) and id(value) not in seen:
+                    seen.add(id(value))
+                    found.append((path + '.' + name if path else name,
+                                  value))
+        return found
+
+    def update(self):
+        """Re-run the design steps of this component and its subcomponents
+        whose inputs have been assigned since they last ran.
+
+        Steps are re-run on the deepest components first, in the order they
+        first ran on each component, until none are marked. The cached
+        properties that depend on the inputs that changed are recomputed on
+        their next access.
+
+        Returns an :class:`UpdateReport` of the steps that were re-run and of
+        the attributes that they changed.
+
+        Example:
+            >>> plant = Plant(q = 20 * u.L / u.s)
+            >>> plant.etf.floc.hl = 35 * u.cm
+            >>> report = plant.update()
+            >>> report.steps
+            ['etf.floc._set_drain_pipe', 'etf._design_ent_floc',
+             'etf.floc._set_drain_pipe']
+        """
+        if _tracking.changes is not None:
+            raise RuntimeError('Component.update() cannot be nested.')
+        steps = []
+        _tracking.changes = changes = {}
+        try:
+            for _ in range(UPDATE_MAX_PASSES):
+                dirty = [(path, component, name)
+                         for path, component in reversed(self._walk())
+                         for name in list(_state(component).steps)
+                         if name in _state(component).dirty]
+                if not dirty:
+                    break
+                for path, component, name in dirty:
+                    state = _state(component)
+                    if name in state.dirty:
+                        args, kwargs = state.steps[name]
+                        getattr(component, name)(*args, **kwargs)
+                        steps.append(path + '.' + name if path else name)
+            else:
+                raise RuntimeError('Component.update() did not converge in '
+                                   '{} passes.'.format(UPDATE_MAX_PASSES))
+        finally:
+            _tracking.changes = None
+        paths = {id(component): path for path, component in self._walk()}
+        report = {}
+        for (component, name), old in changes.items():
+            new = vars(component).get(name, _MISSING)
+            if id(component) in paths and not _same(old, new) \
+                    and old is not _MISSING:
+                path = paths[id(component)]
+                report[path + '.' + name if path else name] = (old, new)
+        return UpdateReport(steps, report)
+
     def __init__(self, **kwargs):
         self.q = self.Q_DEFAULT
         self.temp = self.TEMP_DEFAULT
 
         # Update the Component with new expert inputs, if any were given
         self.__dict__.update(**kwargs)
+        for name in kwargs:
+            self._invalidate(name)
 
+    @design_step
     def set_subcomponents(self):
         """Set the plant-wide inputs of all subcomponents.
 
@@ -73,78 +626,110 @@ class Component(ABC):
         and ``temp`` for subcomponents, except when a subcomponent specifies its
         own custom ``q`` and ``temp``.
         """
+        inherited = _state(self).writable('inherited')
         for subcomp in self.subcomponents:
             # Set the subcomponent's ``q`` and ``temp`` to match this component
             # unless they were changed during instantiation.
-            if subcomp.q == self.Q_DEFAULT:
+            if subcomp.q == self.Q_DEFAULT or (subcomp, 'q') in inherited:
                 subcomp.q = self.q
-            if subcomp.temp == self.TEMP_DEFAULT:
+                inherited.add((subcomp, 'q'))
+            if subcomp.temp == self.TEMP_DEFAULT or \
+                    (subcomp, 'temp') in inherited:
                 subcomp.temp = self.temp
+                inherited.add((subcomp, 'temp'))
 
             # Recursively set sub-subcomponents.
             if hasattr(subcomp, 'subcomponents'):
                 subcomp.set_subcomponents()
-        
-    def serialize_properties(self):
-        """Return the properties (fields and ``@property`` functions) of a 
-        component as a dictionary string.
+
+    @classmethod
+    def _schema(cls):
+        """Return the names of the class-level fields of this class that are
+        serialized: its public properties and constants.
+        """
+        schema = cls.__dict__.get('_schema_names')
+        if schema is None:
+            names = set()
+            for klass in cls.__mro__:
+                for name, value in vars(klass).items():
+                    if name.startswith('_') or name in _SERIAL_IGNORED:
+                        continue
+                    if isinstance(value, property) or not (
+                            callable(value) or
+                            isinstance(value, (classmethod, staticmethod))):
+                        names.add(name)
+            schema = tuple(sorted(names))
+            type.__setattr__(cls, '_schema_names', schema)
+        return schema
+
+    def _fields(self):
+        """Yield the name and value of each serialized field of this
+        component, in order, evaluating each field once.
+
+        The fields are ``SERIALIZED_FIELDS`` if a subclass declares it, and
+        otherwise the public attributes of the instance and the public
+        properties and constants of its class.
+        """
+        names = self.SERIALIZED_FIELDS
+        if names is None:
+            names = sorted(set(self._schema()).union(
+                name for name in vars(self)
+                if not name.startswith('_') and name not in _SERIAL_IGNORED))
+        for name in names:
+            yield name, getattr(self, name)
+
+    def serialize(self):
+        """Return the fields of this component and its subcomponents as a
+        dictionary that can be written as JSON.
+
+        Quantities are written as ``{'magnitude': ..., 'units': ...}``,
+        and subcomponents as nested dictionaries.
         """
-        properties = {}
-        ignored_properties = [
-            '__dict__',
-            '__doc__',
-            '__module__',
-            '__weakref__',
-            'subcomponents',
-            'Q_DEFAULT',
-            'TEMP_DEFAULT',
-            '__abstractmethods__',
-            '_abc_cache',
-            '_abc_negative_cache',
-            '_abc_negative_cache_version',
-            '_abc_registry',
-            'onshape_config'
-        ]
-        # Get all of the object's fields
-        for var_name in dir(self):
-            value = getattr(self, var_name)
-
-            # Serialize subcomponents to strings so that they are accessible by
-            # Onshape's Super Derive feature
+        return {name: _serialize_value(value)
+                for name, value in self._fields()}
+
+    def write_json(self, fp):
+        """Write the fields of this component and its subcomponents to a
+        text file as JSON, in the format of :meth:`serialize`.
+
+        The JSON is written field by field, so that the serialized tree of a
+        large component is never held in memory.
+
+        Args:
+            - ``fp (file)``: The file to write to
+        """
+        fp.write('{')
+        for i, (name, value) in enumerate(self._fields()):
+            fp.write('{}{}: '.format(', ' if i else '', json.dumps(name)))
             if isinstance(value, Component):
-                properties[var_name] = str(value.serialize_properties())
-
-            # Serialize non-component properties
-            elif not callable(value) and var_name not in ignored_properties:
-
-                # Serialize lists or arrays
-                try: 
-                    if type(value.magnitude) is np.ndarray:
-                        properties[var_name] = ut.array_qtys_to_strs(value)
-                    else:
-                        properties[var_name] = str(value)
-                
-                # Serialize non-iterable properties
-                except AttributeError: 
-                    properties[var_name] = str(value)
-    
-        return properties
+                value.write_json(fp)
+            else:
+                fp.write(json.dumps(_serialize_value(value)))
+        fp.write('}')
+
+    def serialize_properties(self):
+        """Return the properties (fields and ``@property`` functions) of a
+        component as a dictionary of strings, with subcomponents as the
+        string of their dictionary, for Onshape's Super Derive feature.
+        """
+        return {name: serialize_property(value)
+                for name, value in self._fields()}
 
     def print_properties(self):
         """Print the serialized properties with pretty indentation."""
         pprint(self.serialize_properties())
-    
-    def write_properties_to_file(self):
-        """Append the properties of a component to a file. If it does not exist,
-        then the file is created.
-        
+
+    def write_properties_to_file(self, filename='props.json'):
+        """Write the fields of a component to a JSON file, in the format of
+        :meth:`serialize`. If the file exists, it is overwritten.
+
         Args:
-            - ``filename (str)``: The name of the file
+            - ``filename (str)``: The name of the file (optional, defaults to
+              ``props.json``)
         """
-        filename = "props.json"
-        json.dump(self.serialize_properties(), open(filename, mode='w'),
-            indent = 4)
-        print("Properties of component can be found in file props.json")
+        with open(filename, mode='w') as fp:
+            self.write_json(fp)
+        print("Properties of component can be found in file " + filename)
 
     def _encode_onshape_config(self, config):
         encoding = ''
@@ -167,6 +752,19 @@ class Component(ABC):
 # TODO: get the following to work in the general case when passing a simple
 # nested dictionary to Onshape.
 
+def serialize_property(value):
+    """Convert a property of a component as in
+    :meth:`Component.serialize_properties`: a subcomponent becomes the string
+    of its properties, an array quantity a list of strings, and any other
+    value its string.
+    """
+    if isinstance(value, Component):
+        return str(value.serialize_properties())
+    if isinstance(getattr(value, 'magnitude', None), np.ndarray):
+        return ut.array_qtys_to_strs(value)
+    return str(value)
+
+
 def nested_dict_to_str(dict_, level=0):
     for key, value in dict_.items():
         if type(value) is u.Quantity:
@@ -18,7 +18,7 @@ import aguaclara.core.pipes as pipe
 from aguaclara.core.units import u
 import aguaclara.core.utility as ut
 
-from aguaclara.design.component import Component
+from aguaclara.design.component import Component, design_step
 from aguaclara.design.pipeline import Pipe
 
 import numpy as np
@@ -55,6 +55,12 @@ class EntranceTank(Component):
         - ``sdr (float)``: Standard demension ratio (optional,
           defaults to 41)
     """
+    SERIALIZED_FIELDS = (
+        'q', 'temp', 'drain_pipe', 'fab_s', 'floc_chan_w', 'floc_end_depth',
+        'lfom_nd', 'plate_angle', 'plate_capture_vel', 'plate_s',
+        'plate_thickness', 'spec', 'l', 'plate_l', 'plate_n'
+    )
+
     def __init__(self, **kwargs):
         self.lfom_nd = 2.0 * u.inch # May be innacurate, check with Monroe -Oliver L., oal22, 4 Jun '19
         self.floc_chan_w = 42.0 * u.inch
@@ -73,6 +79,7 @@ class EntranceTank(Component):
         self._set_drain_pipe()
         super().set_subcomponents()
 
+    @design_step
     def _set_drain_pipe(self):
         """The inner diameter of the entrance tank drain pipe."""
         drain_pipe_k_minor = \
@@ -36,6 +36,8 @@ class EntTankFloc(Component):
         - ``lfom (LFOM)``: Linear Flow Orifice Meter
           (optional, see :class:`aguaclara.design.lfom.LFOM` for defaults)
     """
+    SERIALIZED_FIELDS = ('q', 'temp', 'ent', 'floc', 'lfom')
+
     def __init__(self, **kwargs): 
         self.ent = EntranceTank()
         self.floc = Flocculator()
@@ -47,25 +49,22 @@ class EntTankFloc(Component):
 
         self._design_ent_floc(self.floc.ent_l)
 
+    @design_step
     def _design_ent_floc(self, ent_l):
         """Design the entrance tank and flocculator in tandem.
 
-        Each subcomponent is redesigned until the expected length of the
-        entrance tank (used to design the flocculator) is close enough to the
-        actual length of the entrance tank (which should accomodate the
-        flocculator's channel width).
-        
+        The flocculator is designed from a guess of the entrance tank's
+        length, and the entrance tank from the flocculator's channel width,
+        until the guess is within 1% of the actual length of the entrance
+        tank. The convergence is recorded as ``self.convergence['ent_l']``.
+
         Args:
             - ``ent_l (float * u.m)``: The initial guess for the entrance tank's
               length, used to design the first iteration of the flocculator.
         """
-        # Design the flocculator using a guess of the entrance tank's length.
-        self.floc.ent_l = ent_l
-        
-        # Design the entrance tank using the flocculator's channel width.
-        self.ent.floc_chan_w = self.floc.chan_w
+        def design(ent_l):
+            self.floc.ent_l = ent_l
+            self.ent.floc_chan_w = self.floc.chan_w
+            return self.ent.l
 
-        # Recalculate if the actual length of the entrance tank is not close
-        # enough.
-        if np.abs(self.ent.l.to(u.m) - ent_l) / self.ent.l > 0.01:
-            self._design_ent_floc(self.ent.l)
+        self._solve_coupled('ent_l', design, ent_l.to(u.m))
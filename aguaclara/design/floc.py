@@ -13,7 +13,7 @@ import aguaclara.core.physchem as pc
 import aguaclara.core.pipes as pipes
 import aguaclara.core.utility as ut
 from aguaclara.core.units import u
-from aguaclara.design.component import Component
+from aguaclara.design.component import Component, design_step
 from aguaclara.design.pipeline import Pipe
 
 import numpy as np
@@ -73,6 +73,16 @@ class Flocculator(Component):
         "https://cad.onshape.com/documents/c3a8ce032e33ebe875b9aab4/w/de9ad5474448b34f33fef097/e/08f41d8bdd9a9c90ab396f8a"
     )
 
+    SERIALIZED_FIELDS = (
+        'q', 'temp', 'chan_n_parity', 'chan_w_max', 'dividing_wall_thickness',
+        'drain_pipe', 'drain_t', 'end_water_depth', 'ent_l', 'gt', 'hl',
+        'l_max', 'polycarb_sheet_w', 'sed_chan_inlet_w_pre_weir', 'spec',
+        'BAFFLE_K', 'CHAN_N_MIN', 'HS_RATIO_MAX', 'HS_RATIO_MIN',
+        'OBSTACLE_OFFSET', 'SDR', 'baffle_s', 'chan_l', 'chan_n', 'chan_w',
+        'contraction_s', 'expansion_h', 'expansion_n', 'obstacle_n',
+        'obstacle_pipe_od', 'retention_time', 'vel_grad_avg', 'vol'
+    )
+
     def __init__(self, **kwargs):
         self.ent_l = 1.5 * u.m
         self.chan_w_max = 42.0 * u.inch
@@ -254,6 +264,7 @@ class Flocculator(Component):
 
         return pipe_od
 
+    @design_step
     def _set_drain_pipe(self):
         drain_k_minor = \
             hl.PIPE_ENTRANCE_K_MINOR + \
@@ -10,6 +10,7 @@ Example:
     6
 """
 import aguaclara.core.constants as con
+import aguaclara.core.kernels as kernels
 import aguaclara.core.physchem as pc
 import aguaclara.core.pipes as pipe
 import aguaclara.core.utility as ut
@@ -18,8 +19,34 @@ from aguaclara.core.units import u
 from aguaclara.design.component import Component
 
 import numpy as np
+import collections
 import math
 
+Layout = collections.namedtuple(
+    'Layout', ['row_n', 'orifice_d', 'sdr', 'orifice_n_per_row', 'orifice_n',
+               'error'])
+Layout.__doc__ = """An LFOM orifice layout found by :meth:`LFOM.optimize_layout`.
+
+Attributes:
+    - ``row_n (int)``: The number of rows
+    - ``orifice_d (float * u.inch)``: The orifice (drill bit) diameter
+    - ``sdr (float)``: The standard dimension ratio of the pipe
+    - ``orifice_n_per_row (numpy.ndarray)``: The number of orifices in each
+      row
+    - ``orifice_n (int)``: The total number of orifices
+    - ``error (float)``: The mean absolute relative error of the flow rate
+      at the top of each row, excluding the bottom row
+"""
+
+LayoutSearch = collections.namedtuple('LayoutSearch', ['best', 'pareto'])
+LayoutSearch.__doc__ = """The result of :meth:`LFOM.optimize_layout`.
+
+Attributes:
+    - ``best (Layout)``: The layout with the smallest error
+    - ``pareto (list)``: The layouts for which no other layout has both a
+      smaller error and fewer orifices, by increasing number of orifices
+"""
+
 
 class LFOM(Component):
     """Design and AguaClara plant's LFOM.
@@ -40,6 +67,12 @@ class LFOM(Component):
         - ``max_row_n (int)``: Maximum number of rows of orifices (optional,
           defaults to 10)
     """
+    SERIALIZED_FIELDS = (
+        'q', 'temp', 'drill_bits', 'hl', 'max_row_n', 'min_row_n', 'orifice_s',
+        'safety_factor', 'sdr', 'error_per_row', 'orifice_d',
+        'orifice_h_per_row', 'orifice_n_per_row', 'pipe_nd', 'row_b', 'row_n'
+    )
+
     def __init__(self, **kwargs):
         self.hl = 20.0 * u.cm
         self.safety_factor = 1.5
@@ -136,19 +169,41 @@ class LFOM(Component):
             self.row_b + 0.5 * self.orifice_d
         return height_orifices
 
+    @property
+    def _submerged_head(self):
+        """The head on the center of each row of orifices when the water level
+        is at the top of each row, as a ``(row_n + 1) x row_n`` array.
+
+        Element ``[k, i]`` is the head on row ``i`` when ``k`` rows are
+        submerged, so that the water level is ``row_b * (k + 1)``.
+        """
+        levels = np.arange(1, self.row_n + 2) * self.row_b
+        return levels[:, np.newaxis] - self.orifice_h_per_row[np.newaxis, :]
+
+    @property
+    def _submerged_orifice_q(self):
+        """The flow rate through one orifice of each row when each number of
+        rows is submerged, as a ``(row_n + 1) x row_n`` array.
+
+        Element ``[k, i]`` is zero unless row ``i`` is one of the ``k``
+        submerged rows.
+        """
+        flow = kernels.flow_orifice_vert(
+            self.orifice_d.to(u.m).magnitude,
+            self._submerged_head.to(u.m).magnitude,
+            con.VC_ORIFICE_RATIO)
+        submerged = np.tri(self.row_n + 1, self.row_n, -1, dtype=bool)
+        return np.where(submerged, flow, 0) * u.m ** 3 / u.s
+
     def q_submerged(self, row_n, orifice_n_per_row):
         """The flow rate through some number of submerged rows.
 
         Args:
             - ``row_n``: Number of submerged rows
+            - ``orifice_n_per_row``: Number of orifices in each row
         """
-        flow = 0 * u.L / u.s
-        for i in range(row_n):
-            flow = flow + (orifice_n_per_row[i] * (
-               pc.flow_orifice_vert(self.orifice_d,
-                                    self.row_b*(row_n + 1)
-                                    - self.orifice_h_per_row[i],
-                                    con.VC_ORIFICE_RATIO)))
+        orifice_n = np.asarray(orifice_n_per_row)[:row_n]
+        flow = self._submerged_orifice_q[row_n, :row_n] @ orifice_n
         return flow.to(u.L / u.s)
 
     @property
@@ -156,23 +211,115 @@ class LFOM(Component):
         """The number of orifices at each level."""
         h = self.row_b - 0.5*self.orifice_d
         flow_per_orifice = pc.flow_orifice_vert(self.orifice_d, h,
-         con.VC_ORIFICE_RATIO)
+         con.VC_ORIFICE_RATIO).to(u.m ** 3 / u.s).magnitude
+        q_per_row = self.q_per_row.to(u.m ** 3 / u.s).magnitude
+        orifice_q = self._submerged_orifice_q.to(u.m ** 3 / u.s).magnitude
+        n_max = self.orifice_n_max_per_row
+        # Each row is sized for the flow that the rows below it do not carry,
+        # so the rows are designed from the bottom up.
         n = np.zeros(self.row_n)
         for i in range(self.row_n):
-            flow_needed = self.q_per_row[i] - self.q_submerged(i, n)
-            n_orifices_real = (flow_needed / \
-                flow_per_orifice).to(u.dimensionless)
-            n[i] = min((max(0, round(n_orifices_real))),
-             self.orifice_n_max_per_row)
+            flow_needed = q_per_row[i] - orifice_q[i] @ n
+            n[i] = min(max(0, round(flow_needed / flow_per_orifice)), n_max)
         return n
 
     @property
     def error_per_row(self):
         """The error of the design based off the predicted flow rate and
         the actual flow rate."""
-        q_error = np.zeros(self.row_n)
-        for i in range(self.row_n):
-            actual_flow = self.q_submerged(i, self.orifice_n_per_row)
-            q_error[i] = (((actual_flow - self.q_per_row[i]) / \
-                 self.q_per_row[i]).to(u.dimensionless)).magnitude
-        return q_error
+        actual_flow = self._submerged_orifice_q[:self.row_n] @ \
+            self.orifice_n_per_row
+        return ((actual_flow - self.q_per_row) /
+                self.q_per_row).to(u.dimensionless).magnitude
+
+    def _layouts(self, row_n, bits, sdrs):
+        """Design the orifices of every combination of drill bits and SDRs
+        for a number of rows, as in ``orifice_n_per_row``.
+
+        Returns the number of orifices in each row and the relative error of
+        each row as ``len(bits) x len(sdrs) x row_n`` arrays.
+        """
+        row_b = (self.hl / row_n).to(u.m).magnitude
+        q_per_row = np.linspace(1 / row_n, 1, row_n) * \
+            self.q.to(u.m ** 3 / u.s).magnitude
+        d = bits[:, np.newaxis, np.newaxis]
+        levels = np.arange(1, row_n + 1)[:, np.newaxis] * row_b
+        heights = np.arange(row_n) * row_b + d / 2
+        submerged = np.tri(row_n, row_n, -1, dtype=bool)
+        orifice_q = np.where(
+            submerged,
+            kernels.flow_orifice_vert(d, levels - heights,
+                                      con.VC_ORIFICE_RATIO), 0)
+        flow_per_orifice = kernels.flow_orifice_vert(
+            bits, row_b - bits / 2, con.VC_ORIFICE_RATIO)[:, np.newaxis]
+
+        pipe_id = np.array([
+            pipe.ID_SDR(pipe.ND_SDR_available(pc.diam_circle(self.pipe_a_min),
+                                              sdr), sdr).to(u.m).magnitude
+            for sdr in sdrs])
+        n_max = np.floor(np.pi * pipe_id /
+                         (bits[:, np.newaxis] +
+                          self.orifice_s.to(u.m).magnitude))
+
+        n = np.zeros((len(bits), len(sdrs), row_n))
+        for i in range(row_n):
+            flow_needed = q_per_row[i] - np.einsum(
+                'bj,bsj->bs', orifice_q[:, i], n)
+            n[:, :, i] = np.minimum(
+                np.maximum(0, np.round(flow_needed / flow_per_orifice)), n_max)
+        actual_flow = np.einsum('bki,bsi->bsk', orifice_q, n)
+        return n, (actual_flow - q_per_row) / q_per_row
+
+    def optimize_layout(self, sdrs=None):
+        """Search the orifice layouts for the one with the smallest error.
+
+        Every number of rows from ``min_row_n`` to ``max_row_n``, every drill
+        bit in ``drill_bits`` that fits within a row, and every SDR is
+        designed as in ``orifice_n_per_row``. The error of a layout is the
+        mean absolute value of its ``error_per_row``, except for the bottom
+        row, which carries no flow at its top.
+
+        Args:
+            - ``sdrs (list)``: The pipe SDRs to search (optional, defaults to
+              ``[self.sdr]``)
+
+        Returns:
+            :class:`LayoutSearch`: The best layout and the Pareto front of
+            error vs. number of orifices.
+
+        Example:
+            >>> lfom = LFOM(q=20 * u.L / u.s, hl=20 * u.cm)
+            >>> search = lfom.optimize_layout(sdrs=[26, 41])
+            >>> search.best.error < np.mean(np.abs(lfom.error_per_row[1:]))
+            True
+        """
+        sdrs = [self.sdr] if sdrs is None else list(sdrs)
+        all_bits, index = np.unique(self.drill_bits.to(u.m).magnitude,
+                                    return_index=True)
+        # The drill bits as given, so that each layout's diameter is exactly
+        # one of them.
+        all_bit_ds = [self.drill_bits[i] for i in index]
+        layouts = []
+        for row_n in range(self.min_row_n, self.max_row_n + 1):
+            fits = all_bits <= (self.hl / row_n).to(u.m).magnitude
+            bits = all_bits[fits]
+            if bits.size == 0:
+                continue
+            bit_ds = [d for d, fit in zip(all_bit_ds, fits) if fit]
+            n, error = self._layouts(row_n, bits, sdrs)
+            mean_error = np.mean(np.abs(error[:, :, 1:]), axis=-1)
+            for (b, s), value in np.ndenumerate(mean_error):
+                layouts.append(Layout(
+                    row_n, bit_ds[b], sdrs[s], n[b, s],
+                    int(np.sum(n[b, s])), float(value)))
+        if not layouts:
+            raise ValueError('No drill bit fits within the rows of the LFOM.')
+
+        best = min(layouts, key=lambda layout: layout.error)
+        pareto = []
+        for layout in sorted(layouts,
+                             key=lambda layout: (layout.orifice_n,
+                                                 layout.error)):
+            if not pareto or layout.error < pareto[-1].error:
+                pareto.append(layout)
+        return LayoutSearch(best, pareto)
@@ -14,45 +14,180 @@ Constants:
       sizes for pipeline fittings
     - ``AVAILABLE_FITTING_IDS (numpy.ndarray * u.inch)``: Set of available
       inner diameters for pipeline fittings
+    - ``NETWORK_TOLERANCE (float)``: The default relative tolerance of the
+      flow rates solved by :meth:`PipeNetwork.solve`
+    - ``NETWORK_MAX_ITERATIONS (int)``: The default maximum number of
+      iterations of :meth:`PipeNetwork.solve`
 """
 from aguaclara.core.units import unit_registry as u
 from aguaclara.core import physchem as pc
+from aguaclara.core import kernels
 from aguaclara.core import head_loss as hl
+import aguaclara.core.catalog as cat
 import aguaclara.core.constants as con
 import aguaclara.core.materials as mats
-import aguaclara.core.utility as ut
 from aguaclara.design.component import Component
 
-import pandas as pd
 import numpy as np
-import os.path
+import collections
 from abc import ABC, abstractmethod
+from scipy import sparse
+from scipy.sparse import csgraph
+from scipy.sparse import linalg as sparse_linalg
 
-_dir_path = os.path.dirname(__file__)
-_pipe_database_path = os.path.join(_dir_path, 'data/pipe_database.csv')
-with open(_pipe_database_path) as pipe_database_file:
-    _pipe_database = pd.read_csv(pipe_database_file)
+_pipe_database = cat.load_table(cat.DESIGN_PIPE_DATABASE_PATH)
+_fitting_database = cat.load_table(cat.FITTING_DATABASE_PATH)
 
-_fitting_database_path = \
-    os.path.join(_dir_path, 'data/fitting_database.csv')
-with open(_fitting_database_path) as _fitting_database_file:
-    _fitting_database = pd.read_csv(_fitting_database_file)
+_pipe_used = _pipe_database['Used'] == 1
+AVAILABLE_SIZES = _pipe_database['NDinch'][_pipe_used] * u.inch
+AVAILABLE_IDS_SCH40 = _pipe_database['ID_SCH40'][_pipe_used] * u.inch
 
-# TODO: Once we support a Pint version that supports use with Pandas DataFrame's
-# (>=0.10.0), we can assign units to DataFrame's rather than converting them to
-# NumPy arrays.
-_available_sizes_raw = _pipe_database.query('Used==1')['NDinch']
-AVAILABLE_SIZES = np.array(_available_sizes_raw) * u.inch
+_fitting_used = _fitting_database['Used'] == 1
+AVAILABLE_FITTING_SIZES = _fitting_database['size'][_fitting_used] * u.inch
+AVAILABLE_FITTING_IDS = _fitting_database['id_inch'][_fitting_used] * u.inch
 
-_available_ids_sch40_raw = _pipe_database.query('Used==1')['ID_SCH40']
-AVAILABLE_IDS_SCH40 = np.array(_available_ids_sch40_raw) * u.inch
+# The available sizes in inches, sorted, so that constructing a component
+# does not do arithmetic on Pint arrays.
+_AVAILABLE_SIZES_INCH = np.sort(AVAILABLE_SIZES.to(u.inch).magnitude)
+_AVAILABLE_FITTING_SIZES_INCH = AVAILABLE_FITTING_SIZES.to(u.inch).magnitude
+_AVAILABLE_FITTING_IDS_INCH = AVAILABLE_FITTING_IDS.to(u.inch).magnitude
 
+_INCH = u.inch
 
-_available_fitting_sizes_raw = _fitting_database.query('Used==1')['size']
-AVAILABLE_FITTING_SIZES = np.array(_available_fitting_sizes_raw) * u.inch
 
-_available_fitting_ids_raw = _fitting_database.query('Used==1')['id_inch']
-AVAILABLE_FITTING_IDS = np.array(_available_fitting_ids_raw)* u.inch
+def _inch(magnitude):
+    """Return a new quantity in inches.
+
+    Each component is given its own quantities, since quantities can be
+    changed in place. This is several times faster than ``magnitude *
+    u.inch``.
+    """
+    return u.Quantity(magnitude, _INCH)
+
+NETWORK_TOLERANCE = 1e-10
+NETWORK_MAX_ITERATIONS = 100
+
+# The velocity (m/s) of the initial flow rate of every component in
+# PipeNetwork.solve.
+_NETWORK_VELOCITY_INITIAL = 0.3
+
+# The slope (s/m²) of the head loss of a component is taken at a flow rate
+# (m³/s) of at least _NETWORK_FLOW_MIN and kept above _NETWORK_SLOPE_MIN, so
+# that components without flow have a finite slope.
+_NETWORK_FLOW_MIN = 1e-12
+_NETWORK_SLOPE_MIN = 1e-6
+
+# The slope of the head loss of a pipe that is held at the transition flow
+# rate, relative to its slope there.
+_NETWORK_TRANSITION_STIFFNESS = 1e6
+
+# The relative distance from the transition flow rate at which a pipe is
+# released to the laminar or turbulent side.
+_NETWORK_TRANSITION_OFFSET = 1e-9
+
+
+def _nearest_fitting(values_inch, value):
+    """Return the index of the available fitting size or inner diameter
+    nearest to a value.
+    """
+    return np.abs(values_inch - value.to(u.inch).magnitude).argmin()
+
+
+def _fitting_k_minor(component):
+    """Return the minor loss coefficient of a fitting, which is that of the
+    open outlet for a tee.
+    """
+    if isinstance(component, Tee):
+        return (component.right_k_minor if component.left_type == 'stopper'
+                else component.left_k_minor)
+    return component.k_minor
+
+
+class CompiledPipeline:
+    """A pipeline flattened into arrays, for computing its head loss and flow
+    rate without visiting each component.
+
+    Attributes:
+        - ``components (list)``: The pipeline components, in the direction of
+          flow
+        - ``id (numpy.ndarray)``: The inner diameter of each component (m)
+        - ``l (numpy.ndarray)``: The length of each component (m), which is 0
+          for fittings
+        - ``k_minor (numpy.ndarray)``: The minor loss coefficient of each
+          fitting, which is 0 for pipes
+        - ``roughness (numpy.ndarray)``: The roughness of each pipe (m), which
+          is 0 for fittings
+        - ``nu (numpy.ndarray)``: The kinematic viscosity of the fluid in each
+          component (m²/s)
+        - ``q (numpy.ndarray)``: The flow rate of each component (m³/s)
+
+    Pipes have only major losses and fittings only minor losses, as in the
+    ``headloss`` of each component.
+    """
+
+    def __init__(self, components):
+        self.components = list(components)
+        (self.id, self.l, self.nu, self.roughness, self.k_minor,
+         self._pipes) = _arrays(self.components)
+        self.q = _magnitudes([component.q for component in self.components],
+                             u.m ** 3 / u.s)
+
+    def _headloss(self, q):
+        """Return the head loss (m) of the pipeline for flow rates (m³/s)
+        with a trailing axis over the components.
+        """
+        pipes = self._pipes
+        q = np.broadcast_to(q, np.broadcast(q, self.id).shape)
+        headloss = np.zeros(q.shape)
+        headloss[..., pipes] = kernels.headloss_major_pipe(
+            q[..., pipes], self.id[pipes], self.l[pipes], self.nu[pipes],
+            self.roughness[pipes])
+        headloss[..., ~pipes] = kernels.headloss_minor_elbow(
+            q[..., ~pipes], self.id[~pipes], self.k_minor[~pipes])
+        return headloss.sum(axis=-1)
+
+    def headloss(self, q=None):
+        """Return the head loss of the pipeline.
+
+        Args:
+            - ``q (float * u.L / u.s)``: The flow rate through every component
+              (optional, defaults to the flow rate of each component). May be
+              an array.
+        """
+        if q is None:
+            q = self.q
+        else:
+            q = np.asarray(q.to(u.m ** 3 / u.s).magnitude)[..., np.newaxis]
+        return (self._headloss(q) * u.m).to(u.cm)
+
+    def flow(self, target_headloss):
+        """Return the flow rate through the pipeline for a head loss.
+
+        The flow rate of the first pipe for the head loss is corrected by
+        the relative error of the pipeline head loss until that error is
+        within 1%.
+
+        Args:
+            - ``target_headloss (float * u.m)``: The head loss through the
+              pipeline. May be an array.
+        """
+        target = np.asarray(target_headloss.to(u.m).magnitude, dtype=float)
+        pipes = np.flatnonzero(self._pipes[:2])
+        if pipes.size == 0:
+            raise AttributeError('Neither of the first two components in'
+                                 'this pipeline are Pipe objects.')
+        i = pipes[0]
+        flow = np.asarray(kernels.flow_pipe(
+            self.id[i], target, self.l[i], self.nu[i], self.roughness[i],
+            self.components[i].k_minor), dtype=float)
+        headloss = self._headloss(flow[..., np.newaxis])
+        active = np.ones(flow.shape, dtype=bool)
+        while np.any(active):
+            err = (target - headloss) / (target + headloss)
+            flow = np.where(active, flow + err * flow, flow)
+            headloss = self._headloss(flow[..., np.newaxis])
+            active &= np.abs(err) > 0.01
+        return (flow * u.m ** 3 / u.s).to(u.L / u.s)
 
 
 class PipelineComponent(Component, ABC):
@@ -90,7 +225,7 @@ class PipelineComponent(Component, ABC):
                 'or inner diameter, but not both.'
             )
 
-        self.size = 0.5 * u.inch
+        self.size = _inch(0.5)
         self.fluid_type = 'water'
         self.next = None
         self.k_minor = 0
@@ -119,7 +254,12 @@ class PipelineComponent(Component, ABC):
         """Return the next larger size which is available, given the list of
         available sizes.
         """
-        return ut.ceil_nearest(size, AVAILABLE_SIZES)
+        size_inch = size.to(u.inch).magnitude
+        if size_inch > _AVAILABLE_SIZES_INCH[-1]:
+            raise ValueError(str(size) + " is larger than all values in the "
+                             "array.")
+        return _inch(_AVAILABLE_SIZES_INCH[
+            np.searchsorted(_AVAILABLE_SIZES_INCH, size_inch)])
 
     @abstractmethod
     def headloss(self):
@@ -129,18 +269,29 @@ class PipelineComponent(Component, ABC):
     @property
     def headloss_pipeline(self):
         """The head loss of the entire pipeline following this component."""
-        if self.next is None:
-            return self.headloss
-        else:
-            return self.headloss + self.next.headloss_pipeline
+        return self.compile().headloss()
+
+    def compile(self):
+        """Return the pipeline that starts at this component as a
+        :class:`CompiledPipeline`.
+        """
+        components = []
+        seen = set()
+        component = self
+        while component is not None:
+            if id(component) in seen:
+                raise ValueError('The pipeline contains a loop.')
+            seen.add(id(component))
+            components.append(component)
+            component = component.next
+        return CompiledPipeline(components)
 
     def _set_next_components_q(self):
         """Set the flow rates of the next components in this pipeline to be
         the same as this component.
         """
-        if self.next is not None:
-            self.next.q = self.q
-            self.next._set_next_components_q()
+        for component in self.compile().components[1:]:
+            component.q = self.q
 
     def flow_pipeline(self, target_headloss):
         """Calculate the required flow through a pipeline component and all of
@@ -150,35 +301,10 @@ class PipelineComponent(Component, ABC):
             - ``target_headloss (float * u.m)``: The desired head loss through
               the pipeline
         """
-        if type(self) is Pipe:
-            flow = pc.flow_pipe(self.id,
-                    target_headloss,
-                    self.l,
-                    self.nu,
-                    self.pipe_rough,
-                    self.k_minor)
-        else:
-            try:
-                flow = pc.flow_pipe(
-                    self.next.id,
-                    target_headloss,
-                    self.next.l,
-                    self.next.nu,
-                    self.next.pipe_rough,
-                    self.next.k_minor)
-            except AttributeError:
-                raise AttributeError('Neither of the first two components in'
-                    'this pipeline are Pipe objects.')
-        err = 1.0
-        headloss = self.headloss_pipeline
-
-        while abs(err) > 0.01 :
-            err = (target_headloss - headloss) / (target_headloss + headloss)
-            flow = flow + err * flow
-            self.q = flow
-            self._set_next_components_q()
-            headloss = self.headloss_pipeline
-        return flow.to(u.L / u.s)
+        flow = self.compile().flow(target_headloss)
+        self.q = flow
+        self._set_next_components_q()
+        return flow
 
     @abstractmethod
     def format_print(self):
@@ -191,10 +317,8 @@ class PipelineComponent(Component, ABC):
         """The pretty-printed string representation of a pipeline component
         and its next components.
         """
-        if self.next is None:
-            return self.format_print()
-        else:
-            return self.format_print() + '\n' + self.next._pprint()
+        return '\n'.join(component.format_print()
+                         for component in self.compile().components)
 
     def __str__(self):
         return self._pprint()
@@ -251,7 +375,7 @@ class Pipe(PipelineComponent):
     AVAILABLE_SPECS = ['sdr26', 'sdr41', 'sch40']
 
     def __init__(self, **kwargs):
-        self.id = 0.476 * u.inch
+        self.id = _inch(0.476)
         self.spec = 'sdr41'
         self.l = 1 * u.m
         self.pipe_rough = mats.PVC_PIPE_ROUGH
@@ -268,10 +392,8 @@ class Pipe(PipelineComponent):
     @property
     def od(self):
         """The outer diameter of the pipe"""
-        index = (
-                np.abs(np.array(_pipe_database['NDinch']) - self.size.magnitude)
-            ).argmin()
-        return _pipe_database.iloc[index, 1] * u.inch
+        return (cat.pipe_catalog(cat.DESIGN_PIPE_DATABASE_PATH)
+                .od_of_nd(self.size.to(u.inch).magnitude) * u.inch)
 
     def _get_size(self, id_, spec):
         """Get the size of a pipe given an inner diameter and specification.
@@ -305,7 +427,7 @@ class Pipe(PipelineComponent):
             - ``sdr (int)``: Standard dimension ratio
         """
         self.size = super()._get_available_size(size)
-        return self.size * (sdr - 2) / sdr
+        return self.size * ((sdr - 2) / sdr)
 
     def _get_id_sch40(self, size):
         """Get the inner diameter of a SCH40 pipe.
@@ -402,7 +524,7 @@ class Elbow(PipelineComponent):
 
     def __init__(self, **kwargs):
         self.angle = 90 * u.deg
-        self.id = 0.848 * u.inch
+        self.id = _inch(0.848)
 
         super().__init__(**kwargs)
 
@@ -429,9 +551,9 @@ class Elbow(PipelineComponent):
         Args:
             - ``id_ (float * u.inch)``: Inner diameter
         """
-        myindex = (np.abs(AVAILABLE_FITTING_IDS - id_)).argmin()
-        self.id = AVAILABLE_FITTING_IDS[myindex]
-        return AVAILABLE_FITTING_SIZES[myindex]
+        myindex = _nearest_fitting(_AVAILABLE_FITTING_IDS_INCH, id_)
+        self.id = _inch(_AVAILABLE_FITTING_IDS_INCH[myindex])
+        return _inch(_AVAILABLE_FITTING_SIZES_INCH[myindex])
 
     def _get_id(self, size):
         """Get the inner diameter based off the size.
@@ -439,9 +561,9 @@ class Elbow(PipelineComponent):
         Args:
             - ``size (float * u.inch)``: Nominal Size
         """
-        myindex = (np.abs(AVAILABLE_FITTING_SIZES - size)).argmin()
-        self.size = AVAILABLE_FITTING_SIZES[myindex]
-        return AVAILABLE_FITTING_IDS[myindex]
+        myindex = _nearest_fitting(_AVAILABLE_FITTING_SIZES_INCH, size)
+        self.size = _inch(_AVAILABLE_FITTING_SIZES_INCH[myindex])
+        return _inch(_AVAILABLE_FITTING_IDS_INCH[myindex])
 
     @property
     def headloss(self):
@@ -510,7 +632,7 @@ class Tee(PipelineComponent):
         self.right = None
         self.right_type = 'stopper'
 
-        self.id = 0.848 * u.inch
+        self.id = _inch(0.848)
 
         super().__init__(**kwargs)
 
@@ -573,9 +695,9 @@ class Tee(PipelineComponent):
         Args:
             - ``id_ (float * u.inch)``: Inner diameter
         """
-        myindex = (np.abs(AVAILABLE_FITTING_IDS - id_)).argmin()
-        self.id = AVAILABLE_FITTING_IDS[myindex]
-        return AVAILABLE_FITTING_SIZES[myindex]
+        myindex = _nearest_fitting(_AVAILABLE_FITTING_IDS_INCH, id_)
+        self.id = _inch(_AVAILABLE_FITTING_IDS_INCH[myindex])
+        return _inch(_AVAILABLE_FITTING_SIZES_INCH[myindex])
 
     def _get_id(self, size):
         """Get the inner diameter based off the size.
@@ -583,9 +705,9 @@ class Tee(PipelineComponent):
         Args:
             - ``size (float * u.inch)``: Nominal size
         """
-        myindex = (np.abs(AVAILABLE_FITTING_SIZES - size)).argmin()
-        self.size = AVAILABLE_FITTING_SIZES[myindex]
-        return AVAILABLE_FITTING_IDS[myindex]
+        myindex = _nearest_fitting(_AVAILABLE_FITTING_SIZES_INCH, size)
+        self.size = _inch(_AVAILABLE_FITTING_SIZES_INCH[myindex])
+        return _inch(_AVAILABLE_FITTING_IDS_INCH[myindex])
 
     def format_print(self):
         """The string representation of this tee."""
@@ -612,3 +734,299 @@ class Tee(PipelineComponent):
 
         if self.next is not None and type(self.next) in [Elbow, Tee]:
              raise ValueError('Tees cannot be followed by other fittings.')
+
+
+NetworkSolution = collections.namedtuple(
+    'NetworkSolution',
+    ['q', 'headloss', 'head', 'iterations', 'converged'])
+NetworkSolution.__doc__ = """The result of :meth:`PipeNetwork.solve`.
+
+Attributes:
+    - ``q (numpy.ndarray * u.L / u.s)``: The flow rate of each component, in
+      the order of ``PipeNetwork.components``. It is negative where the flow
+      goes from the end node to the start node.
+    - ``headloss (numpy.ndarray * u.cm)``: The head loss of each component,
+      with the sign of its flow rate
+    - ``head (numpy.ndarray * u.m)``: The head of each node, in the order of
+      ``PipeNetwork.nodes``
+    - ``iterations (int)``: The number of Newton iterations
+    - ``converged (bool)``: Whether the relative tolerance was met
+"""
+
+
+class PipeNetwork:
+    """A branched or looped network of pipeline components.
+
+    Each pipe, elbow or tee is a link between a start node and an end node,
+    which may be any hashable names. Flow is split between branches by
+    connecting several components to one node; a tee adds the minor loss of
+    its open outlet to the flow through it. At least one node in every
+    connected part of the network must have a fixed head, such as a tank or
+    reservoir, and any other node may have a demand.
+
+    The flow rate of every component and the head of every node are solved
+    together with Newton's method (the global gradient algorithm of Todini
+    and Pilati): each iteration solves one sparse linear system, the graph
+    Laplacian of the network weighted by the inverse slope of the head loss
+    of each component, for the heads of the nodes without a fixed head, and
+    then updates the flow rates.
+
+    Attributes:
+        - ``components (list)``: The pipeline components, in the order they
+          were added
+        - ``nodes (list)``: The names of the nodes, in the order they were
+          first used
+
+    Example:
+        >>> network = PipeNetwork()
+        >>> network.add(Pipe(size=6 * u.inch, l=10 * u.m), 'tank', 'a')
+        >>> network.add(Pipe(size=4 * u.inch, l=20 * u.m), 'a', 'b')
+        >>> network.add(Pipe(size=4 * u.inch, l=30 * u.m), 'a', 'c')
+        >>> network.set_head('tank', 5 * u.m)
+        >>> network.set_demand('b', 10 * u.L / u.s)
+        >>> network.set_demand('c', 8 * u.L / u.s)
+        >>> solution = network.solve()
+    """
+
+    def __init__(self):
+        self.components = []
+        self.nodes = []
+        self._node_indices = {}
+        self._starts = []
+        self._ends = []
+        self._heads = {}
+        self._demands = {}
+
+    def _node(self, node):
+        """Return the index of a node, adding it if it is new."""
+        if node not in self._node_indices:
+            self._node_indices[node] = len(self.nodes)
+            self.nodes.append(node)
+        return self._node_indices[node]
+
+    def add(self, component, start, end):
+        """Add a pipeline component between two nodes.
+
+        Args:
+            - ``component (PipelineComponent)``: The pipe or fitting
+            - ``start``: The name of the node at the inlet of the component
+            - ``end``: The name of the node at the outlet of the component
+        """
+        if start == end:
+            raise ValueError('A component must connect two different nodes.')
+        self.components.append(component)
+        self._starts.append(self._node(start))
+        self._ends.append(self._node(end))
+
+    def add_pipeline(self, component, start, end):
+        """Add the pipeline that starts at a component between two nodes.
+
+        The node at the outlet of each component but the last is named by
+        that component.
+
+        Args:
+            - ``component (PipelineComponent)``: The first component of the
+              pipeline
+            - ``start``: The name of the node at the inlet of the pipeline
+            - ``end``: The name of the node at the outlet of the pipeline
+        """
+        components = component.compile().components
+        for component in components[:-1]:
+            self.add(component, start, component)
+            start = component
+        self.add(components[-1], start, end)
+
+    def set_head(self, node, head):
+        """Fix the head of a node, such as a tank or reservoir.
+
+        Args:
+            - ``node``: The name of the node
+            - ``head (float * u.m)``: The head of the node
+        """
+        self._heads[self._node(node)] = head.to(u.m).magnitude
+
+    def set_demand(self, node, q):
+        """Set the flow rate that leaves the network at a node.
+
+        Args:
+            - ``node``: The name of the node
+            - ``q (float * u.L / u.s)``: The flow rate, which is negative for
+              flow that enters the network
+        """
+        self._demands[self._node(node)] = q.to(u.m ** 3 / u.s).magnitude
+
+    def solve(self, tol=NETWORK_TOLERANCE, maxiter=NETWORK_MAX_ITERATIONS):
+        """Solve the flow rate of every component and the head of every node.
+
+        Pipes have only major losses and fittings only minor losses, as in
+        the ``headloss`` of each component. The iteration stops when the sum
+        of the changes in the flow rates is within a relative tolerance of
+        ``tol`` of the sum of the flow rates, or after ``maxiter``
+        iterations.
+
+        The head loss of a pipe jumps up where its flow becomes turbulent. A
+        pipe whose flow crosses the transition in an iteration is held at the
+        transition flow rate, as in :func:`aguaclara.core.kernels.flow_pipe`,
+        until the difference in head across it leaves the jump, rather than
+        letting its flow oscillate across the jump.
+
+        Keyword Args:
+            - ``tol (float)``: The relative tolerance (optional, defaults to
+              ``NETWORK_TOLERANCE``)
+            - ``maxiter (int)``: The maximum number of iterations (optional,
+              defaults to ``NETWORK_MAX_ITERATIONS``)
+
+        Returns:
+            A :class:`NetworkSolution`
+        """
+        if not self._heads:
+            raise ValueError('At least one node of the network must have a '
+                             'fixed head.')
+        links_n, nodes_n = len(self.components), len(self.nodes)
+        starts, ends = np.array(self._starts), np.array(self._ends)
+        # The incidence matrix, which gives the difference in head across
+        # each component from the heads of the nodes, and whose transpose
+        # gives the flow leaving each node from the flow rates.
+        incidence = sparse.csr_matrix(
+            (np.tile([1.0, -1.0], links_n),
+             (np.repeat(np.arange(links_n), 2),
+              np.column_stack((starts, ends)).ravel())),
+            shape=(links_n, nodes_n))
+
+        fixed = np.zeros(nodes_n, dtype=bool)
+        fixed[list(self._heads)] = True
+        head = np.zeros(nodes_n)
+        head[list(self._heads)] = list(self._heads.values())
+        demand = np.zeros(nodes_n)
+        demand[list(self._demands)] = list(self._demands.values())
+
+        _, labels = csgraph.connected_components(
+            sparse.coo_matrix((np.ones(links_n), (starts, ends)),
+                              shape=(nodes_n, nodes_n)),
+            directed=False)
+        if not np.all(np.isin(labels, labels[fixed])):
+            raise ValueError('Every part of the network must have a node '
+                             'with a fixed head.')
+
+        free = ~fixed
+        incidence_free = incidence[:, free].tocsc()
+        incidence_free_t = incidence_free.T.tocsr()
+        head_fixed = incidence[:, fixed] @ head[fixed]
+
+        diam, length, nu, roughness, k_minor, pipes = _arrays(self.components)
+        # The transition flow rate of each pipe and the bounds of the jump
+        # in its head loss there.
+        q_transition = np.where(pipes, kernels.flow_transition(diam, nu),
+                                np.inf)
+        h_laminar, h_turbulent = np.zeros(links_n), np.zeros(links_n)
+        h_laminar[pipes] = q_transition[pipes] / kernels.flow_hagen(
+            diam[pipes], 1, length[pipes], nu[pipes])
+        h_turbulent[pipes] = kernels.headloss_major_pipe(
+            q_transition[pipes] * (1 + _NETWORK_TRANSITION_OFFSET),
+            diam[pipes], length[pipes], nu[pipes], roughness[pipes])
+
+        def headloss(q):
+            q_abs = np.maximum(np.abs(q), _NETWORK_FLOW_MIN)
+            return (np.sign(q) * kernels.headloss_pipe(
+                        q_abs, diam, length, nu, roughness, k_minor),
+                    np.maximum(kernels.headloss_pipe_slope(
+                        q_abs, diam, length, nu, roughness, k_minor),
+                        _NETWORK_SLOPE_MIN))
+
+        def turbulent(q):
+            return (kernels.re_pipe(np.abs(q), diam, nu)
+                    >= kernels.RE_TRANSITION_PIPE)
+
+        q = _NETWORK_VELOCITY_INITIAL * kernels.area_circle(diam)
+        drop = np.zeros(links_n)
+        held = np.zeros(links_n, dtype=bool)
+        converged = False
+        for iteration in range(1, maxiter + 1):
+            h, slope = headloss(q)
+            # A held pipe has a steep head loss at the transition flow rate,
+            # through its last difference in head within the jump.
+            direction = np.sign(q)
+            h[held] = (direction * np.clip(direction * drop, h_laminar,
+                                           h_turbulent))[held]
+            slope[held] *= _NETWORK_TRANSITION_STIFFNESS
+
+            if np.any(free):
+                matrix = (incidence_free_t @ sparse.diags(1 / slope)
+                          @ incidence_free)
+                rhs = -(demand[free]
+                        + incidence_free_t @ (q - (h - head_fixed) / slope))
+                # The matrix is symmetric, so order it for A^T + A.
+                head[free] = sparse_linalg.spsolve(
+                    matrix.tocsc(), rhs, permc_spec='MMD_AT_PLUS_A')
+            drop = incidence @ head
+            q_new = q - (h - drop) / slope
+
+            direction = np.sign(q_new)
+            crossed = (pipes & ~held & (direction == np.sign(q))
+                       & (turbulent(q_new) != turbulent(q)))
+            along = direction * drop
+            below = held & (along < h_laminar)
+            above = held & (along > h_turbulent)
+            q_new[crossed] = (direction * q_transition)[crossed]
+            q_new[below] = (direction * q_transition
+                            * (1 - _NETWORK_TRANSITION_OFFSET))[below]
+            q_new[above] = (direction * q_transition
+                            * (1 + _NETWORK_TRANSITION_OFFSET))[above]
+            held = (held & ~below & ~above) | crossed
+
+            change = np.abs(q_new - q).sum()
+            q = q_new
+            if (change <= tol * np.abs(q).sum()
+                    and not np.any(crossed | below | above)):
+                converged = True
+                break
+
+        return NetworkSolution(
+            (q * u.m ** 3 / u.s).to(u.L / u.s),
+            (drop * u.m).to(u.cm),
+            head * u.m,
+            iteration,
+            converged)
+
+
+def _arrays(components):
+    """Return the inner diameter (m), length (m), kinematic viscosity (m²/s),
+    roughness (m) and minor loss coefficient of each of a list of pipeline
+    components, and whether each component is a pipe.
+
+    Pipes have no minor loss coefficient and fittings no length or
+    roughness, as in the ``headloss`` of each component.
+    """
+    if any(component.fluid_type != 'water' for component in components):
+        raise ValueError('Only pipelines of water are implemented.')
+    pipes = np.array([isinstance(component, Pipe)
+                      for component in components], dtype=bool)
+    pipe_components = [component for component, pipe
+                       in zip(components, pipes) if pipe]
+    diam = _magnitudes([component.id for component in components], u.m)
+    nu = np.array(kernels.viscosity_kinematic_water(_magnitudes(
+        [component.temp for component in components], u.K)), ndmin=1)
+    length, roughness, k_minor = (np.zeros(pipes.size) for _ in range(3))
+    length[pipes] = _magnitudes(
+        [component.l for component in pipe_components], u.m)
+    roughness[pipes] = _magnitudes(
+        [component.pipe_rough for component in pipe_components], u.m)
+    k_minor[~pipes] = [_fitting_k_minor(component)
+                       for component, pipe in zip(components, pipes)
+                       if not pipe]
+    return diam, length, nu, roughness, k_minor, pipes
+
+
+def _magnitudes(quantities, units):
+    """Return the magnitudes of a list of quantities in the given units,
+    converting the quantities of each distinct unit together.
+    """
+    magnitudes = np.zeros(len(quantities))
+    groups = {}
+    for i, quantity in enumerate(quantities):
+        groups.setdefault(quantity.units, []).append(i)
+    for quantity_units, indices in groups.items():
+        magnitudes[indices] = u.Quantity(
+            np.array([quantities[i].magnitude for i in indices], dtype=float),
+            quantity_units).to(units).magnitude
+    return magnitudes
@@ -1,4 +1,4 @@
-from aguaclara.design.component import Component
+from aguaclara.design.component import Component, design_step
 
 from aguaclara.design.ent_floc import EntTankFloc
 from aguaclara.design.floc import Flocculator
@@ -14,6 +14,8 @@ from aguaclara.core.units import u
 
 class Plant(Component):
     """Functions for designing an AguaClara water treatment plant."""
+    SERIALIZED_FIELDS = ('q', 'temp', 'etf', 'sed')
+
     def __init__(self, **kwargs):
         self.etf = EntTankFloc()
         self.sed = Sedimentor()
@@ -24,5 +26,6 @@ class Plant(Component):
 
         self.design_floc()
 
+    @design_step
     def design_floc(self):
         self.etf.floc.sed_chan_inlet_w_pre_weir = self.sed.chan.inlet_w_pre_weir
\ No newline at end of file
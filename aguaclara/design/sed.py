@@ -10,7 +10,7 @@ Example:
 """
 from aguaclara.design.sed_tank import SedimentationTank
 from aguaclara.design.sed_chan import SedimentationChannel
-from aguaclara.design.component import Component
+from aguaclara.design.component import Component, design_step
 from aguaclara.core.units import u
 import aguaclara.core.constants as con
 
@@ -38,6 +38,8 @@ class Sedimentor(Component):
           (optional, see
           :class:`aguaclara.design.sed_chan.SedimentationChannel` for defaults)
     """
+    SERIALIZED_FIELDS = ('q', 'temp', 'chan', 'tank', 'wall_thickness', 'tank_n')
+
     def __init__(self, **kwargs):
         self.wall_thickness = 15.0 * u.cm
         
@@ -48,7 +50,6 @@ class Sedimentor(Component):
         super().__init__(**kwargs)
         super().set_subcomponents()
 
-        self._design_chan()
         self._design_tank()
 
     @property
@@ -69,11 +70,17 @@ class Sedimentor(Component):
         self.chan.sed_tank_wall_thickness = self.tank.WALL_THICKNESS
         self.chan.sed_wall_thickness = self.wall_thickness
 
+    @design_step
     def _design_tank(self):
-        """Design the sedimentation tank based off of the channel"""
+        """Design the sedimentation channel from the tank, then give the tank
+        the outer width and weir thickness of the channel.
+
+        No tank property depends on the channel, so one pass is enough.
+        """
+        self._design_chan()
         self.tank.sed_chan_w_outer = self.chan.w_outer
         self.tank.sed_chan_weir_thickness = self.chan.weir_thickness
-        
+
 MODULE_PLATES_N_MIN = 8
 
 WATER_H_EST = 2 * u.m
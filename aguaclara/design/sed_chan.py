@@ -16,7 +16,7 @@ import aguaclara.core.physchem as pc
 import aguaclara.core.pipes as pipe
 import aguaclara.core.head_loss as hl
 import aguaclara.design.human_access as ha
-from aguaclara.design.component import Component
+from aguaclara.design.component import Component, design_step
 from aguaclara.design.pipeline import Pipe
 
 import numpy as np
@@ -84,6 +84,23 @@ class SedimentationChannel(Component):
     WEIR_FREEBOARD_H = 2.0 * u.cm
     SED_DEPTH_EST = 2.0 * u.m
 
+    SERIALIZED_FIELDS = (
+        'q', 'temp', 'drain_pipe', 'drain_spec', 'fitting_s',
+        'inlet_depth_max', 'outlet_free_h', 'outlet_pipe',
+        'outlet_pipe_hl_max', 'outlet_pipe_nd_max', 'outlet_pipe_spec',
+        'sed_tank_diffuser_hl', 'sed_tank_inlet_man_nd', 'sed_tank_n',
+        'sed_tank_outlet_man_hl', 'sed_tank_outlet_man_nd', 'sed_tank_w_inner',
+        'sed_tank_wall_thickness', 'sed_wall_thickness', 'w_min', 'weir_hl',
+        'weir_thickness', 'PLANT_FREEBOARD_H', 'SED_DEPTH_EST',
+        'SED_TANK_Q_RATIO', 'WEIR_FREEBOARD_H', 'inlet_depth',
+        'inlet_drain_box_w', 'inlet_h', 'inlet_last_coupling_h',
+        'inlet_slope_l', 'inlet_step_h', 'inlet_w', 'inlet_w_post_weir',
+        'inlet_w_pre_weir', 'inlet_weir_h', 'l', 'outlet_depth',
+        'outlet_drain_box_w', 'outlet_pipe_l', 'outlet_pipe_n',
+        'outlet_post_weir_w', 'outlet_w', 'outlet_w_pre_weir',
+        'outlet_weir_depth', 'outlet_weir_h', 'w_outer'
+    )
+
     def __init__(self, **kwargs):
         self.sed_tank_n=4
         self.sed_tank_w_inner=42.0 * u.inch
@@ -236,6 +253,7 @@ class SedimentationChannel(Component):
         inlet_w = self.inlet_w_pre_weir + self.weir_thickness + self.inlet_w_post_weir
         return inlet_w
 
+    @design_step
     def _set_drain_pipe(self):
         drain_k_minor = hl.PIPE_ENTRANCE_K_MINOR + hl.PIPE_EXIT_K_MINOR + hl.EL90_K_MINOR
         drain_nd = pc.pipe_flow_nd(
@@ -305,6 +323,7 @@ class SedimentationChannel(Component):
             step = 0.0001 * u.L / u.s
         )
 
+    @design_step
     def _set_outlet_pipe(self):
         outlet_pipe_q = self.q / self.outlet_pipe_n
 
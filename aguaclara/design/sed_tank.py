@@ -106,6 +106,25 @@ class SedimentationTank(Component):
     WALL_THICKNESS = 0.15 * u.m
     DIFFUSER_L = 15.0 * u.cm
 
+    SERIALIZED_FIELDS = (
+        'q', 'temp', 'diffuser_n', 'diffuser_sdr', 'diffuser_vel_max',
+        'diffuser_wall_thickness', 'floc_weir_to_plate_frame_h',
+        'hopper_slope_vertical_angle', 'inlet_man_hl', 'inlet_man_sdr',
+        'jet_reverser_sdr', 'l_inner', 'outlet_man_orifice_hl',
+        'outlet_man_orifice_n_est', 'outlet_man_orifice_q_ratio_max',
+        'outlet_man_sdr', 'plate_settler_angle',
+        'plate_settler_cantilever_l_max', 'plate_settler_s',
+        'plate_settler_thickness', 'plate_settler_vel_capture',
+        'sed_chan_w_outer', 'sed_chan_weir_thickness',
+        'side_slope_to_floc_weir_h_min', 'slope_angle', 'vel_upflow',
+        'w_inner', 'DIFFUSER_L', 'INLET_MAN_Q_RATIO', 'JET_PLANE_RATIO',
+        'JET_REVERSER_ND', 'JET_REVERSER_TO_DIFFUSERS_H', 'OUTLET_MAN_HL',
+        'WALL_THICKNESS', 'diffuser_hl', 'diffuser_w_inner', 'floc_weir_h',
+        'inlet_man_h', 'inlet_man_nd', 'outlet_man_nd', 'outlet_man_orifice_d',
+        'outlet_man_orifice_n', 'outlet_man_orifice_spacing', 'plate_l',
+        'q_tank', 'side_slopes_h', 'side_slopes_w'
+    )
+
     def __init__(self, **kwargs):
         self.vel_upflow=1.0 * u.mm / u.s
         self.l_inner=5.8 * u.m
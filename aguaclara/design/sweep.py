@@ -0,0 +1,210 @@
+"""Design a component for every point of a grid of design inputs.
+
+:func:`sweep` designs a component class, such as
+:class:`aguaclara.design.plant.Plant`, for every combination of the given
+inputs on a pool of worker processes, and collects the selected outputs into
+a table with one row per design.
+
+Inputs of the component itself are passed to its constructor. Inputs of its
+subcomponents are given by their path, such as ``'etf.floc.hl'``; they are
+assigned after the component is constructed, and the design is then
+completed with :meth:`aguaclara.design.component.Component.update`.
+
+Example:
+    >>> from aguaclara.design.sweep import *
+    >>> from aguaclara.design.plant import Plant
+    >>> designs = sweep(
+    ...     Plant,
+    ...     {'q': [20, 40, 60] * u.L / u.s, 'etf.floc.hl': [35, 40] * u.cm},
+    ...     ['sed.tank_n', 'etf.ent.l'])
+    >>> designs.attrs['units']['etf.ent.l']
+    'inch'
+"""
+from aguaclara.core.units import u
+
+import numpy as np
+import pandas as pd
+import collections
+import itertools
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+# The number of designs that a worker process runs per task, unless given.
+# Larger chunks reduce the cost of sending tasks to the workers, and smaller
+# chunks balance the load better when some designs take longer than others.
+CHUNK_DESIGNS_N = 8
+
+# A Pint quantity as a magnitude and units string, which does not depend on
+# the unit registry and so can be sent between processes.
+_Encoded = collections.namedtuple('_Encoded', ['magnitude', 'units'])
+
+
+def encode(value):
+    """Encode a design input or output so that it can be sent to a worker
+    process. Pint quantities are encoded as their magnitude and units, and
+    other values are unchanged.
+    """
+    if isinstance(value, u.Quantity):
+        return _Encoded(value.magnitude, str(value.units))
+    return value
+
+
+def decode(value):
+    """Return the value of a design input or output encoded by
+    :func:`encode`.
+    """
+    if isinstance(value, _Encoded):
+        return u.Quantity(value.magnitude, value.units)
+    return value
+
+
+def _get_path(component, path):
+    """Return the attribute of a component given by a dotted path."""
+    for name in path.split('.'):
+        component = getattr(component, name)
+    return component
+
+
+def _design(component_class, point, outputs, convert=encode):
+    """Design a component for one grid point and return its outputs, each
+    converted with ``convert``.
+    """
+    kwargs = {}
+    assignments = []
+    for path, value in point.items():
+        value = decode(value)
+        if '.' in path:
+            assignments.append((path, value))
+        else:
+            kwargs[path] = value
+    component = component_class(**kwargs)
+    if assignments:
+        for path, value in assignments:
+            owner, name = path.rsplit('.', 1)
+            setattr(_get_path(component, owner), name, value)
+        component.update()
+    return [convert(_get_path(component, path)) for path in outputs]
+
+
+def design_chunk(component_class, points, outputs, convert=encode):
+    """Design a component for each of a list of grid points, such as on a
+    worker process.
+
+    Args:
+        - ``component_class (type)``: The Component subclass to design
+        - ``points (list)``: The design inputs of each design, by path, each
+          encoded with :func:`encode`
+        - ``outputs (list)``: The paths of the properties to return
+
+    Keyword Args:
+        - ``convert (function)``: Converts each output before it is returned
+          (optional, defaults to :func:`encode`)
+
+    Returns:
+        ``list``: For each point, either ``(outputs, None)`` or, if the
+        design raised an exception, ``(None, message)``.
+    """
+    results = []
+    for point in points:
+        try:
+            results.append((_design(component_class, point, outputs,
+                                    convert), None))
+        except Exception as e:
+            results.append((None, '{}: {}'.format(type(e).__name__, e)))
+    return results
+
+
+def _values(values):
+    """Return the values of one input of a grid as a list."""
+    if isinstance(values, u.Quantity):
+        if np.ndim(values.magnitude) == 0:
+            return [values]
+        return [magnitude * values.units for magnitude in values.magnitude]
+    if isinstance(values, (list, tuple, range, np.ndarray)):
+        return list(values)
+    return [values]
+
+
+def _column(values):
+    """Convert the values of one input or output to the magnitudes of a table
+    column, in the units of its first quantity. Missing values become NaN.
+
+    Returns the magnitudes and the units (or None if there are no quantities).
+    """
+    units = next((value.units for value in values
+                  if isinstance(value, _Encoded)), None)
+    column = []
+    for value in values:
+        if value is None:
+            value = np.nan
+        elif isinstance(value, _Encoded):
+            value = decode(value).to(units).magnitude
+        column.append(value)
+    return column, units
+
+
+def sweep(component_class, grid, outputs, processes=None, chunksize=None):
+    """Design a component for every combination of a grid of design inputs.
+
+    The designs are run in chunks on a pool of worker processes. A design
+    that raises an exception does not stop the sweep; its outputs are NaN and
+    its ``error`` is the exception message.
+
+    Args:
+        - ``component_class (type)``: The Component subclass to design, such
+          as ``Plant``
+        - ``grid (dict)``: The values of each design input to sweep over, by
+          input name. Inputs of subcomponents are given by their path, such as
+          ``'etf.floc.hl'``. Values may be a list or a Pint array.
+        - ``outputs (list)``: The paths of the properties to collect, such as
+          ``'sed.tank_n'``
+
+    Keyword Args:
+        - ``processes (int)``: The number of worker processes (optional,
+          defaults to the number of CPUs). If 1, the designs are run in this
+          process.
+        - ``chunksize (int)``: The number of designs per worker task
+          (optional, defaults to ``CHUNK_DESIGNS_N``)
+
+    Returns:
+        ``pandas.DataFrame``: One row per grid point, with a column for each
+        input, each output, and ``error``. Quantities are stored as
+        magnitudes; the units of each column are in ``attrs['units']``.
+    """
+    names = list(grid)
+    points = [
+        dict(zip(names, (encode(value) for value in values)))
+        for values in itertools.product(*(_values(grid[name])
+                                          for name in names))]
+    if chunksize is None:
+        chunksize = CHUNK_DESIGNS_N
+    chunks = [points[i:i + chunksize]
+              for i in range(0, len(points), chunksize)]
+    if processes is None:
+        processes = min(os.cpu_count() or 1, len(chunks))
+
+    if processes <= 1 or len(chunks) <= 1:
+        chunk_results = [design_chunk(component_class, chunk, outputs)
+                         for chunk in chunks]
+    else:
+        with ProcessPoolExecutor(max_workers=processes) as executor:
+            chunk_results = list(executor.map(
+                design_chunk, itertools.repeat(component_class),
+                chunks, itertools.repeat(outputs)))
+    results = [result for chunk in chunk_results for result in chunk]
+
+    columns = {}
+    units = {}
+    for name in names:
+        columns[name], units[name] = _column([point[name]
+                                              for point in points])
+    for i, path in enumerate(outputs):
+        columns[path], units[path] = _column([
+            None if values is None else values[i]
+            for values, _ in results])
+    columns['error'] = [error for _, error in results]
+
+    table = pd.DataFrame(columns, columns=names + list(outputs) + ['error'])
+    table.attrs['units'] = {name: units for name, units in units.items()
+                            if units is not None}
+    return table
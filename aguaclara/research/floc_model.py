@@ -140,7 +140,7 @@ MOLEC_WEIGHT_ALUMINUM = 0.027 * u.kg / u.mol
 
 ######################## Functions ########################
 # @u.wraps(u.kg/u.m**3, None, False)
-@ut.list_handler()
+@ut.list_handler(broadcast=True)
 def dens_alum_nanocluster(coag):
     """Return the density of the aluminum in the nanocluster.
 
@@ -153,7 +153,7 @@ def dens_alum_nanocluster(coag):
 
 
 # @u.wraps(u.kg/u.m**3, [u.kg/u.m**3, u.degK], False)
-@ut.list_handler()
+@ut.list_handler(broadcast=True)
 def dens_pacl_solution(ConcAluminum, temp):
     """Return the density of the PACl solution.
 
@@ -166,7 +166,7 @@ def dens_pacl_solution(ConcAluminum, temp):
             ).to(u.kg/u.m**3)
 
 
-@ut.list_handler()
+@ut.list_handler(broadcast=True)
 def conc_precipitate(ConcAluminum, coag):
     """Return coagulant precipitate concentration given aluminum dose.
 
@@ -192,27 +192,27 @@ def conc_precipitate(ConcAluminum, coag):
 
 
 # @u.wraps(u.kg/u.m**3, [u.kg/u.m**3, u.kg/u.m**3, None], False)
-@ut.list_handler()
+@ut.list_handler(broadcast=True)
 def conc_floc(ConcAluminum, concClay, coag):
     """Return floc density given aluminum dose, turbidity, and coagulant"""
     return (conc_precipitate(ConcAluminum, coag) + concClay).to(u.kg/u.m**3)
 
 
 # @u.wraps(u.mol/u.m**3, u.kg/u.m**3, False)
-@ut.list_handler()
+@ut.list_handler(broadcast=True)
 def moles_aluminum(ConcAluminum):
     """Return the # of moles aluminum given aluminum concentration."""
     return (ConcAluminum / MOLEC_WEIGHT_ALUMINUM).to(u.mol/u.m**3)
 
 
 # @u.wraps(u.m, u.kg/u.m**3, False)
-@ut.list_handler()
+@ut.list_handler(broadcast=True)
 def sep_dist_aluminum(ConcAluminum):
     """Return the separation distance between aluminum molecules."""
     return ((1 / (NUM_AVOGADRO / u.mol * moles_aluminum(ConcAluminum)))**(1/3)).to(u.m)
 
 
-@ut.list_handler()
+@ut.list_handler(broadcast=True)
 def particle_number_concentration(ConcMat, material):
     """Return the number of particles in suspension.
 
@@ -225,7 +225,7 @@ def particle_number_concentration(ConcMat, material):
 
 
 # @u.wraps(u.m, [u.kg/u.m**3, u.m], False)
-@ut.list_handler()
+@ut.list_handler(broadcast=True)
 def sep_dist_clay(ConcClay, material):
     """Return the separation distance between clay particles."""
     return (((material.Density/ConcClay)
@@ -233,14 +233,14 @@ def sep_dist_clay(ConcClay, material):
 
 
 # @u.wraps(1/u.m**3, [u.kg/u.m**3, None], False)
-@ut.list_handler()
+@ut.list_handler(broadcast=True)
 def num_nanoclusters(ConcAluminum, coag):
     """Return the number of Aluminum nanoclusters."""
     return (ConcAluminum / (dens_alum_nanocluster(coag)
                             * np.pi * coag.Diameter**3)).to(1/u.m**3)
 
 
-@ut.list_handler()
+@ut.list_handler(broadcast=True)
 def frac_vol_floc_initial(ConcAluminum, ConcClay, coag, material):
     """Return the volume fraction of flocs initially present, accounting for both suspended particles and coagulant precipitates.
 
@@ -261,26 +261,26 @@ def frac_vol_floc_initial(ConcAluminum, ConcClay, coag, material):
 
 
 ####################### p functions #######################
-@ut.list_handler()
+@ut.list_handler(broadcast=True)
 def p(C, C0=1):
     return -np.log10(C/C0)
 
 
-@ut.list_handler()
+@ut.list_handler(broadcast=True)
 def invp(pC, C0=1):
     return C0 * 10**-pC
 
 
 #################### Fractal functions ####################
 # @u.wraps(u.m, [u.dimensionless, u.m, u.dimensionless], False)
-@ut.list_handler()
+@ut.list_handler(broadcast=True)
 def diam_fractal(DIM_FRACTAL, DiamInitial, NumCol):
     """Return the diameter of a floc given NumCol doubling collisions."""
     return (DiamInitial * 2**(NumCol / DIM_FRACTAL)).to(u.m)
 
 
 # @u.wraps(None, [u.dimensionless, None, u.m], False)
-@ut.list_handler()
+@ut.list_handler(broadcast=True)
 def num_coll_reqd(DIM_FRACTAL, material, DiamTarget):
     """Return the number of doubling collisions required.
 
@@ -292,7 +292,7 @@ def num_coll_reqd(DIM_FRACTAL, material, DiamTarget):
 
 # @u.wraps(u.m, [u.kg/u.m**3, u.kg/u.m**3, None, None,
                # u.dimensionless, u.m], False)
-@ut.list_handler()
+@ut.list_handler(broadcast=True)
 def sep_dist_floc(ConcAluminum, ConcClay, coag, material,
                   DIM_FRACTAL, DiamTarget):
     """Return separation distance as a function of floc size."""
@@ -307,7 +307,7 @@ def sep_dist_floc(ConcAluminum, ConcClay, coag, material,
 
 # @u.wraps(u.m, [u.kg/u.m**3, u.kg/u.m**3, None, u.dimensionless,
 #                None, u.m], False)
-@ut.list_handler()
+@ut.list_handler(broadcast=True)
 def frac_vol_floc(ConcAluminum, ConcClay, coag, DIM_FRACTAL,
                   material, DiamTarget):
     """Return the floc volume fraction."""
@@ -317,7 +317,7 @@ def frac_vol_floc(ConcAluminum, ConcClay, coag, DIM_FRACTAL,
 
 
 # @u.wraps(u.kg/u.m**3, [u.kg/u.m**3, u.kg/u.m**3, None, None], False)
-@ut.list_handler()
+@ut.list_handler(broadcast=True)
 def dens_floc_init(ConcAluminum, ConcClay, coag, material):
     """Return the density of the initial floc.
 
@@ -330,7 +330,7 @@ def dens_floc_init(ConcAluminum, ConcClay, coag, material):
 
 #################### Flocculation Model ####################
 # @u.wraps(None, u.m, False)
-@ut.list_handler()
+@ut.list_handler(broadcast=True)
 def ratio_clay_sphere(RatioHeightDiameter):
     """Return the surface area to volume ratio for clay.
 
@@ -339,7 +339,7 @@ def ratio_clay_sphere(RatioHeightDiameter):
     return ((1/2 + RatioHeightDiameter) * (2 / (3*RatioHeightDiameter))**(2/3))*u.dimensionless
 
 
-@ut.list_handler()
+@ut.list_handler(broadcast=True)
 def ratio_area_clay_total(ConcClay, material, DiamTube, RatioHeightDiameter):
     """Return the surface area of clay normalized by total surface area.
 
@@ -370,7 +370,7 @@ def ratio_area_clay_total(ConcClay, material, DiamTube, RatioHeightDiameter):
             ).to(u.dimensionless)
 
 
-@ut.list_handler()
+@ut.list_handler(broadcast=True)
 def gamma_coag(ConcClay, ConcAluminum, coag, material,
                DiamTube, RatioHeightDiameter):
     """Return the coverage of clay with nanoglobs.
@@ -409,7 +409,7 @@ def gamma_coag(ConcClay, ConcAluminum, coag, material,
 
 
 # @u.wraps(None, [u.kg/u.m**3, u.kg/u.m**3, None, None], False)
-@ut.list_handler()
+@ut.list_handler(broadcast=True)
 def gamma_humic_acid_to_coag(ConcAl, ConcNatOrgMat, NatOrgMat, coag):
     """Return the fraction of the coagulant that is coated with humic acid.
 
@@ -425,7 +425,7 @@ def gamma_humic_acid_to_coag(ConcAl, ConcNatOrgMat, NatOrgMat, coag):
     :return: fraction of the coagulant that is coated with humic acid
     :rtype: float
     """
-    return (min(((ConcNatOrgMat / conc_precipitate(ConcAl, coag))
+    return (np.minimum(((ConcNatOrgMat / conc_precipitate(ConcAl, coag))
                  * (coag.Density / NatOrgMat.Density)
                  * (coag.Diameter / (4 * NatOrgMat.Diameter))
                  ),
@@ -434,7 +434,7 @@ def gamma_humic_acid_to_coag(ConcAl, ConcNatOrgMat, NatOrgMat, coag):
 
 # @u.wraps(None, [u.m, u.kg/u.m**3, u.kg/u.m**3, u.kg/u.m**3, None,
 #                 None, None, u.dimensionless], False)
-@ut.list_handler()
+@ut.list_handler(broadcast=True)
 def pacl_term(DiamTube, ConcClay, ConcAl, ConcNatOrgMat, NatOrgMat,
               coag, material, RatioHeightDiameter):
     """Return the fraction of the surface area that is covered with coagulant
@@ -469,7 +469,7 @@ def pacl_term(DiamTube, ConcClay, ConcAl, ConcNatOrgMat, NatOrgMat,
 
 # @u.wraps(None, [u.m, u.kg/u.m**3, u.kg/u.m**3, u.kg/u.m**3,
 #                 None, None, None, u.dimensionless], False)
-@ut.list_handler()
+@ut.list_handler(broadcast=True)
 def alpha_pacl_clay(DiamTube, ConcClay, ConcAl, ConcNatOrgMat,
                     NatOrgMat, coag, material, RatioHeightDiameter):
     """"""
@@ -481,7 +481,7 @@ def alpha_pacl_clay(DiamTube, ConcClay, ConcAl, ConcNatOrgMat,
 
 # @u.wraps(None, [u.m, u.kg/u.m**3, u.kg/u.m**3, u.kg/u.m**3,
 #                 None, None, None, u.dimensionless], False)
-@ut.list_handler()
+@ut.list_handler(broadcast=True)
 def alpha_pacl_pacl(DiamTube, ConcClay, ConcAl, ConcNatOrgMat,
                     NatOrgMat, coag, material, RatioHeightDiameter):
     """"""
@@ -492,7 +492,7 @@ def alpha_pacl_pacl(DiamTube, ConcClay, ConcAl, ConcNatOrgMat,
 
 # @u.wraps(None, [u.m, u.kg/u.m**3, u.kg/u.m**3, u.kg/u.m**3,
 #                 None, None, None, u.dimensionless], False)
-@ut.list_handler()
+@ut.list_handler(broadcast=True)
 def alpha_pacl_nat_org_mat(DiamTube, ConcClay, ConcAl, ConcNatOrgMat,
                            NatOrgMat, coag, material, RatioHeightDiameter):
     """"""
@@ -506,7 +506,7 @@ def alpha_pacl_nat_org_mat(DiamTube, ConcClay, ConcAl, ConcNatOrgMat,
 
 # @u.wraps(None, [u.m, u.kg/u.m**3, u.kg/u.m**3, u.kg/u.m**3,
 #                 None, None, None, u.dimensionless], False)
-@ut.list_handler()
+@ut.list_handler(broadcast=True)
 def alpha(DiamTube, ConcClay, ConcAl, ConcNatOrgMat,
           NatOrgMat, coag, material, RatioHeightDiameter):
     """"""
@@ -523,7 +523,7 @@ def alpha(DiamTube, ConcClay, ConcAl, ConcNatOrgMat,
 # @u.wraps(None, [u.W/u.kg, u.degK, u.s, u.m,
 #                 u.kg/u.m**3, u.kg/u.m**3, u.kg/u.m**3, None,
 #                 None, None, u.dimensionless, u.dimensionless], False)
-@ut.list_handler()
+@ut.list_handler(broadcast=True)
 def pc_viscous(EnergyDis, Temp, Time, DiamTube,
                ConcClay, ConcAl, ConcNatOrgMat, NatOrgMat,
                coag, material, FittingParam, RatioHeightDiameter):
@@ -544,7 +544,7 @@ def pc_viscous(EnergyDis, Temp, Time, DiamTube,
 
 # @u.wraps(u.kg/u.m**3, [u.kg/u.m**3, u.kg/u.m**3, u.dimensionless, u.m,
 #                        None, None, u.degK], False)
-@ut.list_handler()
+@ut.list_handler(broadcast=True)
 def dens_floc(ConcAl, ConcClay, DIM_FRACTAL, DiamTarget, coag, material, Temp):
     """Calculate floc density as a function of size."""
     WaterDensity = pc.density_water(Temp)
@@ -558,7 +558,7 @@ def dens_floc(ConcAl, ConcClay, DIM_FRACTAL, DiamTarget, coag, material, Temp):
 
 # @u.wraps(u.m/u.s, [u.kg/u.m**3, u.kg/u.m**3, None, None, u.dimensionless,
 #                    u.m, u.degK], False)
-@ut.list_handler()
+@ut.list_handler(broadcast=True)
 def vel_term_floc(ConcAl, ConcClay, coag, material, DIM_FRACTAL,
                   DiamTarget, Temp):
     """Calculate floc terminal velocity."""
@@ -577,7 +577,7 @@ def vel_term_floc(ConcAl, ConcClay, coag, material, DIM_FRACTAL,
 
 # @u.wraps(u.m, [u.kg/u.m**3, u.kg/u.m**3, None, None,
 #                u.dimensionless, u.m/u.s, u.degK], False)
-@ut.list_handler()
+@ut.list_handler(broadcast=True)
 def diam_floc_vel_term(ConcAl, ConcClay, coag, material,
                        DIM_FRACTAL, VelTerm, Temp):
     """Calculate floc diamter as a function of terminal velocity."""
@@ -600,7 +600,7 @@ def diam_floc_vel_term(ConcAl, ConcClay, coag, material,
 # @u.wraps(u.s, [u.W/u.kg, u.degK, u.kg/u.m**3, u.kg/u.m**3, None, None,
 #                u.m, u.m, u.dimensionless, u.dimensionless],
 #          False)
-@ut.list_handler()
+@ut.list_handler(broadcast=True)
 def time_col_laminar(EnergyDis, Temp, ConcAl, ConcClay, coag, material,
                      DiamTarget, DiamTube, DIM_FRACTAL, RatioHeightDiameter):
     """Calculate single collision time for laminar flow mediated collisions.
@@ -620,7 +620,7 @@ def time_col_laminar(EnergyDis, Temp, ConcAl, ConcClay, coag, material,
 
 # @u.wraps(u.s, [u.W/u.kg, u.kg/u.m**3, u.kg/u.m**3, None, None,
 #                u.m, u.dimensionless], False)
-@ut.list_handler()
+@ut.list_handler(broadcast=True)
 def time_col_turbulent(EnergyDis, ConcAl, ConcClay, coag, material,
                        DiamTarget, DIM_FRACTAL):
     """Calculate single collision time for turbulent flow mediated collisions.
@@ -636,20 +636,20 @@ def time_col_turbulent(EnergyDis, ConcAl, ConcClay, coag, material,
 ########### Kolmogorov and viscous length scales ###########
 
 # @u.wraps(u.m, [u.W/u.kg, u.degK], False)
-@ut.list_handler()
+@ut.list_handler(broadcast=True)
 def eta_kolmogorov(EnergyDis, Temp):
     return (((pc.viscosity_kinematic_water(Temp) ** 3) / EnergyDis) ** (1 / 4)).to(u.m)
 
 
 # @u.wraps(u.m, [u.W/u.kg, u.degK], False)
-@ut.list_handler()
+@ut.list_handler(broadcast=True)
 def lambda_vel(EnergyDis, Temp):
     return (RATIO_KOLMOGOROV * eta_kolmogorov(EnergyDis, Temp)).to(u.m)
 
 
 # @u.wraps(u.m, [u.W/u.kg, u.degK, u.kg/u.m**3, u.kg/u.m**3, None, None,
 #                u.dimensionless], False)
-@ut.list_handler()
+@ut.list_handler(broadcast=True)
 def diam_kolmogorov(EnergyDis, Temp, ConcAl, ConcClay, coag, material,
                     DIM_FRACTAL):
     """Return the size of the floc with separation distances equal to
@@ -666,7 +666,7 @@ def diam_kolmogorov(EnergyDis, Temp, ConcAl, ConcClay, coag, material,
 
 # @u.wraps(u.m, [u.W/u.kg, u.degK, u.kg/u.m**3, u.kg/u.m**3, None, None,
 #                u.dimensionless], False)
-@ut.list_handler()
+@ut.list_handler(broadcast=True)
 def diam_vel(EnergyDis, Temp, ConcAl, ConcClay, coag, material, DIM_FRACTAL):
     return (material.Diameter
             * ((lambda_vel(EnergyDis, Temp) / material.Diameter)
@@ -678,7 +678,7 @@ def diam_vel(EnergyDis, Temp, ConcAl, ConcClay, coag, material, DIM_FRACTAL):
 
 
 # @u.wraps(u.m, u.W/u.kg, False)
-@ut.list_handler()
+@ut.list_handler(broadcast=True)
 def diam_floc_max(epsMax):
     """
     .. deprecated:: 0.1.13
@@ -705,7 +705,7 @@ def diam_floc_max(epsMax):
 
 
 # @u.wraps(u.W/u.kg, u.m, False)
-@ut.list_handler()
+@ut.list_handler(broadcast=True)
 def ener_dis_diam_floc(Diam):
     """
     .. deprecated:: 0.1.13
@@ -722,20 +722,20 @@ def ener_dis_diam_floc(Diam):
 ##### Velocity gradient in tubing for lab scale laminar flow flocculators #####
 
 # @u.wraps(1/u.s, [u.m**3/u.s, u.m], False)
-@ut.list_handler()
+@ut.list_handler(broadcast=True)
 def g_straight(PlantFlow, IDTube):
     return (64 * PlantFlow / (3 * np.pi * IDTube**3)).to(1/u.s)
 
 
 # @u.wraps(None, [u.m**3/u.s, u.m, u.degK], False)
-@ut.list_handler()
+@ut.list_handler(broadcast=True)
 def reynolds_rapid_mix(PlantFlow, IDTube, Temp):
     return (4 * PlantFlow / (np.pi * IDTube
                              * pc.viscosity_kinematic_water(Temp))).to(u.dimensionless)
 
 
 # @u.wraps(None, [u.m**3/u.s, u.m, u.m, u.degK], False)
-@ut.list_handler()
+@ut.list_handler(broadcast=True)
 def dean_number(PlantFlow, IDTube, RadiusCoil, Temp):
     """Return the Dean Number.
 
@@ -750,7 +750,7 @@ def dean_number(PlantFlow, IDTube, RadiusCoil, Temp):
 
 
 # @u.wraps(1/u.s, [u.m**3/u.s, u.m, u.m, u.degK], False)
-@ut.list_handler()
+@ut.list_handler(broadcast=True)
 def g_coil(FlowPlant, IDTube, RadiusCoil, Temp):
     """We need a reference for this.
 
@@ -765,14 +765,14 @@ def g_coil(FlowPlant, IDTube, RadiusCoil, Temp):
 
 
 # @u.wraps(u.s, [u.m, u.m, u.m**3/u.s], False)
-@ut.list_handler()
+@ut.list_handler(broadcast=True)
 def time_res_tube(IDTube, LengthTube, FlowPlant):
     """Calculate residence time in the flocculator."""
     return (LengthTube * np.pi * (IDTube**2 / 4) / FlowPlant).to(u.s)
 
 
 # @u.wraps(None, [u.m**3/u.s, u.m, u.m, u.m, u.degK], False)
-@ut.list_handler()
+@ut.list_handler(broadcast=True)
 def g_time_res(FlowPlant, IDTube, RadiusCoil, LengthTube, Temp):
     """G Residence Time calculated for a coiled tube flocculator."""
     return (g_coil(FlowPlant, IDTube, RadiusCoil, Temp)
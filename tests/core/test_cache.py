@@ -1,4 +1,10 @@
-from aguaclara.core.cache import ac_cache, HashableObject
+import threading
+import time
+
+import numpy as np
+
+from aguaclara.core.cache import ac_cache, ac_hash, HashableObject
+from aguaclara.core.units import u
 
 
 class ComputedObject(HashableObject):
@@ -60,3 +66,80 @@ def test_ac_cache():
     assert 6 == side_effect_n_calls
     assert 25 == my_computed_object.sum_with_kwarg(my_arg=15)
     assert 7 == side_effect_n_calls
+
+
+def test_ac_cache_lru_eviction():
+    calls = []
+
+    @ac_cache(maxsize=2)
+    def double(x):
+        calls.append(x)
+        return 2 * x
+
+    double(1)
+    double(2)
+    double(1)
+    double(3)  # evicts 2, the least recently used
+    double(1)
+    assert calls == [1, 2, 3]
+    double(2)
+    assert calls == [1, 2, 3, 2]
+    info = double.cache_info()
+    assert (info.hits, info.misses, info.evictions) == (2, 4, 2)
+    assert info.currsize == 2
+    double.cache_clear()
+    assert double.cache_info().currsize == 0
+
+
+def test_ac_cache_ttl():
+    calls = []
+
+    @ac_cache(ttl=0.05)
+    def identity(x):
+        calls.append(x)
+        return x
+
+    identity(1)
+    identity(1)
+    assert calls == [1]
+    time.sleep(0.1)
+    identity(1)
+    assert calls == [1, 1]
+    assert identity.cache_info().evictions == 1
+
+
+def test_ac_hash_quantities():
+    assert ac_hash(1 * u.m) == ac_hash(100 * u.cm)
+    assert ac_hash(1 * u.m) != ac_hash(1 * u.s)
+    assert ac_hash(1) != ac_hash(1.0)
+    assert ac_hash(np.array([1, 2]) * u.m) == ac_hash(np.array([100, 200]) * u.cm)
+    assert ac_hash(np.array([1., 2.])) != ac_hash(np.array([1., 3.]))
+
+
+def test_ac_cache_copies_arrays():
+    @ac_cache
+    def ones(n):
+        return np.ones(n) * u.m
+
+    first = ones(3)
+    first[0] = 5 * u.m
+    assert ones(3)[0] == 1 * u.m
+
+
+def test_ac_cache_threads():
+    @ac_cache(maxsize=10)
+    def square(x):
+        return x ** 2
+
+    def work():
+        for i in range(200):
+            assert square(i % 20) == (i % 20) ** 2
+
+    threads = [threading.Thread(target=work) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    info = square.cache_info()
+    assert info.hits + info.misses == 1600
+    assert info.currsize <= 10
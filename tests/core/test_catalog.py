@@ -0,0 +1,89 @@
+import os
+import shutil
+import tempfile
+import unittest
+
+import numpy as np
+import pandas as pd
+
+from aguaclara.core import catalog
+
+
+class CatalogTest(unittest.TestCase):
+
+    def setUp(self):
+        self.dir = tempfile.mkdtemp()
+        self.path = os.path.join(self.dir, 'table.csv')
+        with open(self.path, 'w') as f:
+            f.write('size,id,Used,name\n1,0.5,1,a\n2,1.5,0,b\n')
+
+    def tearDown(self):
+        catalog.clear()
+        shutil.rmtree(self.dir)
+
+    def test_databases_match_pandas(self):
+        for path in (catalog.PIPE_DATABASE_PATH,
+                     catalog.DESIGN_PIPE_DATABASE_PATH,
+                     catalog.FITTING_DATABASE_PATH):
+            table = catalog.load_table(path)
+            # load_table rounds floats correctly, as float() does, which the
+            # default pandas parser does not.
+            df = pd.read_csv(path, float_precision='round_trip')
+            self.assertEqual(list(table), list(df.columns))
+            for column in df.columns:
+                np.testing.assert_array_equal(table[column], df[column])
+
+    def test_load_once(self):
+        table = catalog.load_table(self.path)
+        self.assertIs(catalog.load_table(self.path), table)
+        self.assertEqual(table['size'].dtype, np.int64)
+        self.assertEqual(table['id'].dtype, float)
+        self.assertEqual(list(table['name']), ['a', 'b'])
+        self.assertFalse(table['id'].flags.writeable)
+
+    def test_binary_cache_off(self):
+        self.addCleanup(setattr, catalog, 'USE_BINARY_CACHE',
+                        catalog.USE_BINARY_CACHE)
+        catalog.USE_BINARY_CACHE = False
+        catalog.load_table(self.path)
+        self.assertEqual(os.listdir(self.dir), ['table.csv'])
+
+    def test_binary_cache(self):
+        cache_dir = os.path.join(self.dir, 'cache')
+        self.addCleanup(setattr, catalog, 'USE_BINARY_CACHE',
+                        catalog.USE_BINARY_CACHE)
+        self.addCleanup(setattr, catalog, 'BINARY_CACHE_DIR',
+                        catalog.BINARY_CACHE_DIR)
+        catalog.USE_BINARY_CACHE = True
+        catalog.BINARY_CACHE_DIR = cache_dir
+
+        catalog.load_table(self.path)
+        self.assertEqual(sorted(os.listdir(self.dir)), ['cache', 'table.csv'])
+        cache_path, = (os.path.join(cache_dir, name)
+                       for name in os.listdir(cache_dir))
+
+        # The binary cache is used while the CSV file is unchanged.
+        catalog.clear()
+        with np.load(cache_path) as data:
+            arrays = dict(data)
+        arrays['column_1'] = np.array([9., 9.])
+        np.savez(cache_path, **arrays)
+        np.testing.assert_array_equal(catalog.load_table(self.path)['id'],
+                                      [9, 9])
+
+        # A changed CSV file invalidates the binary cache.
+        catalog.clear()
+        with open(self.path, 'a') as f:
+            f.write('3,2.5,1,c\n')
+        np.testing.assert_array_equal(catalog.load_table(self.path)['id'],
+                                      [0.5, 1.5, 2.5])
+
+    def test_pipe_catalog_shared(self):
+        self.assertIs(catalog.pipe_catalog(), catalog.pipe_catalog())
+        self.assertIsNot(
+            catalog.pipe_catalog(),
+            catalog.pipe_catalog(catalog.DESIGN_PIPE_DATABASE_PATH))
+
+
+if __name__ == '__main__':
+    unittest.main()
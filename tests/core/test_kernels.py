@@ -0,0 +1,282 @@
+import unittest
+
+import numpy as np
+from scipy import integrate
+
+from aguaclara.core.units import u
+from aguaclara.core import kernels
+from aguaclara.core import physchem as pc
+
+
+class KernelsTest(unittest.TestCase):
+    """Test that the unit-free kernels agree with the Quantity functions."""
+
+    def test_gravity(self):
+        self.assertAlmostEqual(kernels.GRAVITY,
+                               (1 * u.gravity).to(u.m/u.s**2).magnitude)
+
+    def test_scalar_results(self):
+        for result in [kernels.re_pipe(0.012, 0.1, 1e-6),
+                       kernels.density_water(300),
+                       kernels.density_water(380),
+                       kernels.viscosity_kinematic_water(300)]:
+            self.assertIsInstance(result, np.floating)
+            self.assertEqual(np.ndim(result), 0)
+
+    def test_headloss_pipe(self):
+        """Kernels should match physchem after converting to SI units."""
+        expected = pc.headloss_pipe(20 * u.L/u.s, 6 * u.inch, 10 * u.m,
+                                    1e-6 * u.m**2/u.s, 0.1 * u.mm, 2)
+        actual = kernels.headloss_pipe(0.02, 0.1524, 10, 1e-6, 0.0001, 2)
+        self.assertAlmostEqual(actual, expected.to(u.m).magnitude)
+
+    def test_headloss_pipe_slope(self):
+        """The slope matches a central difference of headloss_pipe in the
+        laminar and turbulent regimes.
+        """
+        flows = np.array([1e-6, 1e-3, 0.02])
+        slopes = kernels.headloss_pipe_slope(flows, 0.1524, 10, 1e-6, 0.0001,
+                                             2)
+        step = flows * 1e-6
+        expected = (kernels.headloss_pipe(flows + step, 0.1524, 10, 1e-6,
+                                          0.0001, 2)
+                    - kernels.headloss_pipe(flows - step, 0.1524, 10, 1e-6,
+                                            0.0001, 2)) / (2 * step)
+        np.testing.assert_allclose(slopes, expected, rtol=1e-6)
+
+    def test_water_properties(self):
+        self.assertAlmostEqual(
+            kernels.viscosity_kinematic_water(300),
+            pc.viscosity_kinematic_water(300 * u.degK).magnitude)
+        self.assertAlmostEqual(kernels.density_water(300),
+                               996.601907542082)
+
+    def test_water_tables(self):
+        """The lookup tables stay within their error bounds of the spline."""
+        from scipy import interpolate
+        spline = interpolate.CubicSpline(*kernels.WATER_DENSITY_TABLE)
+        temps = np.linspace(273.15, 373.15, 10007)
+        self.assertLessEqual(
+            np.abs(kernels.density_water(temps) - spline(temps)).max(),
+            kernels.DENSITY_WATER_TABLE_ERROR)
+        nu = kernels.viscosity_dynamic_water(temps) / spline(temps)
+        self.assertLessEqual(
+            np.abs(kernels.viscosity_kinematic_water(temps) - nu).max(),
+            kernels.VISCOSITY_KINEMATIC_WATER_TABLE_ERROR)
+        # Temperatures outside the tables are extrapolated by the spline.
+        temps = np.array([[260, 300], [380, 290]])
+        self.assertEqual(kernels.density_water(temps).shape, (2, 2))
+        np.testing.assert_allclose(kernels.density_water(temps),
+                                   spline(temps), rtol=1e-9)
+        self.assertAlmostEqual(kernels.density_water(380), spline(380))
+
+    def test_fric_pipe_regimes(self):
+        """Laminar and turbulent elements are evaluated in one call."""
+        q = np.array([1e-6, 0.02])
+        f = kernels.fric_pipe(q, 0.1, 1e-6, 0.0001)
+        self.assertAlmostEqual(f[0], 64 / kernels.re_pipe(q[0], 0.1, 1e-6))
+        self.assertAlmostEqual(
+            f[1], pc.fric_pipe(0.02 * u.m**3/u.s, 0.1 * u.m,
+                               1e-6 * u.m**2/u.s, 0.0001 * u.m).magnitude)
+
+    def test_friction_factor_colebrook(self):
+        """The Colebrook refinement satisfies the Colebrook equation."""
+        re = np.logspace(3, 8, 11)
+        roughness = np.array([[0], [1e-5], [1e-3], [0.05]])
+        f = kernels.friction_factor(re, roughness, Colebrook=True)
+        self.assertEqual(f.shape, (4, 11))
+        turbulent = re >= kernels.RE_TRANSITION_PIPE
+        np.testing.assert_array_equal(f[:, ~turbulent],
+                                      np.broadcast_to(64 / re[~turbulent],
+                                                      (4, 1)))
+        x = 1 / np.sqrt(f[:, turbulent])
+        residual = x + 2 * np.log10(roughness / 3.7
+                                    + 2.51 * x / re[turbulent])
+        np.testing.assert_allclose(residual, 0, atol=1e-9)
+        # Swamee-Jain approximates Colebrook to within a few percent.
+        np.testing.assert_allclose(f, kernels.friction_factor(re, roughness),
+                                   rtol=0.05)
+
+    def test_flow_pipe_broadcast(self):
+        diams = np.array([0.05, 0.1, 0.2])
+        k_minor = np.array([[0], [2]])
+        flows = kernels.flow_pipe(diams, 0.5, 10, 1e-6, 0.0001, k_minor)
+        self.assertEqual(flows.shape, (2, 3))
+        for i, k in enumerate(k_minor[:, 0]):
+            for j, diam in enumerate(diams):
+                expected = pc.flow_pipe(diam * u.m, 0.5 * u.m, 10 * u.m,
+                                        1e-6 * u.m**2/u.s, 0.0001 * u.m, k)
+                self.assertAlmostEqual(flows[i, j], expected.magnitude)
+
+    def test_flow_pipe_newton(self):
+        """flow_pipe solves the total head loss in laminar, transitional and
+        turbulent elements together and reports their iteration counts.
+        """
+        head_losses = np.array([0.01, 0.09, 0.5, 5])
+        k_minor = np.array([[0], [1], [20]])
+        flows, iterations = kernels.flow_pipe(0.01, head_losses, 10, 1e-6, 0,
+                                              k_minor, full_output=True)
+        self.assertEqual(flows.shape, (3, 4))
+        self.assertEqual(iterations.shape, (3, 4))
+        np.testing.assert_array_equal(iterations[0], 0)
+        self.assertTrue(np.all(iterations[1:] > 0))
+        self.assertTrue(np.all(iterations <= kernels.PIPE_SOLVER_MAX_ITERATIONS))
+        # A head loss of 0.09 m falls in the jump of the friction factor at
+        # the transition, so that element converges to the transition flow.
+        self.assertAlmostEqual(flows[1, 1] / kernels.flow_transition(0.01,
+                                                                     1e-6), 1)
+        headloss = kernels.headloss_pipe(flows[1:, [0, 2, 3]], 0.01, 10, 1e-6,
+                                         0, k_minor[1:])
+        np.testing.assert_allclose(
+            headloss, np.broadcast_to(head_losses[[0, 2, 3]], (2, 3)),
+            rtol=1e-9)
+        rough, rough_iterations = kernels.flow_pipe(
+            0.01, head_losses, 10, 1e-6, 0, k_minor, tol=1e-3, maxiter=3,
+            full_output=True)
+        self.assertTrue(np.all(rough_iterations <= 3))
+        np.testing.assert_allclose(rough, flows, rtol=0.2)
+
+    def test_diam_pipe_broadcast(self):
+        flows = np.array([0.005, 0.02, 0.05])
+        diams = kernels.diam_pipe(flows, 0.5, 10, 1e-6, 0.0001, 2)
+        self.assertEqual(diams.shape, (3,))
+        for q, diam in zip(flows, diams):
+            expected = pc.diam_pipe(q * u.m**3/u.s, 0.5 * u.m, 10 * u.m,
+                                    1e-6 * u.m**2/u.s, 0.0001 * u.m, 2)
+            self.assertAlmostEqual(diam, expected.magnitude)
+
+    def test_diam_pipe_warm_start(self):
+        """diam_pipe solves the total head loss, and warm starts along the
+        last axis give the same diameters in fewer iterations.
+        """
+        flows = np.linspace(0.001, 0.1, 200)
+        head_losses = np.array([[0.5], [2]])
+        diams, iterations = kernels.diam_pipe(flows, head_losses, 10, 1e-6,
+                                              0.0001, 2, full_output=True)
+        self.assertEqual(diams.shape, (2, 200))
+        np.testing.assert_allclose(
+            kernels.headloss_pipe(flows, diams, 10, 1e-6, 0.0001, 2),
+            np.broadcast_to(head_losses, (2, 200)), rtol=1e-9)
+        warm, warm_iterations = kernels.diam_pipe(
+            flows, head_losses, 10, 1e-6, 0.0001, 2, warm_start=True,
+            full_output=True)
+        np.testing.assert_allclose(warm, diams, rtol=1e-9)
+        self.assertLess(warm_iterations.mean(), iterations.mean())
+        guessed, guessed_iterations = kernels.diam_pipe(
+            flows, head_losses, 10, 1e-6, 0.0001, 2, guess=diams * 1.001,
+            full_output=True)
+        np.testing.assert_allclose(guessed, diams, rtol=1e-9)
+        self.assertLessEqual(guessed_iterations.max(), 3)
+        # Elements without minor losses use the closed-form diameter.
+        diam, count = kernels.diam_pipe(0.02, 0.5, 10, 1e-6, 0.0001, 0,
+                                        full_output=True)
+        self.assertEqual(count, 0)
+        self.assertEqual(diam, kernels.diam_major_pipe(0.02, 0.5, 10, 1e-6,
+                                                       0.0001))
+
+    def test_manifold_id(self):
+        """manifold_id converges to the fixed point for arrays of inputs and
+        reports the elements that reach the iteration cap.
+        """
+        flows = np.linspace(0.001, 0.1, 5)
+        head_losses = np.array([[0.01], [0.05]])
+        diams, iterations, converged = kernels.manifold_id(
+            flows, head_losses, 0.8, 20, 1e-6, 1e-5, full_output=True)
+        self.assertEqual(diams.shape, (2, 5))
+        self.assertTrue(np.all(converged))
+        self.assertTrue(np.all(iterations <= 3))
+        np.testing.assert_allclose(
+            kernels._manifold_id_map(diams, flows, head_losses, 0.8, 20,
+                                     1e-6, 1e-5),
+            diams, rtol=1e-9)
+        capped, capped_iterations, capped_converged = kernels.manifold_id(
+            flows, head_losses, 0.8, 20, 1e-6, 1e-5, guess=0.0508, maxiter=1,
+            full_output=True)
+        np.testing.assert_array_equal(capped_iterations, 1)
+        self.assertFalse(np.any(capped_converged))
+        np.testing.assert_allclose(capped, diams, rtol=0.05)
+
+    def test_horiz_chan_w(self):
+        """horiz_chan_w solves arrays of channels to the tolerance and
+        reports the iteration counts.
+        """
+        flows = np.linspace(0.001, 0.1, 6)
+        depths = np.array([[0.5], [1.5]])
+        widths, iterations, converged = kernels.horiz_chan_w(
+            flows, depths, 0.02, 5, 1e-6, 1e-4, True, 1.5, full_output=True)
+        self.assertEqual(widths.shape, (2, 6))
+        self.assertTrue(np.all(converged))
+        self.assertTrue(np.all(iterations <= 15))
+        residual = kernels._horiz_chan_w_residual(
+            widths, flows, depths - 0.02, 0.02, 5, 1e-6, 1e-4, 1, 1.5)
+        np.testing.assert_allclose(residual / widths, 0, atol=1e-9)
+        expected = pc.horiz_chan_w(0.1 * u.m**3/u.s, 1.5 * u.m, 0.02 * u.m,
+                                   5 * u.m, 1e-6 * u.m**2/u.s, 1e-4 * u.m,
+                                   True, 1.5)
+        self.assertAlmostEqual(widths[1, 5], expected.magnitude)
+        _, capped, capped_converged = kernels.horiz_chan_w(
+            flows, depths, 0.02, 5, 1e-6, 1e-4, True, 1.5, maxiter=2,
+            full_output=True)
+        np.testing.assert_array_equal(capped, 2)
+        self.assertFalse(np.any(capped_converged))
+
+    def test_horiz_chan_h(self):
+        """horiz_chan_h limits the head loss to a third of the height."""
+        head_losses = np.array([0.01, 0.1, 1])
+        heights, iterations, converged = kernels.horiz_chan_h(
+            0.05, 0.4, head_losses, 5, 1e-6, 1e-4, False, full_output=True)
+        self.assertTrue(np.all(converged))
+        self.assertTrue(np.all(iterations > 0))
+        residual = kernels._horiz_chan_h_residual(
+            heights, 0.05, 0.4, head_losses, 5, 1e-6, 1e-4, 0)
+        np.testing.assert_allclose(residual / heights, 0, atol=1e-9)
+        self.assertLess(heights[2], 3 * head_losses[2])
+
+    def test_pipe_flow_index(self):
+        """pipe_flow_index finds the smallest diameter that carries each
+        flow rate.
+        """
+        diams = np.linspace(0.01, 0.3, 30)
+        flows = np.array([0, 1e-4, 0.01, 0.05, 10])
+        head_losses = np.array([[0.1], [1]])
+        index = kernels.pipe_flow_index(flows, diams, head_losses, 10, 1e-6,
+                                        1e-5, 2)
+        self.assertEqual(index.shape, (2, 5))
+        capacity = kernels.flow_pipe(diams, head_losses, 10, 1e-6, 1e-5, 2)
+        for row in range(2):
+            for col, q in enumerate(flows):
+                expected = np.flatnonzero(q <= capacity[row])
+                expected = expected[0] if expected.size else diams.size
+                self.assertEqual(index[row, col], expected)
+
+    def test_flow_orifice_vert(self):
+        """flow_orifice_vert matches adaptive quadrature at any height."""
+        def flow(diam, height, ratio):
+            radius = diam / 2
+            if height <= -radius:
+                return 0
+            area = integrate.quad(
+                lambda z: 2 * np.sqrt(max(radius**2 - z**2, 0))
+                * np.sqrt(max(height - z, 0)),
+                -radius, min(radius, height), epsabs=0, epsrel=1e-12)[0]
+            return ratio * np.sqrt(2 * kernels.GRAVITY) * area
+
+        diams = np.array([[0.02], [0.1]])
+        heights = np.array([-0.06, -0.04, 0, 0.0105, 0.05, 0.0501, 0.5])
+        actual = kernels.flow_orifice_vert(diams, heights, 0.62)
+        self.assertEqual(actual.shape, (2, 7))
+        expected = [[flow(diam, height, 0.62) for height in heights]
+                    for diam in diams[:, 0]]
+        np.testing.assert_allclose(actual, expected, rtol=1e-12)
+
+    def test_flow_orifice(self):
+        heights = np.array([-0.1, 0, 0.5])
+        flows = kernels.flow_orifice(0.02, heights, 0.63)
+        self.assertEqual(flows[0], 0)
+        self.assertEqual(flows[1], 0)
+        self.assertAlmostEqual(
+            flows[2], pc.flow_orifice(0.02 * u.m, 0.5 * u.m, 0.63).magnitude)
+
+
+if __name__ == "__main__":
+    unittest.main()
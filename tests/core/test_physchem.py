@@ -1,6 +1,7 @@
 # -*- coding: utf-8 -*-
 from aguaclara.core.units import u
 from aguaclara.core import physchem as pc
+from aguaclara.core import pipes as pipe
 from aguaclara.core.physchem import DeprecatedFunctionError
 import unittest
 
@@ -1020,6 +1021,69 @@ class MiscPhysFuncsTest(QuantityTest):
         self.assertAlmostEqualQuantity(pc.pipe_ID(0.006 * u.m**3/u.s, 1.2 * u.m),
                                        0.039682379412712764 * u.m)
 
+    def test_manifold_id(self):
+        """manifold_id should broadcast its inputs and warn if it has not
+        converged.
+        """
+        args = (0.05 * u.m**3/u.s, [0.01, 0.02] * u.m, 5 * u.m, 0.8,
+                1e-6 * u.m**2/u.s, 1e-5 * u.m, 1, 20)
+        diams = pc.manifold_id(*args)
+        self.assertEqual(diams.shape, (2,))
+        self.assertAlmostEqualQuantity(diams[0], 0.4902184647855333 * u.m)
+        self.assertAlmostEqualQuantity(
+            pc.manifold_id(args[0], 0.02 * u.m, *args[2:]), diams[1])
+        with self.assertWarns(UserWarning):
+            pc.manifold_id(args[0], 0.03 * u.m, *args[2:], maxiter=1)
+
+    def test_unconverged_cache_hit(self):
+        """A cached result that did not converge should warn on every call.
+        """
+        args = (0.05 * u.m**3/u.s, 0.04 * u.m, 5 * u.m, 0.8,
+                1e-6 * u.m**2/u.s, 1e-5 * u.m, 1, 20)
+        for _ in range(2):
+            with self.assertWarns(UserWarning):
+                pc.manifold_id(*args, maxiter=1)
+        chan_args = (0.02 * u.m**3/u.s, 0.2 * u.m, 0.01 * u.m, 5 * u.m,
+                     1e-6 * u.m**2/u.s, 1e-4 * u.m, False)
+        for _ in range(2):
+            with self.assertWarns(UserWarning):
+                pc.horiz_chan_w(0.02 * u.m**3/u.s, 1 * u.m, *chan_args[2:],
+                                0, maxiter=1)
+            with self.assertWarns(UserWarning):
+                pc.horiz_chan_h(*chan_args, maxiter=1)
+
+    def test_horiz_chan(self):
+        """horiz_chan_w and horiz_chan_h should broadcast their inputs and
+        be consistent with each other.
+        """
+        flows = [0.02, 0.05] * u.m**3/u.s
+        widths = pc.horiz_chan_w(flows, 1 * u.m, 0.01 * u.m, 5 * u.m,
+                                 1e-6 * u.m**2/u.s, 1e-4 * u.m, True, 0)
+        self.assertEqual(widths.shape, (2,))
+        self.assertAlmostEqualQuantity(widths[1], 0.12212482 * u.m)
+        heights = pc.horiz_chan_h(flows[1], widths[1], 0.01 * u.m, 5 * u.m,
+                                  1e-6 * u.m**2/u.s, 1e-4 * u.m, True)
+        self.assertAlmostEqualQuantity(heights, 1 * u.m)
+        with self.assertWarns(UserWarning):
+            pc.horiz_chan_h(flows[0], 0.2 * u.m, 0.01 * u.m, 5 * u.m,
+                            1e-6 * u.m**2/u.s, 1e-4 * u.m, True, maxiter=1)
+
+    def test_pipe_flow_nd(self):
+        """pipe_flow_nd should return the smallest available pipe that can
+        carry the flow rate.
+        """
+        args = (1 * u.cm, 3.712 * u.m, 1e-6 * u.m**2/u.s,
+                0.0015 * u.mm, 3.3)
+        nds = pc.pipe_flow_nd([4, 6.67] * u.L/u.s, 41, *args)
+        self.assertEqual(list(nds.magnitude), [6, 8])
+        self.assertEqual(nds.units, u.inch)
+        self.assertGreaterEqual(
+            pc.flow_pipe(pipe.ID_SDR(nds[1], 41), *args), 6.67 * u.L/u.s)
+        self.assertLess(
+            pc.flow_pipe(pipe.ID_SDR(6 * u.inch, 41), *args), 6.67 * u.L/u.s)
+        self.assertRaises(ValueError, pc.pipe_flow_nd, 10 * u.m**3/u.s, 41,
+                          *args)
+
 
 if __name__ == "__main__":
     unittest.main()
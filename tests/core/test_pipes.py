@@ -22,3 +22,26 @@ class TestPipes(unittest.TestCase):
         self.assertAlmostEqual(pipes.ND_SDR_available(7.1892857 * u.inch, 35.0), 8.0 * u.inch)
         self.assertAlmostEqual(pipes.ND_available(4.7 * u.inch), 6.0 * u.inch)
 
+    def test_get_pipedb(self):
+        pipedb = pipes.get_pipedb()
+        self.assertIs(pipes.pipedb, pipedb)
+        self.assertEqual(list(pipedb['NDinch'][:2]), [0.125, 0.25])
+
+    def test_pipe_catalog(self):
+        catalog = pipes.catalog
+        self.assertEqual(catalog.od_of_nd(7.0), 7.625)
+        # Halfway between 0.125 and 0.25 inch, the smaller ND is closest.
+        self.assertEqual(catalog.od_of_nd(0.1875), 0.404)
+        self.assertTrue(np.isnan(catalog.nd_available_at_least(1000)))
+
+        ids = np.array([1, 5, 7.1892857]) * u.inch
+        nds = pipes.ND_SDR_available(ids, 35.0)
+        for i, id_ in enumerate(ids):
+            self.assertEqual(nds[i], pipes.ND_SDR_available(id_, 35.0))
+        self.assertIsNone(pipes.ND_SDR_available(1000 * u.inch, 26))
+
+        guesses = np.array([0.1, 4.7, 6]) * u.inch
+        np.testing.assert_array_equal(pipes.ND_available(guesses).magnitude,
+                                      [0.5, 6, 6])
+        self.assertRaises(ValueError, pipes.ND_available, 1000 * u.inch)
+        self.assertRaises(ValueError, pipes.od_available, 1000 * u.inch)
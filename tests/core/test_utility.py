@@ -2,6 +2,7 @@ import unittest
 import aguaclara.core.utility as ut
 from aguaclara.core.units import u
 import numpy as np
+import threading
 
 
 class QuantityTest(unittest.TestCase):
@@ -122,3 +123,108 @@ class UtilityTest(QuantityTest):
 
         answer = np.array([254.647908947, 218.26963624, 190.98593171])
         self.assertAlmostEqualArray(re_pipe(12, [6, 7, 8], 0.01), answer)
+
+    def test_list_handler_broadcast(self):
+        @ut.list_handler(broadcast=True)
+        def density_air(Pressure, MolarMass, Temperature):
+            return (Pressure * MolarMass / (u.R * Temperature)).to(u.kg/u.m**3)
+
+        calls = []
+
+        @ut.list_handler(broadcast=True)
+        def re_pipe(FlowRate, Diam, Nu):
+            calls.append(FlowRate)
+            return ((4 * FlowRate) / (np.pi * Diam * Nu))
+
+        answer = 1.29320768*u.kg/u.m**3
+        self.assertAlmostEqualQuantity(density_air(1*u.atm, 28.97*u.g/u.mol, 273*u.K), answer)
+
+        answer = np.array([[1.29320768, 1.20526777, 1.07134913, 0.89279094],
+                           [2.58641536, 2.41053555, 2.14269826, 1.78558189],
+                           [3.87962304, 3.61580333, 3.21404740, 2.67837283],
+                           [12.93207681, 12.05267773, 10.71349131, 8.92790943]])*u.kg/u.m**3
+        output = density_air([1, 2, 3, 10]*u.atm, [28.97, 27, 24, 20]*u.g/u.mol, 273*u.K)
+        self.assertEqual(output.units, answer.units)
+        for i in range(len(output.magnitude)):
+            self.assertAlmostEqualArray(output.magnitude[i], answer.magnitude[i])
+
+        # Keyword sequences come after positional sequences.
+        output = density_air([1, 2, 3, 10]*u.atm, Temperature=[273, 300]*u.K,
+                             MolarMass=28.97*u.g/u.mol)
+        self.assertEqual(output.shape, (4, 2))
+
+        answer = np.array([254.647908947, 218.26963624, 190.98593171])
+        self.assertAlmostEqualArray(re_pipe(12, [6, 7, 8], 0.01), answer)
+        self.assertEqual(len(calls), 1)
+
+        # Sequences that are constant along an axis are still expanded.
+        output = re_pipe([12, 24], [6, 7, 8], 0.01)
+        self.assertEqual(output.shape, (2, 3))
+        self.assertAlmostEqualArray(output[0], answer)
+
+    def test_list_handler_broadcast_fallback(self):
+        @ut.list_handler(broadcast=True)
+        def area(Diam):
+            return np.pi / 4 * Diam**2
+
+        output = area([1 * u.m, 2 * u.m])
+        answer = np.array([np.pi / 4, np.pi]) * u.m**2
+        self.assertAlmostEqualArrayQuantity(output, answer)
+
+    def test_list_handler_broadcast_nested(self):
+        @ut.list_handler(broadcast=True)
+        def inner(x):
+            return 2 * x
+
+        @ut.list_handler(broadcast=True)
+        def outer(x, y):
+            return inner(x) + y
+
+        output = outer([1, 2, 3], [10, 20])
+        self.assertEqual(output.shape, (3, 2))
+        self.assertEqual(output[2, 1], 26)
+
+    def test_check_range_arrays(self):
+        ut.check_range([np.array([[1, 2], [3, 4]]) * u.m, ">0", "Length"],
+                       [np.array([True, False]), "boolean", "Open"])
+        self.assertRaises(ValueError, ut.check_range,
+                          [np.array([[1, 2], [3, 0]]), ">0", "Length"])
+
+    def test_check_range_first_failure(self):
+        with self.assertRaisesRegex(ValueError, "Length is -2 but must be 0 or greater"):
+            ut.check_range([np.array([1, -2, -3]), ">=0", "Length"])
+        with self.assertRaisesRegex(ValueError, "Input is 2.0 but must be between 0 and 1"):
+            ut.check_range([[0.5, 2.0], "0-1"])
+        with self.assertRaisesRegex(TypeError, "must be a numeric integer"):
+            ut.check_range([[1, 2.5], ">0, int", "Count"])
+        with self.assertRaisesRegex(TypeError, "must be a boolean"):
+            ut.check_range([1, "boolean"])
+        self.assertRaises(RuntimeError, ut.check_range, [1, ">1"])
+        self.assertRaises(TypeError, ut.check_range, [1])
+
+    def test_trusted_inputs(self):
+        self.assertFalse(ut.inputs_trusted())
+        with ut.trusted_inputs():
+            with ut.trusted_inputs():
+                ut.check_range([-1, ">0", "Length"])
+            self.assertTrue(ut.inputs_trusted())
+            ut.check_range([-1, ">0", "Length"])
+        self.assertFalse(ut.inputs_trusted())
+        self.assertRaises(ValueError, ut.check_range, [-1, ">0", "Length"])
+
+    def test_trusted_inputs_thread(self):
+        """Other threads should still validate inside a trusted_inputs block.
+        """
+        errors = []
+
+        def check():
+            try:
+                ut.check_range([-1, ">0", "Length"])
+            except ValueError as e:
+                errors.append(e)
+
+        with ut.trusted_inputs():
+            thread = threading.Thread(target=check)
+            thread.start()
+            thread.join()
+        self.assertEqual(len(errors), 1)
@@ -0,0 +1,71 @@
+from aguaclara.design.batch import design_batch, units_path
+from aguaclara.design.floc import Flocculator
+from aguaclara.design.sed import Sedimentor
+from aguaclara.core.units import u
+
+import json
+import os
+
+import pandas as pd
+import pytest
+
+
+@pytest.fixture
+def sites(tmp_path):
+    path = tmp_path / 'sites.csv'
+    pd.DataFrame({
+        'q': [20, 60, 20, -1, 40],
+        'tank.vel_upflow': [1, 1, 2, None, None],
+    }).to_csv(path, index=False)
+    return str(path)
+
+
+@pytest.mark.parametrize('processes', [1, 2])
+def test_design_batch(sites, tmp_path, processes):
+    output_path = str(tmp_path / 'designs.csv')
+    rows_n = design_batch(
+        Sedimentor, sites, output_path, ['tank_n', 'chan.w_outer'],
+        units={'q': 'L/s', 'tank.vel_upflow': 'mm/s'},
+        processes=processes, chunksize=2)
+    assert rows_n == 5
+
+    designs = pd.read_csv(output_path)
+    assert list(designs.columns) == \
+        ['q', 'tank.vel_upflow', 'tank_n', 'chan.w_outer', 'error']
+    assert list(designs['q']) == [20, 60, 20, -1, 40]
+    assert designs['tank_n'][0] == 4
+    assert designs['tank_n'][2] == 2
+    assert designs['tank_n'][4] == 7
+    with open(units_path(output_path)) as units_file:
+        units = json.load(units_file)
+    assert units['q'] == 'liter / second'
+    assert units['tank.vel_upflow'] == 'millimeter / second'
+    assert 'tank_n' not in units
+    sed = Sedimentor(q=60 * u.L / u.s)
+    assert designs['chan.w_outer'][1] == \
+        pytest.approx(sed.chan.w_outer.m_as(units['chan.w_outer']))
+
+    # A negative flow rate fails the design of only its row.
+    assert designs['tank_n'].isna()[3]
+    assert designs['error'].notna()[3]
+    assert designs['error'].isna().sum() == 4
+
+
+def test_design_batch_format(sites, tmp_path):
+    with pytest.raises(ValueError):
+        design_batch(Flocculator, sites, str(tmp_path / 'designs.txt'),
+                     ['chan_w'], processes=1)
+
+
+def test_design_batch_parquet(sites, tmp_path):
+    pytest.importorskip('pyarrow')
+    input_path = str(tmp_path / 'sites.parquet')
+    pd.read_csv(sites).to_parquet(input_path)
+    output_path = str(tmp_path / 'designs.parquet')
+    design_batch(Sedimentor, input_path, output_path, ['tank_n'],
+                 units={'q': 'L/s', 'tank.vel_upflow': 'mm/s'}, processes=1,
+                 chunksize=2)
+    designs = pd.read_parquet(output_path)
+    assert list(designs['tank_n'][:3]) == [4, 10, 2]
+    assert designs['error'].isna().sum() == 4
+    assert os.path.exists(units_path(output_path))
@@ -0,0 +1,237 @@
+from aguaclara.design.component import Component, uncached_property, \
+    design_step, fixed_point
+from aguaclara.design.cdc import CDC
+from aguaclara.design.ent import EntranceTank
+from aguaclara.design.ent_floc import EntTankFloc
+from aguaclara.design.floc import Flocculator
+from aguaclara.design.lfom import LFOM
+from aguaclara.design.plant import Plant
+from aguaclara.design.sed import Sedimentor
+from aguaclara.design.sed_chan import SedimentationChannel
+from aguaclara.design.sed_tank import SedimentationTank
+from aguaclara.core.units import u
+
+import io
+import json
+import numpy as np
+import pytest
+
+
+class Counter(Component):
+    """A component that counts how often its properties are computed."""
+    def __init__(self, **kwargs):
+        self.a = 1
+        self.b = 2
+        self.calls = {'double_a': 0, 'total': 0}
+        super().__init__(**kwargs)
+
+    @property
+    def double_a(self):
+        self.calls['double_a'] += 1
+        return 2 * self.a
+
+    @property
+    def total(self):
+        self.calls['total'] += 1
+        return self.double_a + self.b
+
+    @uncached_property
+    def volatile(self):
+        return self.calls['total']
+
+
+class Doubler(Component):
+    """A component whose design step assigns an input of its subcomponent."""
+    def __init__(self, **kwargs):
+        self.factor = 2
+        self.counter = Counter()
+        self.subcomponents = [self.counter]
+        super().__init__(**kwargs)
+        self._design_counter()
+
+    @design_step
+    def _design_counter(self):
+        self.counter.b = self.factor * self.counter.double_a
+
+
+def test_property_is_cached():
+    counter = Counter()
+    assert counter.total == 4
+    assert counter.total == 4
+    assert counter.calls == {'double_a': 1, 'total': 1}
+
+
+def test_assignment_invalidates_dependents():
+    counter = Counter(a=3)
+    assert counter.total == 8
+    counter.b = 5
+    assert counter.total == 11
+    assert counter.calls == {'double_a': 1, 'total': 2}
+    counter.a = 1
+    assert counter.total == 7
+    assert counter.calls == {'double_a': 2, 'total': 3}
+
+
+def test_uncached_property():
+    counter = Counter()
+    assert counter.volatile == 0
+    counter.total
+    assert counter.volatile == 1
+
+
+def test_failed_property_is_not_cached():
+    counter = Counter(a='x')
+    with pytest.raises(TypeError):
+        counter.total
+    counter.a = 2
+    assert counter.total == 6
+
+
+def test_clear_cache():
+    counter = Counter()
+    counter.total
+    counter.clear_cache()
+    counter.total
+    assert counter.calls == {'double_a': 2, 'total': 2}
+
+
+def test_read_only_property():
+    with pytest.raises(AttributeError):
+        Counter().total = 1
+
+
+def test_cross_component_dependencies():
+    sed = Sedimentor(q=20 * u.L / u.s)
+    assert sed.tank_n == 4
+    sed.tank.vel_upflow = 2 * sed.tank.vel_upflow
+    assert sed.tank_n == 2
+
+
+def test_update_without_changes():
+    doubler = Doubler()
+    assert doubler.update() == ([], {})
+
+
+def test_update_reruns_dependent_steps():
+    doubler = Doubler()
+    assert doubler.counter.total == 6
+    doubler.counter.a = 2
+    report = doubler.update()
+    assert report.steps == ['_design_counter']
+    assert report.changes == {'counter.b': (4, 8)}
+    assert doubler.counter.total == 12
+    doubler.factor = 3
+    assert doubler.update().changes == {'counter.b': (8, 12)}
+
+
+def test_update_skips_independent_steps():
+    doubler = Doubler()
+    doubler.counter.b = 7
+    assert doubler.update().steps == []
+    assert doubler.counter.total == 9
+
+
+def test_update_matches_new_design():
+    plant = Plant(q=20 * u.L / u.s)
+    plant.etf.floc.hl = 35 * u.cm
+    report = plant.update()
+    assert 'etf._design_ent_floc' in report.steps
+    assert not any(step.startswith('sed') for step in report.steps)
+    assert report.changes['etf.floc.ent_l'][1] == plant.etf.floc.ent_l
+
+    etf = EntTankFloc(q=20 * u.L / u.s, floc=Flocculator(hl=35 * u.cm))
+    assert plant.etf.ent.l == etf.ent.l
+    assert plant.etf.floc.chan_w == etf.floc.chan_w
+    assert plant.update() == ([], {})
+
+
+def test_fixed_point_acceleration():
+    x, info = fixed_point(lambda x: 0.5 * x + 1 * u.m, 10 * u.m, rtol=1e-10)
+    assert x.magnitude == pytest.approx(2)
+    assert x.units == u.m
+    assert info.converged
+    assert info.iterations == 3
+    _, plain = fixed_point(lambda x: 0.5 * x + 1 * u.m, 10 * u.m, rtol=1e-10,
+                           memory=0)
+    assert plain.iterations > 30
+
+
+def test_fixed_point_array():
+    x, info = fixed_point(lambda x: np.cos(x), np.array([0.0, 1.0]),
+                          rtol=1e-12)
+    assert x == pytest.approx([0.7390851332151607] * 2)
+    assert info.converged
+
+
+def test_fixed_point_not_converged():
+    with pytest.warns(UserWarning):
+        x, info = fixed_point(lambda x: -x + 1, 3.0, maxiter=5, memory=0)
+    assert not info.converged
+    assert len(info.residuals) == info.iterations == 5
+
+
+def test_coupled_design_convergence():
+    etf = EntTankFloc(q=60 * u.L / u.s)
+    info = etf.convergence['ent_l']
+    assert info.converged
+    assert info.residuals[-1] <= 0.01
+    assert etf.floc.ent_l.to(u.inch).magnitude == \
+        pytest.approx(etf.ent.l.magnitude, rel=0.01)
+    sed = Sedimentor()
+    assert sed.tank.sed_chan_w_outer == sed.chan.w_outer
+    assert sed.tank.sed_chan_weir_thickness == sed.chan.weir_thickness
+
+
+def test_serialize():
+    counter = Counter()
+    assert counter.serialize() == {
+        'a': 1,
+        'b': 2,
+        'calls': {'double_a': 0, 'total': 0},
+        'double_a': 2,
+        'q': {'magnitude': 20, 'units': 'liter / second'},
+        'temp': {'magnitude': 20, 'units': 'degree_Celsius'},
+        'total': 4,
+        'volatile': 1,
+    }
+    # Each property is evaluated once.
+    assert counter.calls == {'double_a': 1, 'total': 1}
+
+
+def test_serialized_fields():
+    class Total(Counter):
+        SERIALIZED_FIELDS = ['total']
+
+    doubler = Doubler(counter=Total())
+    assert doubler.serialize()['counter'] == {'total': 6}
+
+
+@pytest.mark.parametrize('component_class', [
+    Flocculator, SedimentationTank, SedimentationChannel, LFOM, CDC,
+    EntranceTank, EntTankFloc, Sedimentor, Plant])
+def test_declared_fields(component_class):
+    component = component_class()
+    fields = component_class.SERIALIZED_FIELDS
+    assert list(component.serialize()) == list(fields)
+    assert list(component.serialize_properties()) == list(fields)
+    # Every design input is declared.
+    assert {name for name in vars(component)
+            if not name.startswith('_') and name != 'subcomponents'} <= \
+        set(fields)
+
+
+def test_write_json():
+    plant = Plant()
+    plant.serialize()
+    fp = io.StringIO()
+    plant.write_json(fp)
+    assert json.loads(fp.getvalue()) == plant.serialize()
+    assert plant.serialize()['etf']['floc']['chan_w'] == \
+        {'magnitude': 33, 'units': 'centimeter'}
+
+
+def test_serialize_properties():
+    floc = Flocculator()
+    properties = floc.serialize_properties()
+    assert properties['chan_w'] == str(floc.chan_w)
+    assert 'drain_pipe' in properties
@@ -22,7 +22,7 @@ etf_60 = EntTankFloc(q = 60.0 * u.L / u.s)
     (etf_60.floc.chan_n, 2),
 
     (etf_20.floc.chan_w_min_gt, 32.02195253008654 * u.cm),
-    (etf_60.floc.chan_w_min_gt, 96.24786648922903 * u.cm),
+    (etf_60.floc.chan_w_min_gt, 96.23963458758038 * u.cm),
 
     (etf_20.ent.plate_l, 56 * u.cm),
     (etf_60.ent.plate_l, 58 * u.cm),
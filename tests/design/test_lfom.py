@@ -1,5 +1,7 @@
 from aguaclara.design.lfom import LFOM
 from aguaclara.core.units import u
+import aguaclara.core.constants as con
+import aguaclara.core.physchem as pc
 
 import pytest
 import numpy as np
@@ -79,3 +81,48 @@ def test_error_per_row():
         0.22311742777836815 < 0.01
     assert np.abs(np.average(lfom_60.error_per_row) + 0.32716087383055126) / \
         0.32716087383055126 < 0.01
+
+
+def test_submerged_orifice_q():
+    orifice_q = lfom_20._submerged_orifice_q
+    assert orifice_q.shape == (lfom_20.row_n + 1, lfom_20.row_n)
+    # Only the rows below the water level carry flow.
+    submerged = np.tri(lfom_20.row_n + 1, lfom_20.row_n, -1, dtype=bool)
+    assert np.all(orifice_q.magnitude[submerged] > 0)
+    assert np.all(orifice_q.magnitude[~submerged] == 0)
+    n = lfom_20.orifice_n_per_row
+    for row_n in range(lfom_20.row_n + 1):
+        assert lfom_20.q_submerged(row_n, n).to(u.L / u.s).magnitude == \
+            pytest.approx(sum(
+                n[i] * pc.flow_orifice_vert(
+                    lfom_20.orifice_d,
+                    lfom_20.row_b * (row_n + 1) - lfom_20.orifice_h_per_row[i],
+                    con.VC_ORIFICE_RATIO).to(u.L / u.s).magnitude
+                for i in range(row_n)))
+
+
+def test_layouts_match_design():
+    bits = np.array([lfom_60.orifice_d.to(u.m).magnitude])
+    n, error = lfom_60._layouts(lfom_60.row_n, bits, [lfom_60.sdr])
+    assert np.array_equal(n[0, 0], lfom_60.orifice_n_per_row)
+    assert error[0, 0] == pytest.approx(lfom_60.error_per_row)
+
+
+def test_optimize_layout():
+    search = lfom_20.optimize_layout(sdrs=[26, 41])
+    best = search.best
+    assert best.error <= np.mean(np.abs(lfom_20.error_per_row[1:]))
+    assert lfom_20.min_row_n <= best.row_n <= lfom_20.max_row_n
+    assert best.orifice_d <= lfom_20.hl / best.row_n
+    assert best.orifice_n == np.sum(best.orifice_n_per_row)
+    assert search.pareto[-1] is best
+
+    # The Pareto front trades more orifices for less error.
+    orifice_n = [layout.orifice_n for layout in search.pareto]
+    errors = [layout.error for layout in search.pareto]
+    assert orifice_n == sorted(orifice_n)
+    assert errors == sorted(errors, reverse=True)
+    assert lfom_20.optimize_layout().best.sdr == lfom_20.sdr
+    # Each layout uses one of the drill bits as given.
+    assert any(best.orifice_d == bit and best.orifice_d.units == bit.units
+               for bit in lfom_20.drill_bits)
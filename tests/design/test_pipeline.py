@@ -1,5 +1,7 @@
 from aguaclara.design.pipeline import *
+from aguaclara.core import kernels
 from aguaclara.core.units import unit_registry as u
+import numpy as np
 import pytest
 
 pipe_20 = Pipe(q = 20.0 * u.L / u.s, size = 6 * u.inch)
@@ -47,8 +49,8 @@ pipeline_fp = Pipe(size = 6 * u.inch,
     (pipeline_20.headloss, 1.0678779116069842 * u.cm),
     (pipeline_60.headloss, 9.078557133328923 * u.cm),
 
-    (pipeline_fp.flow_pipeline(20 * u.cm), 22.162471566281223 * u.L / u.s),
-    (pipeline_fp.flow_pipeline(40 * u.cm), 31.45057786475188 * u.L / u.s),
+    (pipeline_fp.flow_pipeline(20 * u.cm), 22.162719399905527 * u.L / u.s),
+    (pipeline_fp.flow_pipeline(40 * u.cm), 31.452369230815858 * u.L / u.s),
 ])
 def test_pipeline(actual, expected):
     if (type(actual) == u.Quantity and type(expected) == u.Quantity):
@@ -56,3 +58,135 @@ def test_pipeline(actual, expected):
         assert actual.magnitude == pytest.approx(expected.magnitude)
     else:
         assert actual == pytest.approx(expected)
+
+
+def test_compile():
+    compiled = pipeline_20.compile()
+    assert [type(c) for c in compiled.components] == [Pipe, Elbow, Pipe, Tee]
+    assert compiled.l == pytest.approx([1, 0, 4, 0])
+    assert compiled.id[0] == pytest.approx(pipeline_20.id.to(u.m).magnitude)
+    headloss = sum(c.headloss for c in compiled.components)
+    assert compiled.headloss().magnitude == \
+        pytest.approx(headloss.to(u.cm).magnitude)
+    assert pipeline_20.headloss_pipeline.magnitude == \
+        pytest.approx(headloss.to(u.cm).magnitude)
+
+
+def test_compiled_flow():
+    compiled = pipeline_fp.compile()
+    flows = compiled.flow([20, 40] * u.cm)
+    assert flows.magnitude == pytest.approx([22.162719399905527,
+                                             31.452369230815858])
+    headloss = compiled.headloss(flows)
+    assert headloss.to(u.cm).magnitude == pytest.approx([20, 40], rel=0.01)
+
+
+def test_network_branches():
+    network = PipeNetwork()
+    trunk = Pipe(size=6 * u.inch, l=10 * u.m)
+    left = Pipe(size=4 * u.inch, l=20 * u.m)
+    right = Pipe(size=4 * u.inch, l=30 * u.m)
+    network.add(trunk, 'tank', 'a')
+    network.add(Tee(size=4 * u.inch), 'a', 'b')
+    network.add(left, 'b', 'c')
+    network.add(right, 'b', 'd')
+    network.set_head('tank', 5 * u.m)
+    network.set_demand('c', 10 * u.L / u.s)
+    network.set_demand('d', 8 * u.L / u.s)
+    solution = network.solve()
+    assert solution.converged
+    assert solution.q.to(u.L / u.s).magnitude == pytest.approx([18, 18, 10, 8])
+    for component, q, headloss in zip(network.components, solution.q,
+                                      solution.headloss):
+        component.q = q
+        assert headloss.to(u.cm).magnitude == \
+            pytest.approx(component.headloss.to(u.cm).magnitude)
+    head = dict(zip(network.nodes, solution.head.to(u.m).magnitude))
+    assert head['tank'] == 5
+    assert head['tank'] - head['c'] == pytest.approx(
+        solution.headloss[[0, 1, 2]].sum().to(u.m).magnitude)
+
+
+def test_network_loop():
+    """Flow splits evenly around a symmetric loop, and a pipeline between two
+    tanks carries the flow of flow_pipeline.
+    """
+    network = PipeNetwork()
+    network.add(Pipe(size=4 * u.inch, l=10 * u.m), 'tank', 'a')
+    network.add(Pipe(size=2 * u.inch, l=50 * u.m), 'a', 'b')
+    network.add(Pipe(size=2 * u.inch, l=50 * u.m), 'a', 'c')
+    network.add(Pipe(size=2 * u.inch, l=50 * u.m), 'b', 'd')
+    network.add(Pipe(size=2 * u.inch, l=50 * u.m), 'c', 'd')
+    network.set_head('tank', 10 * u.m)
+    network.set_demand('d', 4 * u.L / u.s)
+    solution = network.solve()
+    assert solution.converged
+    assert solution.q.to(u.L / u.s).magnitude == \
+        pytest.approx([4, 2, 2, 2, 2])
+
+    network = PipeNetwork()
+    network.add_pipeline(pipeline_fp, 'up', 'down')
+    network.set_head('up', 20 * u.cm)
+    network.set_head('down', 0 * u.cm)
+    solution = network.solve()
+    assert network.components == pipeline_fp.compile().components
+    assert solution.q.to(u.L / u.s).magnitude == \
+        pytest.approx(4 * [22.162719399905527], rel=0.01)
+    assert solution.headloss.sum().to(u.cm).magnitude == pytest.approx(20)
+
+
+def test_network_transition():
+    """A grid whose pipes near the far corner carry about the transition
+    flow rate converges, with each pipe either on its head loss curve or
+    held at the transition flow rate.
+    """
+    network = PipeNetwork()
+    pipe = Pipe(size=4 * u.inch, l=50 * u.m)
+    n = 12
+    for i in range(n):
+        for j in range(n):
+            if i + 1 < n:
+                network.add(pipe, (i, j), (i + 1, j))
+            if j + 1 < n:
+                network.add(pipe, (i, j), (i, j + 1))
+            network.set_demand((i, j), 0.05 * u.L / u.s)
+    network.set_head((0, 0), 30 * u.m)
+    solution = network.solve()
+    assert solution.converged
+
+    q = np.abs(solution.q.to(u.m ** 3 / u.s).magnitude)
+    headloss = np.abs(solution.headloss.to(u.m).magnitude)
+    diam = pipe.id.to(u.m).magnitude
+    nu = pipe.nu.to(u.m ** 2 / u.s).magnitude
+    q_transition = kernels.flow_transition(diam, nu)
+    held = np.isclose(q, q_transition, rtol=1e-6)
+    assert np.any(held) and not np.all(held)
+    assert headloss[~held] == pytest.approx(kernels.headloss_major_pipe(
+        q[~held], diam, pipe.l.to(u.m).magnitude, nu,
+        pipe.pipe_rough.to(u.m).magnitude))
+
+
+def test_network_errors():
+    network = PipeNetwork()
+    network.add(Pipe(size=4 * u.inch), 'a', 'b')
+    with pytest.raises(ValueError):
+        network.solve()
+    network.add(Pipe(size=4 * u.inch), 'c', 'd')
+    network.set_head('a', 1 * u.m)
+    with pytest.raises(ValueError):
+        network.solve()
+    with pytest.raises(ValueError):
+        network.add(Pipe(size=4 * u.inch), 'a', 'a')
+
+
+def test_inputs_not_shared():
+    # Changing an input of one component in place leaves the others as they
+    # are.
+    pipe = Pipe()
+    pipe.l.ito(u.cm)
+    pipe.size.ito(u.mm)
+    elbow = Elbow(size=6 * u.inch)
+    elbow.id.ito(u.mm)
+    assert Pipe().l.units == u.m
+    assert Pipe().size.units == u.inch
+    assert Elbow(size=6 * u.inch).id.units == u.inch
@@ -0,0 +1,99 @@
+import os
+import sys
+import time
+import tracemalloc
+import unittest
+
+from aguaclara.design.pipeline import Pipe, Elbow
+from aguaclara.core.units import unit_registry as u
+
+#: The number of components in the chain, beyond the recursion limit.
+CHAIN_N = 2000
+
+#: The number of components in the chain of the benchmarks.
+BENCHMARK_CHAIN_N = 5000
+
+#: Budget, in bytes, for the memory of each built component.
+COMPONENT_MEMORY_BUDGET = 4096
+
+#: Budget, in seconds, for building each component.
+COMPONENT_TIME_BUDGET = 5e-3
+
+#: Set this environment variable to run the memory and time benchmarks.
+BENCHMARK_VARIABLE = 'AGUACLARA_BENCHMARK'
+
+
+def build_chain(n):
+    """Build a chain of ``n`` alternating pipes and elbows, from the end."""
+    component = None
+    for i in reversed(range(n)):
+        if i % 2:
+            component = Elbow(size=6 * u.inch, next=component)
+        else:
+            component = Pipe(size=6 * u.inch, l=2 * u.m, next=component)
+    component.q = 20 * u.L / u.s
+    return component
+
+
+def measure_build(n):
+    """Return the seconds and the bytes per component to build a chain.
+
+    The build is timed without tracemalloc, which slows it down.
+    """
+    start = time.perf_counter()
+    build_chain(n)
+    elapsed = time.perf_counter() - start
+    tracemalloc.start()
+    try:
+        pipeline = build_chain(n)
+        memory = tracemalloc.get_traced_memory()[0]
+    finally:
+        tracemalloc.stop()
+    del pipeline
+    return elapsed / n, memory / n
+
+
+class PipelineScaleTest(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.pipeline = build_chain(CHAIN_N)
+
+    def test_longer_than_recursion_limit(self):
+        self.assertGreater(CHAIN_N, sys.getrecursionlimit())
+        self.assertEqual(len(self.pipeline.compile().components), CHAIN_N)
+
+    def test_traversal(self):
+        self.assertEqual(str(self.pipeline).count('\n'), CHAIN_N - 1)
+        self.pipeline._set_next_components_q()
+        self.assertGreater(self.pipeline.headloss_pipeline, 0 * u.m)
+        flow = self.pipeline.flow_pipeline(self.pipeline.headloss_pipeline)
+        self.assertAlmostEqual(flow.to(u.L / u.s).magnitude, 20, delta=0.01)
+
+
+@unittest.skipUnless(os.environ.get(BENCHMARK_VARIABLE),
+                     'Set {} to run the benchmarks.'.format(BENCHMARK_VARIABLE))
+class PipelineBenchmarkTest(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.elapsed, cls.memory = measure_build(BENCHMARK_CHAIN_N)
+
+    def test_memory_budget(self):
+        self.assertLess(self.memory, COMPONENT_MEMORY_BUDGET)
+
+    def test_time_budget(self):
+        self.assertLess(self.elapsed, COMPONENT_TIME_BUDGET)
+
+
+if __name__ == '__main__':
+    # Benchmark a longer chain.
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+    elapsed, memory = measure_build(n)
+    pipeline = build_chain(n)
+    start = time.perf_counter()
+    headloss = pipeline.headloss_pipeline
+    solved = time.perf_counter() - start
+    print('{} components: built in {:.2f} s ({:.0f} B each), head loss {:.4f} '
+          'in {:.2f} s'.format(n, elapsed * n, memory, headloss.to(u.m),
+                               solved))
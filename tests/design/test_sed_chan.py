@@ -38,11 +38,11 @@ sed_chan_60 = SedimentationChannel(q = 60.0 * u.L / u.s)
 	(sed_chan_20.inlet_w, 59.52755905511811 * u.inch),
 	(sed_chan_60.inlet_w, 59.52755905511811 * u.inch),
 
-	(sed_chan_20.drain_pipe.size, 3.0 * u.inch),
-	(sed_chan_60.drain_pipe.size, 4.0 * u.inch),
+	(sed_chan_20.drain_pipe.size, 4.0 * u.inch),
+	(sed_chan_60.drain_pipe.size, 6.0 * u.inch),
 
-	(sed_chan_20.inlet_drain_box_w, 41.43 * u.cm),
-	(sed_chan_60.inlet_drain_box_w, 46.8275 * u.cm),
+	(sed_chan_20.inlet_drain_box_w, 46.8275 * u.cm),
+	(sed_chan_60.inlet_drain_box_w, 51.9075 * u.cm),
 
 	(sed_chan_20.outlet_depth, 92.89622757137602 * u.cm),
 	(sed_chan_60.outlet_depth, 94.72829553143386 * u.cm),
@@ -59,8 +59,8 @@ sed_chan_60 = SedimentationChannel(q = 60.0 * u.L / u.s)
 	(sed_chan_20.outlet_pipe.l, 3.7119999999999997 * u.m),
 	(sed_chan_60.outlet_pipe.l, 3.7119999999999997 * u.m),
 
-	(sed_chan_20.outlet_pipe_q_max, 7.8571 * u.L / u.s),
-	(sed_chan_60.outlet_pipe_q_max, 7.8571 * u.L / u.s),
+	(sed_chan_20.outlet_pipe_q_max, 7.8414 * u.L / u.s),
+	(sed_chan_60.outlet_pipe_q_max, 7.8414 * u.L / u.s),
 
 	(sed_chan_20.outlet_pipe_n, 3),
 	(sed_chan_60.outlet_pipe_n, 8),
@@ -68,23 +68,23 @@ sed_chan_60 = SedimentationChannel(q = 60.0 * u.L / u.s)
 	(sed_chan_20.outlet_pipe.q, 6.666666666666667 * u.L / u.s),
 	(sed_chan_60.outlet_pipe.q, 7.5 * u.L / u.s),
 
-	(sed_chan_20.outlet_pipe.size, 6 * u.inch),
-	(sed_chan_60.outlet_pipe.size, 6 * u.inch),
+	(sed_chan_20.outlet_pipe.size, 8 * u.inch),
+	(sed_chan_60.outlet_pipe.size, 8 * u.inch),
 
-	(sed_chan_20.outlet_post_weir_w, 36.9075 * u.cm),
-	(sed_chan_60.outlet_post_weir_w, 36.9075 * u.cm),
+	(sed_chan_20.outlet_post_weir_w, 42.305 * u.cm),
+	(sed_chan_60.outlet_post_weir_w, 42.305 * u.cm),
 
-	(sed_chan_20.outlet_w, 81.9075 * u.cm),
-	(sed_chan_60.outlet_w, 81.9075 * u.cm),
+	(sed_chan_20.outlet_w, 87.305 * u.cm),
+	(sed_chan_60.outlet_w, 87.305 * u.cm),
 
-	(sed_chan_20.outlet_drain_box_w, 36.9075 * u.cm),
-	(sed_chan_60.outlet_drain_box_w, 36.9075 * u.cm),
+	(sed_chan_20.outlet_drain_box_w, 42.305 * u.cm),
+	(sed_chan_60.outlet_drain_box_w, 42.305 * u.cm),
 
 	(sed_chan_20.outlet_weir_h, 87.89622757137602 * u.cm),
 	(sed_chan_60.outlet_weir_h, 89.72829553143386 * u.cm),
 
-	(sed_chan_20.w_outer, 278.1075 * u.cm),
-	(sed_chan_60.w_outer, 278.1075 * u.cm),
+	(sed_chan_20.w_outer, 283.505 * u.cm),
+	(sed_chan_60.w_outer, 283.505 * u.cm),
 
 	(sed_chan_20.inlet_last_coupling_h, 83.89622757137602 * u.cm),
 	(sed_chan_60.inlet_last_coupling_h, 85.72829553143386 * u.cm),
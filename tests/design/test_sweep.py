@@ -0,0 +1,43 @@
+from aguaclara.design.sweep import sweep
+from aguaclara.design.ent_floc import EntTankFloc
+from aguaclara.design.floc import Flocculator
+from aguaclara.design.sed import Sedimentor
+from aguaclara.core.units import u
+
+import numpy as np
+import pytest
+
+
+@pytest.mark.parametrize('processes', [1, 2])
+def test_sweep(processes):
+    designs = sweep(
+        Sedimentor,
+        {'q': [20, 60] * u.L / u.s, 'tank.vel_upflow': [1, 2] * u.mm / u.s},
+        ['tank_n', 'chan.w_outer'],
+        processes=processes, chunksize=1)
+    assert list(designs.columns) == \
+        ['q', 'tank.vel_upflow', 'tank_n', 'chan.w_outer', 'error']
+    assert list(designs['q']) == [20, 20, 60, 60]
+    assert list(designs['tank_n']) == [4, 2, 10, 5]
+    assert designs.attrs['units'] == {
+        'q': 'liter / second',
+        'tank.vel_upflow': 'millimeter / second',
+        'chan.w_outer': 'centimeter'}
+    assert designs['error'].isna().all()
+
+
+def test_sweep_matches_designs():
+    designs = sweep(EntTankFloc, {'floc.hl': [35, 40] * u.cm}, ['ent.l'],
+                    processes=1)
+    for hl, l in zip(designs['floc.hl'], designs['ent.l']):
+        etf = EntTankFloc(floc=Flocculator(hl=hl * u.cm))
+        assert l == pytest.approx(etf.ent.l.to(u.inch).magnitude)
+
+
+def test_sweep_failed_design():
+    designs = sweep(Flocculator, {'q': [20 * u.L / u.s, 'x']}, ['chan_w'],
+                    processes=1)
+    assert designs['chan_w'][0] == 34
+    assert np.isnan(designs['chan_w'][1])
+    assert designs['error'].isna()[0]
+    assert designs['error'][1].startswith('TypeError')
@@ -0,0 +1,82 @@
+import os
+import re
+import subprocess
+import sys
+import unittest
+
+#: Budget, in seconds, for the cumulative import time of the bare package.
+IMPORT_TIME_BUDGET = 0.25
+
+#: Modules that ``import aguaclara`` must not load.
+HEAVY_MODULES = ('pint', 'pandas', 'scipy', 'matplotlib', 'onshape_client',
+                 'aguaclara.core.units', 'aguaclara.research.floc_model')
+
+
+#: The repository root, from which the package is imported.
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def run_python(code):
+    return subprocess.run([sys.executable, '-X', 'importtime', '-c', code],
+                          stdout=subprocess.PIPE, stderr=subprocess.PIPE,
+                          universal_newlines=True, check=True, cwd=ROOT)
+
+
+#: Skips the tests of lazy loading, which requires PEP 562.
+requires_lazy = unittest.skipIf(sys.version_info < (3, 7),
+                                'Lazy loading requires Python 3.7 or later.')
+
+
+class ImportTimeTest(unittest.TestCase):
+
+    @requires_lazy
+    def test_import_is_lazy(self):
+        result = run_python(
+            'import sys, aguaclara\n'
+            'print(",".join(m for m in {} if m in sys.modules))'
+            .format(HEAVY_MODULES))
+        self.assertEqual(result.stdout.strip(), '')
+
+    @requires_lazy
+    def test_import_time_budget(self):
+        result = run_python('import aguaclara')
+        match = re.search(r'\|\s*(\d+)\s*\|\s*aguaclara$', result.stderr,
+                          re.MULTILINE)
+        self.assertIsNotNone(match)
+        self.assertLess(int(match.group(1)) / 1e6, IMPORT_TIME_BUDGET)
+
+    def test_lazy_attributes(self):
+        result = run_python(
+            'import aguaclara as ac\n'
+            'print(ac.flow_pipe.__module__, ac.Plant.__name__, ac.ha.__name__,'
+            ' type(ac.pipedb).__name__)')
+        self.assertEqual(result.stdout.split(),
+                         ['aguaclara.core.physchem', 'Plant',
+                          'aguaclara.design.human_access', 'DataFrame'])
+
+    def test_eager_attributes(self):
+        # Load the package as on Python 3.6, which does not support PEP 562.
+        result = run_python(
+            'import sys\n'
+            'sys.version_info = (3, 6, 15)\n'
+            'import aguaclara as ac\n'
+            'from aguaclara.core import pipes\n'
+            'print(*(name in vars(module) for module, name in ['
+            '(ac, "flow_pipe"), (ac, "viscosity_kinematic"), (ac, "Plant"), '
+            '(ac, "pipedb"), (pipes, "pipedb")]))')
+        self.assertEqual(result.stdout.split(), ['True'] * 5)
+
+    def test_unknown_attribute(self):
+        # Block the Onshape client, as if it were not installed.
+        result = run_python(
+            'import sys\n'
+            'sys.modules["onshape_client"] = None\n'
+            'import aguaclara as ac\n'
+            'print(hasattr(ac, "no_such_name"), '
+            'getattr(ac, "no_such_name", "default"), '
+            'hasattr(ac, "flow_pipe"))')
+        self.assertEqual(result.stdout.split(), ['False', 'default', 'True'])
+
+
+if __name__ == '__main__':
+    unittest.main()